@@ -1,14 +1,62 @@
 import subprocess
-import pandas as pd
-from datetime import datetime
+import importlib
+import re
+import sys
+import csv
+from datetime import date, datetime
 import json
 import os
 import io
+import shlex
+import gzip
+import inspect
+import queue
+import threading
+import time
+import hashlib
+import bisect
+import argparse
+import pickle
+import shutil
+import tempfile
+import glob
+import contextlib
+import collections
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+
+class _LazyModule:
+    """Module imported on first attribute access
+
+    pandas and numpy take most of the start-up time; catalog-only runs
+    (--schema-only, --only table_details) and the SQL generators never touch
+    them, so they are only imported by the data passes.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+
+    def __getattr__(self, attr):
+        module = self.__dict__.get("_module")
+        if module is None:
+            module = self.__dict__["_module"] = importlib.import_module(self.__dict__["_name"])
+        return getattr(module, attr)
+
+
+np = _LazyModule("numpy")
+pd = _LazyModule("pandas")
 
 # === CONFIGURATION ===
 ACCESS_PATH = "/home/bomar-ubu-1/migration-access/risk.mdb"  # WSL path to your .mdb file
 OUTPUT_DIR = "access_analysis"
 
+# mdbtools output encoding: mdbtools converts text to MDB_ENCODING (MDB_ICONV) and all of its
+# output is read as bytes in that encoding, so results do not depend on the machine's locale
+MDB_ENCODING = "UTF-8"
+MDB_JET3_CHARSET = None   # Code page of Access 97 (Jet 3) text, e.g. "CP1252"; None = mdbtools default
+
 # Thematic subdirectories for organized output
 SCHEMA_DIR = "01-schema"
 POWERBI_DIR = "02-powerbi"
@@ -18,11 +66,1311 @@ MIGRATION_DIR = "05-migration-planning"
 ETL_DIR = "06-etl"
 ANALYSIS_DIR = "07-analysis"
 
+# ETL export script options
+EXPORT_JOBS = 4            # Parallel mdb-export jobs (override at run time with JOBS=n)
+EXPORT_COMPRESS = False    # Write gzip-compressed CSV files (*.csv.gz)
+
+# Bulk import script options
+IMPORT_JOBS = 4                        # Parallel COPY sessions in 02_import_parallel.sh
+IMPORT_RANGE_ROWS = 1_000_000          # Tables above this row count load as parallel row ranges
+IMPORT_MAINTENANCE_WORK_MEM = "1GB"    # Index/constraint builds after the load
+IMPORT_WORK_MEM = "256MB"
+IMPORT_PARALLEL_INDEX_WORKERS = 4      # max_parallel_maintenance_workers (PostgreSQL 11+)
+IMPORT_CSV_OPTIONS = "FORMAT csv, ENCODING 'UTF8', NULL ''"
+
+# Direct Access -> PostgreSQL streaming (stream_to_postgres)
+STREAM_CHUNK_ROWS = 50_000   # Rows converted per chunk
+STREAM_QUEUE_CHUNKS = 4      # Converted chunks buffered ahead of the COPY writer
+MDB_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"   # mdb-export date format for the load paths
+
+# Transform stage (03_transform_data.py)
+TRANSFORM_WORKERS = 4              # Files transformed in parallel
+TRANSFORM_WORKER_MEMORY_MB = 512   # Memory budget per worker; sets the chunk size
+BOOLEAN_TRUE_VALUES = ["1", "-1", "TRUE", "YES", "Y", "T", "ON"]
+BOOLEAN_FALSE_VALUES = ["0", "FALSE", "NO", "N", "F", "OFF"]
+TRIM_WHITESPACE = " \t\n\r\f\v"   # Stripped from text by the transform, the fingerprints and type inference
+DECIMAL_SEPARATOR = None          # "." or "," in exported amounts; None = the last "." or "," in each value
+
+# Binary (OLE/LONGBINARY) columns: left out of every export ("-b strip") and streamed
+# separately as hex by scan_blobs / the export-blobs command
+BLOB_CHUNK_MB = 64   # Hex text held in memory while streaming a table's blobs (a larger row is read alone)
+
+# Load file format written by 01_export_from_access.sh: "csv" or "binary" (export-binary command)
+LOAD_FORMAT = "csv"
+
+# Saved queries (get_queries)
+QUERY_JOBS = 8   # mdb-queries processes run concurrently
+QUERY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "access_analysis", "queries")  # None = no cache
+
+# Power BI rewrite (rewrite-powerbi command)
+POWERBI_REWRITE_JOBS = 4                # Files rewritten in parallel
+POWERBI_PG_SERVER = "your-server"       # Written into the PostgreSQL.Database(...) source
+POWERBI_PG_DATABASE = "your-database"
+POWERBI_PG_SCHEMA = "public"
+
+# Reconciliation (reconcile command)
+RECONCILE_FANOUT = 16        # Sub-ranges per mismatching key range
+RECONCILE_LEAF_ROWS = 1_000  # Ranges this small are compared row by row
+
+# Sampling mode (--sample): profile a uniform random sample per table instead of every row
+SAMPLE_ROWS = 10_000
+SAMPLE_SEED = 42
+SAMPLE_EXPORT_ARGS = ("-D", MDB_DATETIME_FORMAT, "-T", MDB_DATETIME_FORMAT)   # Read like the load paths,
+SAMPLE_READ_OPTIONS = dict(dtype=str, keep_default_na=False, na_values=[""])   # only empty fields are NULL
+
+# Watch mode (watch command)
+WATCH_INTERVAL = 2   # Seconds between checks of the database file
+WATCH_DEBOUNCE = 5   # Seconds the file must stay unchanged before re-analyzing
+WATCH_FRAME_CACHE_MB = 1024   # Parsed exports kept between cycles; larger tables keep only their digest
+
+# Batch mode (batch command)
+BATCH_JOBS = 4   # Databases analyzed in parallel
+
+# Report diff (diff command)
+DIFF_NULL_RATE_POINTS = 5.0   # Null-rate changes smaller than this (percentage points) are not reported
+
+# Type tightening (data quality pass)
+TYPE_TIGHTENING = True        # Create tables with the types that fit every profiled value (import scripts, loads)
+TYPE_TIGHTENING_MIN_FIT = 0.95   # Narrower types fitting this share of values are reported as partial fits
+VARCHAR_MAX_LENGTH = 255      # Text longer than this stays TEXT
+
+# Index advisor (index_advice pass)
+INDEX_MIN_ROWS = 1_000               # Smaller tables scan faster than an index lookup pays off
+INDEX_MAX_MATCH_FRACTION = 0.05      # Skip columns whose most frequent value matches more of the table than this
+
+# Partitioning advisor (partition_advice pass)
+PARTITION_MIN_ROWS = 5_000_000          # Smaller tables stay a single heap
+PARTITION_MIN_PARTITION_ROWS = 100_000  # Finest interval (month, then year) whose partitions average this
+PARTITION_BOUND_PERCENTILE = 1          # Ranges cover this..100-this percent of dates; sentinels such as
+                                        # 1899-12-30 or 9999-12-31 outside them go to the DEFAULT partition
+BRIN_MIN_ROWS = 1_000_000               # BRIN only pays off on large tables
+BRIN_MIN_CORRELATION = 0.9              # |correlation| of value with physical row order needed for BRIN
+
+# Compatibility views (01-schema/postgresql_compatibility_views.sql)
+COMPAT_MATERIALIZED = True       # Materialize the views of heavy Power BI tables (False = plain views only)
+MATVIEW_MIN_COMPLEXITY = 3.0     # powerbi_impact complexity score from which a view is materialized
+MATVIEW_MIN_ROWS = 100_000       # ...if its table also has at least this many rows
+
+# Out-of-core set operations (PK uniqueness, FK subset and orphan checks)
+HASH_MEMORY_MB = 1024   # Tables estimated above this are checked through on-disk hash buckets
+SPILL_DIR = None        # Where bucket files go (None = system temp directory)
+
+# Access type -> PostgreSQL type
+PG_TYPE_MAP = {
+    "COUNTER": "SERIAL",
+    "LONG": "INTEGER",
+    "LONG INTEGER": "INTEGER",
+    "INTEGER": "INTEGER",
+    "SMALLINT": "SMALLINT",
+    "SINGLE": "REAL",
+    "DOUBLE": "DOUBLE PRECISION",
+    "CURRENCY": "NUMERIC(19,4)",
+    "DATETIME": "TIMESTAMP",
+    "BOOLEAN": "BOOLEAN",
+    "TEXT": "TEXT",
+    "MEMO": "TEXT",
+    "MEMO/HYPERLINK": "TEXT",
+    "VARCHAR": "VARCHAR",
+    "LONGBINARY": "BYTEA",
+    "OLE": "BYTEA",
+    "BYTE": "SMALLINT",
+}
+
+
+# === MDBTOOLS OUTPUT ===
+
+def mdb_environment():
+    """Environment for mdbtools processes: text output in MDB_ENCODING, not the locale's codec"""
+    env = dict(os.environ, MDB_ICONV=MDB_ENCODING)
+    if MDB_JET3_CHARSET:
+        env["MDB_JET3_CHARSET"] = MDB_JET3_CHARSET
+    return env
+
+
+def index_column_names(columns):
+    """Column names of an mdb-schema index column list, e.g. '[Cust ID] DESC, Code'"""
+    names = []
+    for part in re.findall(r'(?:\[[^\]]*\]|"[^"]*"|`[^`]*`|[^,])+', columns):
+        name = re.sub(r"\s+(?:ASC|DESC)$", "", part.strip(), flags=re.IGNORECASE)
+        if name:
+            names.append(name.strip('[]"`'))
+    return names
+
+
+# === BLOB HANDLING ===
+# OLE/LONGBINARY contents never go through the CSV exports or the profiling DataFrames.
+# They are streamed on their own as hex (mdb-export -b hex) and written once per distinct
+# content to blob_dir/<sha256[:2]>/<sha256>; the BYTEA import reads them from there.
+
+def without_blobs(export_args):
+    """mdb-export options that leave binary column contents out, unless they choose a -b mode"""
+    export_args = tuple(export_args)
+    return export_args if "-b" in export_args else ("-b", "strip", *export_args)
+
+
+def write_blob(blob_dir, digest, data):
+    """Store one blob under its SHA-256 (content-addressed: an existing file is kept)"""
+    path = os.path.join(blob_dir, digest[:2], digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".partial", "wb") as f:
+            f.write(data)
+        os.replace(path + ".partial", path)
+    return path
+
+
+# === TRANSFORM ENGINE ===
+# These functions are also copied verbatim into the generated 03_transform_data.py,
+# so they may only use pandas, numpy, gzip, os and the constants they are emitted with.
+
+def parse_decimal_text(values):
+    """Exported amounts as plain decimal strings ("-1234.56"); None where there are no digits
+
+    Currency symbols and spaces are dropped; "(12.50)" and a leading or trailing "-"
+    are negative. The decimal mark is DECIMAL_SEPARATOR, or else the last "." or ","
+    when it occurs once in the value: "1.234,56", "1,234.56" and "1234,56" all read
+    as 1234.56, "1,234,567" as 1234567, but a lone "1,234" as 1.234.
+    """
+    text = values.astype(object).where(values.notna()).astype("string").str.strip(TRIM_WHITESPACE)
+    negative = text.str.contains(r"^\(.*\)$|^-|-$", regex=True).fillna(False).astype(bool)
+    digits = text.str.replace(r"[^0-9.,]", "", regex=True)
+    if DECIMAL_SEPARATOR:
+        grouping = "," if DECIMAL_SEPARATOR == "." else "."
+        number = digits.str.replace(grouping, "", regex=False).str.replace(DECIMAL_SEPARATOR, ".", regex=False)
+    else:
+        last = digits.str.extract(r"([.,])[0-9]*$", expand=False)
+        single = ((last == ".") & (digits.str.count(r"\.") == 1)) | ((last == ",") & (digits.str.count(",") == 1))
+        marked = digits.str.replace(r"[.,](?=.*[.,])", "", regex=True).str.replace(",", ".", regex=False)
+        number = marked.where(single.fillna(False).astype(bool), digits.str.replace(r"[.,]", "", regex=True))
+    number = number.where(number.str.contains(r"[0-9]", regex=True).fillna(False).astype(bool))
+    number = number.where(~negative, "-" + number)
+    return number.astype(object).where(number.notna(), None)
+
+
+def apply_transformations(df, transformations):
+    """Convert raw export values to PostgreSQL input values, one vectorized pass per column
+
+    transformations maps column name -> "datetime", "boolean", "currency", "integer" or "text".
+    """
+    for col, transform in transformations.items():
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if transform == "datetime":
+            parsed = pd.to_datetime(values, format="ISO8601", errors="coerce")
+            df[col] = parsed.dt.strftime(MDB_DATETIME_FORMAT)
+        elif transform == "boolean":
+            upper = values.str.strip(TRIM_WHITESPACE).str.upper()
+            df[col] = np.where(upper.isin(BOOLEAN_TRUE_VALUES), "t",
+                               np.where(upper.isin(BOOLEAN_FALSE_VALUES), "f", None))
+        elif transform == "currency":
+            df[col] = pd.to_numeric(parse_decimal_text(values), errors="coerce").round(4)
+        elif transform == "integer":
+            df[col] = pd.to_numeric(values, errors="coerce").astype("Int64")
+        elif transform == "text":
+            df[col] = values.str.strip(TRIM_WHITESPACE)
+    return df
+
+
+def transform_chunk_rows(path, memory_mb):
+    """Rows per chunk that keep one worker within memory_mb
+
+    Estimated from the average line length of the first 64 KB; pandas holds
+    string data at roughly ten times its CSV size.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        sample = f.read(65536)
+    bytes_per_row = max(len(sample) / max(sample.count(b"\n"), 1), 1)
+    rows = int(memory_mb * 1024 * 1024 / (bytes_per_row * 10))
+    return max(1_000, min(rows, 1_000_000))
+
+
+def transform_csv_file(src, dst, transformations, memory_mb):
+    """Transform one CSV file chunk by chunk, writing to dst (gzip if it ends in .gz)"""
+    chunk_rows = transform_chunk_rows(src, memory_mb)
+    tmp = dst + ".partial"
+    opener = gzip.open if dst.endswith(".gz") else open
+    rows = 0
+    with opener(tmp, "wt", encoding="utf-8", newline="") as out:
+        reader = pd.read_csv(src, chunksize=chunk_rows, dtype=str,
+                             keep_default_na=False, na_values=[""])
+        for i, df in enumerate(reader):
+            df = apply_transformations(df, transformations)
+            df.to_csv(out, index=False, header=(i == 0), float_format="%.4f")
+            rows += len(df)
+    os.replace(tmp, dst)
+    return rows
+
+
+# === BINARY COPY ENCODING ===
+# PostgreSQL binary COPY: 11-byte signature, int32 flags, int32 header extension length,
+# then per tuple an int16 field count and per field an int32 length (-1 = NULL) and the
+# value in the type's binary send format; the file ends with an int16 -1.
+
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + b"\x00\x00\x00\x00" + b"\x00\x00\x00\x00"
+COPY_BINARY_TRAILER = b"\xff\xff"
+PG_EPOCH = datetime(2000, 1, 1)
+
+
+def _binary_fixed(values, mask, dtype):
+    """Field lengths and data bytes for a fixed-width big-endian type"""
+    width = np.dtype(dtype).itemsize
+    lengths = np.where(mask, width, -1).astype(np.int32)
+    data = np.ascontiguousarray(values[mask].astype(dtype)).view(np.uint8)
+    return lengths, data
+
+
+def _binary_numeric(values, mask, scale):
+    """Fixed-layout NUMERIC: base-10000 digits, PostgreSQL strips the leading/trailing zeros"""
+    frac_groups = -(-scale // 4)
+    int_groups = 5
+    numbers = values[mask].astype(np.float64)
+    negative = numbers < 0
+    numbers = np.abs(numbers)
+    # Integer and fraction are split before scaling so large values cannot overflow int64
+    whole = np.floor(numbers)
+    fraction = np.round((numbers - whole) * 10 ** scale).astype(np.int64)
+    carry = fraction >= 10 ** scale
+    whole = (whole + carry).astype(np.int64)
+    fraction = np.where(carry, 0, fraction) * 10 ** (4 * frac_groups - scale)
+    ndigits = int_groups + frac_groups
+    # ndigits, weight, sign, dscale, then the digits - all big-endian int16
+    fields = np.empty((len(numbers), 4 + ndigits), dtype=">i2")
+    fields[:, 0] = ndigits
+    fields[:, 1] = int_groups - 1
+    fields[:, 2] = np.where(negative, 0x4000, 0)
+    fields[:, 3] = scale
+    for i in range(ndigits - 1, int_groups - 1, -1):
+        fields[:, 4 + i] = fraction % 10000
+        fraction //= 10000
+    for i in range(int_groups - 1, -1, -1):
+        fields[:, 4 + i] = whole % 10000
+        whole //= 10000
+    data = fields.view(np.uint8).ravel()
+    lengths = np.where(mask, 2 * (4 + ndigits), -1).astype(np.int32)
+    return lengths, data
+
+
+def _binary_integers(series, dtype):
+    """Exact values and non-null mask of an integer column, parsed without a float round trip
+
+    "12" and "12.0" read as 12; non-integral values such as "1.7" are NULL.
+    A value outside the column type's range raises, as a text COPY would.
+    """
+    digits = series.astype("string").str.strip(TRIM_WHITESPACE).str.extract(r"^([+-]?\d+)(?:\.0*)?$", expand=False)
+    mask = digits.notna().to_numpy()
+    values = np.zeros(len(series), dtype=np.int64)
+    limits = np.iinfo(np.dtype(dtype))
+    try:
+        values[mask] = digits[mask].astype(np.int64).to_numpy()
+    except (OverflowError, ValueError):
+        raise ValueError(f"{series.name}: value out of range for a {limits.bits}-bit integer")
+    if mask.any() and (values[mask].min() < limits.min or values[mask].max() > limits.max):
+        raise ValueError(f"{series.name}: value out of range for a {limits.bits}-bit integer")
+    return values, mask
+
+
+def _binary_field(series, pg_type):
+    """Encode one column as (int32 lengths per row, flat data bytes of the non-null rows)"""
+    base = pg_type.upper().split("(")[0].strip()
+    if base in ["INTEGER", "INT", "INT4", "SERIAL", "SMALLINT", "INT2", "BIGINT", "INT8", "BIGSERIAL"]:
+        dtype = {"SMALLINT": ">i2", "INT2": ">i2", "BIGINT": ">i8", "INT8": ">i8", "BIGSERIAL": ">i8"}.get(base, ">i4")
+        values, mask = _binary_integers(series, dtype)
+        return _binary_fixed(values, mask, dtype)
+    if base in ["REAL", "FLOAT4", "DOUBLE PRECISION", "FLOAT8"]:
+        numbers = pd.to_numeric(series, errors="coerce")
+        mask = numbers.notna().to_numpy()
+        dtype = ">f4" if base in ["REAL", "FLOAT4"] else ">f8"
+        return _binary_fixed(numbers.to_numpy(dtype=np.float64, na_value=0), mask, dtype)
+    if base in ["NUMERIC", "DECIMAL"]:
+        scale = int(pg_type.split(",")[1].rstrip(") ")) if "," in pg_type else 4
+        numbers = pd.to_numeric(series, errors="coerce")
+        mask = numbers.notna().to_numpy()
+        return _binary_numeric(numbers.to_numpy(dtype=np.float64, na_value=0), mask, scale)
+    if base in ["TIMESTAMP", "DATE"]:
+        parsed = pd.to_datetime(series, format="ISO8601", errors="coerce")
+        mask = parsed.notna().to_numpy()
+        if base == "DATE":
+            # Integer day and microsecond counts: a float division loses precision with NULLs present
+            offsets = (parsed.dt.normalize() - PG_EPOCH).to_numpy(dtype="timedelta64[D]").astype(np.int64)
+            return _binary_fixed(offsets, mask, ">i4")
+        offsets = (parsed - PG_EPOCH).to_numpy(dtype="timedelta64[us]").astype(np.int64)
+        return _binary_fixed(offsets, mask, ">i8")
+    if base == "BOOLEAN":
+        mask = series.notna().to_numpy()
+        flags = series.isin(["t", True]).to_numpy()
+        return _binary_fixed(flags, mask, np.uint8)
+
+    # Text-like (TEXT, VARCHAR, BYTEA raw bytes): variable length
+    mask = series.notna().to_numpy()
+    encoded = series[mask].astype(str).str.encode("utf-8").tolist()
+    lengths = np.full(len(series), -1, dtype=np.int32)
+    lengths[mask] = np.fromiter(map(len, encoded), dtype=np.int32, count=len(encoded))
+    return lengths, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def encode_binary_copy(df, columns, pg_types):
+    """Encode DataFrame rows as binary COPY tuples (no file header or trailer)
+
+    Every field is placed with vectorized scatters into one preallocated
+    buffer: no per-row Python work apart from encoding text to UTF-8.
+    """
+    n = len(df)
+    if n == 0:
+        return b""
+    fields = []
+    for col, pg_type in zip(columns, pg_types):
+        if col in df.columns:
+            fields.append(_binary_field(df[col], pg_type))
+        else:
+            fields.append((np.full(n, -1, dtype=np.int32), np.empty(0, dtype=np.uint8)))
+
+    data_sizes = [np.maximum(lengths, 0).astype(np.int64) for lengths, _ in fields]
+    row_sizes = 2 + sum(4 + sizes for sizes in data_sizes)
+    row_starts = np.concatenate([[0], np.cumsum(row_sizes)[:-1]])
+    buf = np.empty(int(row_sizes.sum()), dtype=np.uint8)
+
+    field_count = np.full(n, len(fields), dtype=">i2").view(np.uint8).reshape(n, 2)
+    buf[row_starts[:, None] + np.arange(2)] = field_count
+
+    pos = row_starts + 2
+    for (lengths, data), sizes in zip(fields, data_sizes):
+        buf[pos[:, None] + np.arange(4)] = lengths.astype(">i4").view(np.uint8).reshape(n, 4)
+        present = sizes > 0
+        if data.size:
+            starts = pos[present] + 4
+            counts = sizes[present]
+            # Position of every data byte: its field start plus its offset within the field
+            within = np.arange(data.size) - np.repeat(np.cumsum(counts) - counts, counts)
+            buf[np.repeat(starts, counts) + within] = data
+        pos = pos + 4 + sizes
+    return buf.tobytes()
+
+
+# === DATA FINGERPRINTS ===
+# Order-independent content fingerprints per column. Values are normalized to the text
+# PostgreSQL produces for the loaded column (fingerprint_sql_expression), so the same
+# aggregates can be computed from the Access export and in the database and compared
+# exactly. The hash of a value is the first 60 bits of md5 of its normalized text;
+# a column's hash_sum is the sum over all non-NULL values.
+
+def fingerprint_class(pg_type):
+    """Normalization class for a PostgreSQL column type (None = not fingerprinted)"""
+    base = pg_type.split("(")[0].strip().upper()
+    if base in ("INTEGER", "SMALLINT", "BIGINT", "SERIAL"):
+        return "integer"
+    if base == "NUMERIC":
+        return "numeric"
+    if base == "REAL":
+        return "real"
+    if base == "DOUBLE PRECISION":
+        return "double"
+    if base in ("TIMESTAMP", "DATE"):
+        return "datetime"
+    if base == "BOOLEAN":
+        return "boolean"
+    if base == "BYTEA":
+        return None
+    return "text"
+
+
+def _decimal_text(value, quantum):
+    """Decimal text rounded like PostgreSQL numeric (half away from zero, no negative zero)"""
+    try:
+        return str(Decimal(value).quantize(quantum, rounding=ROUND_HALF_UP) + 0)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def normalize_values(values, pg_type):
+    """Normalize raw export strings to PostgreSQL's text form of the loaded value
+
+    Returns an object Series aligned with values; NULLs and unparseable values are missing.
+    """
+    cls = fingerprint_class(pg_type)
+    out = pd.Series(None, index=values.index, dtype=object)
+    present = values.notna()
+    if cls == "integer":
+        numbers = pd.to_numeric(values, errors="coerce")
+        mask = numbers.notna()
+        out[mask] = numbers[mask].astype(np.int64).astype(str)
+    elif cls == "numeric":
+        scale = int(pg_type.split(",")[1].rstrip(")")) if "," in pg_type else 0
+        quantum = Decimal(1).scaleb(-scale)
+        out[present] = parse_decimal_text(values[present]).map(lambda v: _decimal_text(v, quantum))
+    elif cls in ("real", "double"):
+        # float4/float8 -> numeric keeps 6/15 significant digits, then round(..., 6)
+        numbers = pd.to_numeric(values, errors="coerce")
+        mask = numbers.notna()
+        if cls == "real":
+            numbers = numbers.astype(np.float32)
+        digits = 6 if cls == "real" else 15
+        quantum = Decimal(1).scaleb(-6)
+        out[mask] = numbers[mask].map(lambda v: _decimal_text(f"{float(v):.{digits}g}", quantum))
+    elif cls == "datetime":
+        parsed = pd.to_datetime(values, format="ISO8601", errors="coerce")
+        mask = parsed.notna()
+        out[mask] = parsed[mask].dt.strftime("%Y-%m-%d %H:%M:%S")
+    elif cls == "boolean":
+        upper = values[present].str.strip(TRIM_WHITESPACE).str.upper()
+        out[upper[upper.isin(BOOLEAN_TRUE_VALUES)].index] = "true"
+        out[upper[upper.isin(BOOLEAN_FALSE_VALUES)].index] = "false"
+    elif cls == "text":
+        out[present] = values[present].str.strip(TRIM_WHITESPACE)
+    return out
+
+
+def value_hash(text):
+    """60-bit hash of a normalized value, equal to ('x' || substr(md5(text), 1, 15))::bit(60)::bigint"""
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:15], 16)
+
+
+def column_fingerprint(values, pg_type):
+    """Fingerprint of one column: non-NULL count, hash_sum, and sum/min/max where meaningful
+
+    Each distinct raw value is normalized and hashed once, then weighted by its count.
+    """
+    cls = fingerprint_class(pg_type)
+    if cls is None:
+        return None
+    counts = values.value_counts(dropna=True)
+    normalized = normalize_values(pd.Series(counts.index.astype(str), dtype=object), pg_type)
+    keep = normalized.notna().to_numpy()
+    norm = normalized.to_numpy()[keep]
+    weights = [int(c) for c in counts.to_numpy()[keep]]
+
+    fingerprint = {
+        "class": cls,
+        "non_null": sum(weights),
+        "hash_sum": str(sum(value_hash(v) * c for v, c in zip(norm, weights))),
+        "sum": None,
+        "min": None,
+        "max": None,
+    }
+    if not weights:
+        return fingerprint
+    if cls in ("integer", "numeric", "real", "double"):
+        numbers = [Decimal(v) for v in norm]
+        fingerprint["sum"] = str(sum((d * c for d, c in zip(numbers, weights)), Decimal(0)))
+        fingerprint["min"] = str(min(numbers))
+        fingerprint["max"] = str(max(numbers))
+    elif cls == "boolean":
+        fingerprint["sum"] = str(sum(c for v, c in zip(norm, weights) if v == "true"))
+    else:
+        fingerprint["min"] = min(norm)
+        fingerprint["max"] = max(norm)
+    return fingerprint
+
+
+def sql_char_literal(chars):
+    """E'...' literal of chars as octal escapes (PostgreSQL escape strings have no \\v)"""
+    return "E'" + "".join(f"\\{ord(c):03o}" for c in chars) + "'"
+
+
+def fingerprint_sql_expression(column, pg_type):
+    """SQL for a column's normalized text, matching normalize_values"""
+    cls = fingerprint_class(pg_type)
+    col = f'"{column}"'
+    if cls in ("real", "double"):
+        return f"round({col}::numeric, 6)::text"
+    if cls == "datetime":
+        return f"to_char({col}, 'YYYY-MM-DD HH24:MI:SS')"
+    if cls == "text":
+        return f"btrim({col}, {sql_char_literal(TRIM_WHITESPACE)})"
+    return f"{col}::text"
+
+
+def fingerprint_sql_aggregates(column, pg_type):
+    """SQL aggregates producing the fields of column_fingerprint for a loaded column"""
+    cls = fingerprint_class(pg_type)
+    col = f'"{column}"'
+    normalized = fingerprint_sql_expression(column, pg_type)
+    aggregates = {
+        "non_null": f"COUNT({col})",
+        "hash_sum": f"COALESCE(SUM(('x' || substr(md5({normalized}), 1, 15))::bit(60)::bigint), 0)",
+    }
+    if cls in ("integer", "numeric"):
+        aggregates.update(sum=f"SUM({col})", min=f"MIN({col})", max=f"MAX({col})")
+    elif cls in ("real", "double"):
+        aggregates.update(sum=f"SUM(round({col}::numeric, 6))",
+                          min=f"round(MIN({col})::numeric, 6)", max=f"round(MAX({col})::numeric, 6)")
+    elif cls == "boolean":
+        aggregates["sum"] = f"COUNT(*) FILTER (WHERE {col})"
+    elif cls == "datetime":
+        aggregates.update(min=f"to_char(MIN({col}), 'YYYY-MM-DD HH24:MI:SS')",
+                          max=f"to_char(MAX({col}), 'YYYY-MM-DD HH24:MI:SS')")
+    else:
+        aggregates.update(min=f'MIN({normalized} COLLATE "C")', max=f'MAX({normalized} COLLATE "C")')
+    return aggregates
+
+
+# === TYPE INFERENCE ===
+# The narrowest PostgreSQL type that holds a column's observed values, tested with the
+# parsers the load uses (after the text transform's strip). Candidates are tried narrowest
+# first. SMALLINT is never inferred: keys and counters outgrow it, and row alignment
+# usually takes back the two bytes it saves.
+
+INTEGER_TYPE_RANGES = (
+    ("INTEGER", -2**31, 2**31 - 1),
+    ("BIGINT", -2**53, 2**53),   # float64 parsing is exact up to 2**53
+)
+ISO_DATE_PATTERN = r"\d{4}-\d{2}-\d{2}"
+ISO_TIMESTAMP_PATTERN = r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?"
+
+
+def _integer_candidates(numbers):
+    """(type, fits) for the integer types; numbers is NaN where a value is not a whole number"""
+    return [(name, ((numbers >= low) & (numbers <= high)).to_numpy())
+            for name, low, high in INTEGER_TYPE_RANGES]
+
+
+def infer_pg_type(values, pg_type):
+    """Narrowest PostgreSQL type for a column's raw export strings (ISO dates, NULL = missing)
+
+    Returns None when no type narrower than pg_type fits, else a dict:
+    type (narrowest type fitting TYPE_TIGHTENING_MIN_FIT of the values),
+    partial (some values would fail the cast), cast_failures, failing_values
+    (examples) and fits_observed (narrowest type every profiled value fits,
+    None = pg_type). A fit describes today's data only; later rows may not fit.
+    """
+    counts = values.value_counts(dropna=True)
+    if counts.empty:
+        return None
+    distinct = pd.Series(counts.index.astype(str), dtype=object)
+    weights = counts.to_numpy()
+    total = int(weights.sum())
+    cls = fingerprint_class(pg_type)
+    base = pg_type.split("(")[0].strip().upper()
+
+    candidates = []
+    if cls in ("real", "double"):
+        numbers = pd.to_numeric(distinct, errors="coerce")
+        candidates += _integer_candidates(numbers.where(numbers % 1 == 0))
+    elif cls == "datetime" and base == "TIMESTAMP":
+        parsed = pd.to_datetime(distinct, format="ISO8601", errors="coerce")
+        candidates.append(("DATE", (parsed.notna() & (parsed == parsed.dt.normalize())).to_numpy()))
+    elif cls == "text":
+        stripped = distinct.str.strip(TRIM_WHITESPACE)
+        # Leading zeros (codes like "007") and signs other than "-" are text, not numbers
+        whole = stripped.str.fullmatch(r"-?(?:0|[1-9][0-9]*)")
+        candidates += _integer_candidates(pd.to_numeric(stripped.where(whole), errors="coerce"))
+        for name, pattern in (("DATE", ISO_DATE_PATTERN), ("TIMESTAMP", ISO_TIMESTAMP_PATTERN)):
+            iso = stripped.where(stripped.str.fullmatch(pattern))
+            candidates.append((name, pd.to_datetime(iso, format="ISO8601", errors="coerce").notna().to_numpy()))
+        length = int(stripped.str.len().max())
+        declared = int(pg_type.split("(")[1].rstrip(") ")) if "(" in pg_type else None
+        if 0 < length <= VARCHAR_MAX_LENGTH and (declared is None or length < declared):
+            candidates.append((f"VARCHAR({length})", np.ones(len(distinct), dtype=bool)))
+
+    fits = [(name, mask, int(weights[mask].sum())) for name, mask in candidates]
+    fits_observed = next((name for name, _, fit in fits if fit == total), None)
+    chosen = next(((name, mask, fit) for name, mask, fit in fits
+                   if fit >= total * TYPE_TIGHTENING_MIN_FIT), None)
+    if chosen is None:
+        return None
+    name, mask, fit = chosen
+    return {
+        "type": name,
+        "partial": fit < total,
+        "cast_failures": total - fit,
+        "failing_values": [str(v)[:50] for v in distinct[~mask][:5]],
+        "fits_observed": fits_observed,
+    }
+
+
+def wider_pg_type(a, b):
+    """The wider of two PostgreSQL types of one family (it holds the other's values), else None"""
+    if a == b:
+        return a
+
+    def rank(pg_type):
+        base = pg_type.split("(")[0].strip().upper()
+        if base in ("SMALLINT", "INTEGER", "BIGINT"):
+            return "integer", ("SMALLINT", "INTEGER", "BIGINT").index(base)
+        if base == "VARCHAR" and "(" in pg_type:
+            return "text", int(pg_type.split("(")[1].rstrip(") "))
+        if base in ("VARCHAR", "TEXT"):
+            return "text", float("inf")
+        if base in ("DATE", "TIMESTAMP"):
+            return "datetime", ("DATE", "TIMESTAMP").index(base)
+        return pg_type, 0
+
+    (family_a, rank_a), (family_b, rank_b) = rank(a), rank(b)
+    if family_a != family_b:
+        return None
+    return a if rank_a >= rank_b else b
+
+
+# === DATE PROFILES ===
+# Range, rows per month and physical ordering of date columns, for the partitioning
+# advisor. correlation is computed like pg_stats.correlation (value rank against row
+# position in the export): near +-1, a BRIN index over block ranges is as selective
+# as a B-tree at a fraction of the size.
+
+def date_profile(values):
+    """Profile of a column's ISO date strings (None if it holds no dates)
+
+    low and high are the PARTITION_BOUND_PERCENTILE percentiles: unlike min and max
+    they are not moved by a few placeholder dates.
+    """
+    parsed = pd.to_datetime(values, format="ISO8601", errors="coerce").dropna()
+    if parsed.empty:
+        return None
+    months = parsed.dt.to_period("M").value_counts().sort_index()
+    correlation = None
+    if parsed.nunique() > 1:
+        correlation = round(float(np.corrcoef(np.arange(len(parsed)), parsed.rank().to_numpy())[0, 1]), 4)
+    return {
+        "min": parsed.min().strftime(MDB_DATETIME_FORMAT),
+        "max": parsed.max().strftime(MDB_DATETIME_FORMAT),
+        "low": parsed.quantile(PARTITION_BOUND_PERCENTILE / 100, interpolation="lower").strftime(MDB_DATETIME_FORMAT),
+        "high": parsed.quantile(1 - PARTITION_BOUND_PERCENTILE / 100, interpolation="higher").strftime(MDB_DATETIME_FORMAT),
+        "months": {str(month): int(count) for month, count in months.items()},
+        "correlation": correlation,
+    }
+
+
+def brin_suitable(rows, profile):
+    """True if a BRIN index fits a date column of a table with rows rows"""
+    return bool(rows >= BRIN_MIN_ROWS and profile and profile["correlation"] is not None
+                and abs(profile["correlation"]) >= BRIN_MIN_CORRELATION)
+
+
+def partition_bounds(first, last, interval):
+    """[(suffix, from, to)] range partitions covering first..last plus one period ahead"""
+    step = pd.offsets.MonthBegin(1) if interval == "month" else pd.offsets.YearBegin(1)
+    start = pd.Timestamp(first).normalize().replace(day=1)
+    if interval == "year":
+        start = start.replace(month=1)
+    ahead = pd.Timestamp(last) + step   # start of the period after the last value
+    bounds = []
+    while start <= ahead:
+        end = start + step
+        suffix = start.strftime("%Y_%m" if interval == "month" else "%Y")
+        bounds.append((suffix, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")))
+        start = end
+    return bounds
+
+
+def pg_suffixed(name, suffix):
+    """name + suffix within PostgreSQL's 63-character identifier limit, keeping the suffix"""
+    return name[:63 - len(suffix)] + suffix
+
+
+# === RANGE RECONCILIATION ===
+# Both sides hash every row (normalized values joined with \x1f, NULL as \N) and answer
+# "row count and hash sum per key sub-range". Only sub-ranges whose summaries differ are
+# split further, so the work follows the number of differences, not the table size.
+
+RECONCILE_NULL = "\\N"
+RECONCILE_SEPARATOR = "\x1f"
+
+
+def reconcile_key(value, cls):
+    """Comparable key value for a normalized key; orders like PostgreSQL (text in "C" collation)
+
+    Also accepts key values fetched from PostgreSQL, where a DATE key comes back
+    as a datetime.date that cannot be compared with datetime.
+    """
+    if not isinstance(value, str):
+        if cls == "datetime" and not isinstance(value, datetime) and isinstance(value, date):
+            return datetime.combine(value, datetime.min.time())
+        return value
+    if cls == "integer":
+        return int(value)
+    if cls == "numeric":
+        return Decimal(value)
+    if cls == "datetime":
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    return value
+
+
+class FrameRangeSide:
+    """In-memory side of a reconciliation: rows sorted by key with prefix sums of row hashes
+
+    Built from the analyzer's table export, or from a CSV file standing in for the
+    database (e.g. written with \\COPY ... TO ... CSV HEADER).
+    """
+
+    def __init__(self, df, columns, pg_types, key_index):
+        self.cls = fingerprint_class(pg_types[key_index])
+        normalized = [
+            normalize_values(df[col], pg_type) if col in df.columns
+            else pd.Series(None, index=df.index, dtype=object)
+            for col, pg_type in zip(columns, pg_types)
+        ]
+        joined = normalized[0].fillna(RECONCILE_NULL)
+        for values in normalized[1:]:
+            joined = joined + RECONCILE_SEPARATOR + values.fillna(RECONCILE_NULL)
+
+        keys = normalized[key_index]
+        present = keys.notna().to_numpy()
+        self.null_keys = int((~present).sum())
+        key_values = [reconcile_key(k, self.cls) for k in keys.to_numpy()[present]]
+        hashes = np.array([value_hash(t) for t in joined.to_numpy()[present]], dtype=np.int64)
+        order = sorted(range(len(key_values)), key=key_values.__getitem__)
+
+        self.keys = [key_values[i] for i in order]
+        self.hashes = hashes[order] if len(order) else hashes
+        # Prefix sums in two 30-bit halves so int64 cannot overflow
+        self.high = np.concatenate([[0], np.cumsum(self.hashes >> 30)])
+        self.low = np.concatenate([[0], np.cumsum(self.hashes & ((1 << 30) - 1))])
+
+    def _span(self, lo, hi):
+        start = 0 if lo is None else bisect.bisect_left(self.keys, lo)
+        end = len(self.keys) if hi is None else bisect.bisect_left(self.keys, hi)
+        return start, end
+
+    def summarize(self, lo, hi, points):
+        """(row count, hash sum) for each sub-range of [lo, hi) split at points"""
+        bounds = [lo, *points, hi]
+        summaries = []
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            start, end = self._span(a, b)
+            total = (int(self.high[end] - self.high[start]) << 30) + int(self.low[end] - self.low[start])
+            summaries.append((end - start, total))
+        return summaries
+
+    def split_points(self, lo, hi, n):
+        """Up to n - 1 keys splitting [lo, hi) into ranges of similar row counts"""
+        start, end = self._span(lo, hi)
+        points = []
+        for k in range(1, n):
+            key = self.keys[start + (end - start) * k // n]
+            if (lo is None or key > lo) and (not points or key > points[-1]):
+                points.append(key)
+        return points
+
+    def row_hashes(self, lo, hi):
+        """Row hash per key in [lo, hi)"""
+        start, end = self._span(lo, hi)
+        rows = {}
+        for key, h in zip(self.keys[start:end], self.hashes[start:end]):
+            rows[key] = rows.get(key, 0) + int(h)
+        return rows
+
+
+class PostgresRangeSide:
+    """Database side of a reconciliation: the same summaries computed by range queries"""
+
+    def __init__(self, conn, pg_table, columns, pg_types, key_index):
+        self.conn = conn
+        self.table = pg_table
+        self.cls = fingerprint_class(pg_types[key_index])
+        key = columns[key_index]
+        self.key = f'"{key}" COLLATE "C"' if self.cls == "text" else f'"{key}"'
+        self.key_text = fingerprint_sql_expression(key, pg_types[key_index])
+        self.key_type = {"integer": "bigint", "numeric": "numeric", "datetime": "timestamp"}.get(self.cls, "text")
+        row_text = ", ".join(
+            f"COALESCE({fingerprint_sql_expression(col, pg_type)}, '{RECONCILE_NULL}')"
+            for col, pg_type in zip(columns, pg_types)
+        )
+        self.row_hash = f"('x' || substr(md5(concat_ws(chr(31), {row_text})), 1, 15))::bit(60)::bigint"
+        self.null_keys = self._query(f'SELECT COUNT(*) FROM "{pg_table}" WHERE "{key}" IS NULL')[0][0]
+
+    def _query(self, sql, params=()):
+        with self.conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    def _where(self, lo, hi):
+        clauses, params = [f"{self.key} IS NOT NULL"], []
+        if lo is not None:
+            clauses.append(f"{self.key} >= %s::{self.key_type}")
+            params.append(lo)
+        if hi is not None:
+            clauses.append(f"{self.key} < %s::{self.key_type}")
+            params.append(hi)
+        return " AND ".join(clauses), params
+
+    def summarize(self, lo, hi, points):
+        where, params = self._where(lo, hi)
+        if points:
+            key = self.key if self.cls == "text" else f"{self.key}::{self.key_type}"
+            bucket = f"width_bucket({key}, %s::{self.key_type}[])"
+            params = [list(points), *params]
+        else:
+            bucket = "0"
+        rows = self._query(
+            f'SELECT {bucket}, COUNT(*), SUM({self.row_hash}) FROM "{self.table}" WHERE {where} GROUP BY 1',
+            params
+        )
+        summaries = [(0, 0)] * (len(points) + 1)
+        for bucket, count, total in rows:
+            summaries[bucket] = (count, int(total))
+        return summaries
+
+    def split_points(self, lo, hi, n):
+        where, params = self._where(lo, hi)
+        fractions = [k / n for k in range(1, n)]
+        keys = self._query(
+            f"SELECT percentile_disc(%s::float8[]) WITHIN GROUP (ORDER BY {self.key}) "
+            f'FROM "{self.table}" WHERE {where}',
+            [fractions, *params]
+        )[0][0] or []
+        points = []
+        for key in keys:
+            if key is None:
+                continue
+            key = reconcile_key(key, self.cls)
+            if (lo is None or key > lo) and (not points or key > points[-1]):
+                points.append(key)
+        return points
+
+    def row_hashes(self, lo, hi):
+        where, params = self._where(lo, hi)
+        rows = {}
+        for key, h in self._query(f'SELECT {self.key_text}, {self.row_hash} FROM "{self.table}" WHERE {where}', params):
+            key = reconcile_key(key, self.cls)
+            rows[key] = rows.get(key, 0) + int(h)
+        return rows
+
+
+def reconcile_ranges(source, target, fanout=RECONCILE_FANOUT, leaf_rows=RECONCILE_LEAF_ROWS):
+    """Compare two range sides and return the keys that are missing, extra or changed in target
+
+    Starts from the whole key range and descends only into sub-ranges whose row count
+    or hash sum differ; ranges of at most leaf_rows rows are compared key by key.
+    """
+    result = {"missing": [], "extra": [], "changed": [], "ranges_compared": 0, "rows_fetched": 0}
+    root = (source.summarize(None, None, [])[0], target.summarize(None, None, [])[0])
+    pending = [] if root[0] == root[1] else [(None, None, *root)]
+
+    while pending:
+        lo, hi, src, tgt = pending.pop()
+        result["ranges_compared"] += 1
+        points = []
+        if max(src[0], tgt[0]) > leaf_rows:
+            points = (source if src[0] >= tgt[0] else target).split_points(lo, hi, fanout)
+        if not points:
+            src_rows, tgt_rows = source.row_hashes(lo, hi), target.row_hashes(lo, hi)
+            result["rows_fetched"] += len(src_rows) + len(tgt_rows)
+            result["missing"].extend(k for k in src_rows if k not in tgt_rows)
+            result["extra"].extend(k for k in tgt_rows if k not in src_rows)
+            result["changed"].extend(k for k, h in src_rows.items() if k in tgt_rows and tgt_rows[k] != h)
+            continue
+        bounds = [lo, *points, hi]
+        children = zip(source.summarize(lo, hi, points), target.summarize(lo, hi, points))
+        for i, (src_child, tgt_child) in enumerate(children):
+            if src_child != tgt_child:
+                pending.append((bounds[i], bounds[i + 1], src_child, tgt_child))
+
+    for kind in ("missing", "extra", "changed"):
+        result[kind].sort()
+    return result
+
+
+# === ACCESS SQL PARSER ===
+# Just enough of Access (Jet) SQL to tell which tables and columns a saved query reads
+
+ACCESS_SQL_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<name>\[[^\]]*\])
+  | (?P<string>"(?:[^"]|"")*"|'(?:[^']|'')*')
+  | (?P<date>\#[^#\n]*\#)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<word>[^\W\d]\w*)
+  | (?P<op><>|<=|>=|.)
+""", re.VERBOSE | re.DOTALL)
+
+ACCESS_SQL_KEYWORDS = {
+    "ALL", "AND", "AS", "ASC", "BETWEEN", "BY", "DELETE", "DESC", "DISTINCT", "DISTINCTROW",
+    "EXISTS", "FALSE", "FROM", "FULL", "GROUP", "HAVING", "IN", "INNER", "INSERT", "INTO", "IS",
+    "JOIN", "LEFT", "LIKE", "MOD", "NOT", "NULL", "ON", "OPTION", "OR", "ORDER", "OUTER",
+    "OWNERACCESS", "PARAMETERS", "PERCENT", "PIVOT", "RIGHT", "SELECT", "SET", "TOP",
+    "TRANSFORM", "TRUE", "UNION", "UPDATE", "VALUES", "WHERE", "WITH", "XOR", "YES", "NO",
+}
+_SQL_SOURCE_KEYWORDS = {"FROM", "JOIN", "INTO", "UPDATE"}
+_SQL_CLAUSE_KEYWORDS = {"SELECT", "WHERE", "GROUP", "ORDER", "HAVING", "SET", "VALUES",
+                        "PIVOT", "TRANSFORM", "UNION", "ON", "PARAMETERS"}
+
+
+def tokenize_access_sql(sql):
+    """(kind, text) tokens of an Access SQL statement, whitespace dropped
+
+    kind is "name" for identifiers ([bracketed] ones unwrapped), "keyword",
+    "literal" for strings, #dates# and numbers, or "op".
+    """
+    tokens = []
+    for m in ACCESS_SQL_TOKEN.finditer(sql or ""):
+        kind, text = m.lastgroup, m.group()
+        if kind == "ws":
+            continue
+        if kind == "name":
+            tokens.append(("name", text[1:-1]))
+        elif kind == "word":
+            tokens.append(("keyword", text.upper()) if text.upper() in ACCESS_SQL_KEYWORDS else ("name", text))
+        elif kind in ("string", "date", "number"):
+            tokens.append(("literal", text))
+        else:
+            tokens.append(("op", text))
+    return tokens
+
+
+def access_sql_references(sql, catalog):
+    """Tables and columns an Access SQL statement reads or writes
+
+    catalog maps lower-case table names to (table name, {lower-case column: column}).
+    Returns (tables, columns, predicates): sets of table names, (table, column)
+    pairs, and (table, column, role) for the columns compared in ON ("join") or
+    WHERE/HAVING ("filter") clauses. References are resolved against the catalog
+    through table aliases; those that match nothing in the catalog (expression
+    aliases, parameters, other saved queries) are left out.
+
+    Every SELECT (subqueries and UNION branches included) has its own scope:
+    an unqualified name resolves against the tables of its own scope and the
+    derived tables in it, and only falls back to the enclosing scopes
+    (correlated subqueries) when none of those has the column.
+    """
+    tokens = tokenize_access_sql(sql)
+    scopes = [{"parent": None, "aliases": {}, "derived": [], "star": False}]
+    chains = []           # column references: (name parts, "*" for a wildcard; clause; scope)
+    clause, expect_source, from_depth, stack, scope = None, False, 0, [], 0
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        if kind == "keyword":
+            if text in _SQL_SOURCE_KEYWORDS:
+                clause, expect_source, from_depth = "FROM", True, len(stack)
+            elif text == "UNION":
+                # The next SELECT reads its own tables
+                scopes.append({"parent": scopes[scope]["parent"], "aliases": {}, "derived": [], "star": False})
+                clause, expect_source, scope = text, False, len(scopes) - 1
+            elif text in _SQL_CLAUSE_KEYWORDS:
+                clause, expect_source = text, False
+            i += 1
+            continue
+        if kind == "op":
+            if text == "(":
+                stack.append((clause, scope))
+                if i + 1 < len(tokens) and tokens[i + 1] == ("keyword", "SELECT"):
+                    scopes.append({"parent": scope, "aliases": {}, "derived": [], "star": False})
+                    if expect_source:
+                        scopes[scope]["derived"].append(len(scopes) - 1)
+                    scope = len(scopes) - 1
+                expect_source = False
+            elif text == ")":
+                (clause, scope), expect_source = (stack.pop() if stack else (clause, scope)), False
+            elif text == ";":
+                clause, expect_source = None, False
+            elif text == "," and clause == "FROM" and len(stack) == from_depth:
+                expect_source = True
+            elif text == "*" and clause == "SELECT" and i:
+                # SELECT *, SELECT DISTINCT *, SELECT a, *, SELECT TOP 5 * (not a * b)
+                prev = tokens[i - 1]
+                if prev[0] == "keyword" or prev == ("op", ",") or (i >= 2 and tokens[i - 2] == ("keyword", "TOP")):
+                    scopes[scope]["star"] = True
+            i += 1
+            continue
+        if kind != "name":
+            i += 1
+            continue
+
+        # A dotted (or Forms!-style) chain of names
+        start, parts = i, [text]
+        while (i + 2 < len(tokens) and tokens[i + 1] in (("op", "."), ("op", "!"))
+               and (tokens[i + 2][0] in ("name", "keyword") or tokens[i + 2] == ("op", "*"))):
+            parts.append(tokens[i + 2][1])
+            i += 2
+        i += 1
+        following = tokens[i] if i < len(tokens) else (None, None)
+
+        if expect_source:
+            table = catalog.get(parts[-1].lower())
+            alias = None
+            if following == ("keyword", "AS") and i + 1 < len(tokens):
+                alias, i = tokens[i + 1][1], i + 2
+            elif following[0] == "name":
+                alias, i = following[1], i + 1
+            if table:
+                scopes[scope]["aliases"][parts[-1].lower()] = table[0]
+                if alias:
+                    scopes[scope]["aliases"][alias.lower()] = table[0]
+            expect_source = False
+        elif clause == "PARAMETERS" or (following == ("op", "(") and len(parts) == 1):
+            continue   # parameter declaration or function call
+        elif start and tokens[start - 1] == ("keyword", "AS"):
+            continue   # expression alias
+        elif clause == "FROM" and start and tokens[start - 1] == ("op", ")"):
+            continue   # derived table alias: (SELECT ...) x
+        else:
+            chains.append((parts, clause, scope))
+
+    def visible(s):
+        """Aliases of scope s and of the derived tables it selects from"""
+        aliases = dict(scopes[s]["aliases"])
+        for child in scopes[s]["derived"]:
+            aliases.update((k, v) for k, v in visible(child).items() if k not in aliases)
+        return aliases
+
+    def enclosing(s):
+        while s is not None:
+            yield s, visible(s)
+            s = scopes[s]["parent"]
+
+    tables = {t for sc in scopes for t in sc["aliases"].values()}
+    columns = set()
+    predicates = set()
+    roles = {"ON": "join", "WHERE": "filter", "HAVING": "filter"}
+    for parts, clause, scope in chains:
+        found = []
+        if len(parts) >= 2:
+            qualifier = parts[-2].lower()
+            owner = next((aliases[qualifier] for _, aliases in enclosing(scope) if qualifier in aliases), None)
+            owner = owner or (catalog.get(qualifier) or (None,))[0]
+            if owner is None:
+                continue
+            owner_columns = catalog[owner.lower()][1]
+            if parts[-1] == "*":
+                columns.update((owner, c) for c in owner_columns.values())
+            elif parts[-1].lower() in owner_columns:
+                found.append((owner, owner_columns[parts[-1].lower()]))
+        else:
+            for _, aliases in enclosing(scope):
+                for owner in set(aliases.values()):
+                    owner_columns = catalog[owner.lower()][1]
+                    if parts[0].lower() in owner_columns:
+                        found.append((owner, owner_columns[parts[0].lower()]))
+                if found:
+                    break
+        columns.update(found)
+        if clause in roles:
+            predicates.update((owner, column, roles[clause]) for owner, column in found)
+    for s, sc in enumerate(scopes):
+        if sc["star"]:
+            for owner in set(visible(s).values()):
+                columns.update((owner, c) for c in catalog[owner.lower()][1].values())
+    return tables, columns, predicates
+
+
+# === OUT-OF-CORE SET OPERATIONS ===
+# Uniqueness, subset and orphan checks for tables larger than memory. Column values are
+# hash-partitioned into bucket files while the export streams past; equal values always
+# land in the same bucket, so each bucket can be checked on its own.
+
+class SpilledColumns:
+    """Non-NULL values of some table columns, hash-partitioned into on-disk buckets"""
+
+    def __init__(self, columns, buckets, directory=None):
+        self.columns = list(columns)
+        self.buckets = buckets
+        self.directory = tempfile.mkdtemp(prefix="access_spill_", dir=directory)
+        self.rows = 0
+        self.non_null = dict.fromkeys(self.columns, 0)
+        self._writers = {}   # (column, bucket) -> bucket file open for appending
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def close(self):
+        """Close the bucket files still open for writing"""
+        for f in self._writers.values():
+            f.close()
+        self._writers = {}
+
+    def _path(self, column, bucket):
+        return os.path.join(self.directory, f"{self.columns.index(column)}_{bucket}.pkl")
+
+    def _writer(self, column, bucket):
+        key = (column, bucket)
+        if key not in self._writers:
+            self._writers[key] = open(self._path(column, bucket), "ab")
+        return self._writers[key]
+
+    def add(self, df):
+        """Partition one chunk (string values) into the bucket files"""
+        self.rows += len(df)
+        for column in self.columns:
+            if column not in df.columns:
+                continue
+            values = df[column].dropna()
+            self.non_null[column] += len(values)
+            if values.empty:
+                continue
+            ids = pd.util.hash_pandas_object(values, index=False).to_numpy() % self.buckets
+            values = values.to_numpy()
+            for bucket in np.unique(ids):
+                pickle.dump(values[ids == bucket], self._writer(column, bucket), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def bucket(self, column, bucket):
+        """All values of one column that hashed to bucket"""
+        self.close()
+        parts = []
+        path = self._path(column, bucket)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                while True:
+                    try:
+                        parts.append(pickle.load(f))
+                    except EOFError:
+                        break
+        return pd.Series(np.concatenate(parts) if parts else [], dtype=object)
+
+    def distinct_count(self, column):
+        """Number of distinct non-NULL values, one bucket in memory at a time"""
+        return sum(self.bucket(column, b).nunique() for b in range(self.buckets))
+
+
+def spilled_subset(child, child_column, parent, parent_column, examples=5):
+    """Compare child values with parent values bucket by bucket (both spilled with the same bucket count)
+
+    Returns distinct and row counts of child values missing from the parent, plus a few examples.
+    """
+    result = {"child_distinct": 0, "missing_distinct": 0, "missing_rows": 0, "missing_values": []}
+    for b in range(child.buckets):
+        values = child.bucket(child_column, b)
+        if values.empty:
+            continue
+        parents = set(parent.bucket(parent_column, b))
+        missing = values[~values.isin(parents)]
+        result["child_distinct"] += values.nunique()
+        result["missing_distinct"] += missing.nunique()
+        result["missing_rows"] += len(missing)
+        if len(result["missing_values"]) < examples:
+            result["missing_values"].extend(missing.unique()[:examples - len(result["missing_values"])])
+    return result
+
+
+# === ANALYSIS PASSES ===
+# Pass name -> (analyzer method, passes whose results it reads), in run order
+ANALYSIS_PASSES = {
+    "tables": ("get_tables", ()),
+    "queries": ("get_queries", ()),
+    "relationships": ("get_relationships", ()),
+    "table_details": ("analyze_table_details", ("tables",)),   # catalog only, no table data
+    "row_counts": ("count_table_rows", ("table_details",)),
+    "data_quality": ("analyze_data_quality", ("row_counts",)),
+    "potential_issues": ("identify_potential_issues", ("table_details", "queries")),
+    "query_usage": ("analyze_query_usage", ("table_details", "queries")),
+    "primary_keys": ("detect_primary_keys", ("row_counts",)),
+    "indexes": ("analyze_indexes", ("primary_keys",)),
+    "powerbi_impact": ("analyze_powerbi_impact", ("query_usage",)),
+    "inferred_foreign_keys": ("infer_foreign_keys", ("primary_keys",)),
+    "referential_integrity": ("validate_referential_integrity", ("inferred_foreign_keys",)),
+    "dax_impact": ("analyze_dax_impact", ("table_details",)),
+    "dead_columns": ("detect_dead_columns", ("data_quality", "query_usage")),
+    "index_advice": ("recommend_indexes", ("data_quality", "indexes", "inferred_foreign_keys", "query_usage")),
+    "partition_advice": ("recommend_partitioning", ("data_quality", "query_usage")),
+}
+
+# --schema-only: the catalog passes; no table data is exported (see analyze_schema)
+SCHEMA_ONLY_PASSES = ("tables", "relationships", "table_details")
+
+# Artifact group (output subdirectory) -> passes its files are built from
+ARTIFACT_GROUPS = {
+    # Column types are tightened from the data quality profiles; partitioning.sql and
+    # the materialized views follow the partition, index and Power BI advice
+    SCHEMA_DIR: ("table_details", "data_quality", "inferred_foreign_keys", "index_advice",
+                 "partition_advice", "powerbi_impact"),
+    POWERBI_DIR: ("powerbi_impact", "dax_impact"),
+    DATA_QUALITY_DIR: ("data_quality", "potential_issues", "primary_keys", "dead_columns", "referential_integrity"),
+    RELATIONSHIPS_DIR: ("relationships", "indexes", "inferred_foreign_keys", "index_advice", "partition_advice"),
+    MIGRATION_DIR: tuple(ANALYSIS_PASSES),   # full_analysis.json holds every pass
+    ETL_DIR: ("queries", "data_quality", "indexes", "inferred_foreign_keys"),
+    ANALYSIS_DIR: ("primary_keys",),
+    "readme": (),
+}
+
+# Passes that store their results under another report key (default: the pass name)
+PASS_REPORT_KEYS = {
+    "row_counts": "table_details",
+    "primary_keys": "table_details",
+    "referential_integrity": "referential_integrity_issues",
+}
+
+
+def _selection_name(name):
+    """Accept '02-powerbi', '02-powerbi/' or 'powerbi' for an artifact group"""
+    name = name.strip().rstrip("/")
+    for group in ARTIFACT_GROUPS:
+        if name in (group, group.split("-", 1)[-1]):
+            return group
+    if name in ANALYSIS_PASSES:
+        return name
+    choices = ", ".join(list(ANALYSIS_PASSES) + list(ARTIFACT_GROUPS))
+    raise ValueError(f"Unknown pass or artifact group '{name}' (choose from: {choices})")
+
+
+def pass_closure(names):
+    """names plus every pass they read from"""
+    needed, pending = set(), list(names)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(ANALYSIS_PASSES[name][1])
+    return needed
+
+
+def resolve_selection(only=(), skip=()):
+    """Passes to run and artifact groups to write for --only / --skip
+
+    --only names passes and/or artifact groups; the passes they read from are
+    added. Artifact groups are written when selected, or (when only passes were
+    selected) whenever everything they need ran. Skipping a pass drops the
+    passes and groups that depend on it. Returns (passes in run order, groups).
+    """
+    only = [_selection_name(n) for n in only]
+    skip = {_selection_name(n) for n in skip}
+    blocked = {n for n in ANALYSIS_PASSES if pass_closure([n]) & skip}
+    wanted = [n for n in only if n in ANALYSIS_PASSES]
+
+    if only and not any(n in ARTIFACT_GROUPS for n in only):
+        passes = [n for n in ANALYSIS_PASSES if n in pass_closure(wanted) and n not in blocked]
+        groups = [g for g, needs in ARTIFACT_GROUPS.items()
+                  if needs and g not in skip and pass_closure(needs) <= set(passes)]
+        return passes, groups
+
+    groups = [g for g, needs in ARTIFACT_GROUPS.items()
+              if (not only or g in only) and g not in skip and not pass_closure(needs) & blocked]
+    wanted += [n for g in groups for n in ARTIFACT_GROUPS[g]]
+    passes = [n for n in ANALYSIS_PASSES if n in pass_closure(wanted) and n not in blocked]
+    return passes, groups
+
+
+def remove_stale_artifact(path):
+    """Delete a file an earlier run wrote that this run's results no longer call for"""
+    if os.path.exists(path):
+        os.remove(path)
+        print(f"   Removed: {os.path.basename(path)} (no longer generated)")
+
+
+THEMED_DIRS = [SCHEMA_DIR, POWERBI_DIR, DATA_QUALITY_DIR, RELATIONSHIPS_DIR, MIGRATION_DIR, ETL_DIR, ANALYSIS_DIR]
+
+
+def output_files(output_dir):
+    """{themed directory: file names} as written; data subdirectories (csv/, blobs/, ...) are not counted"""
+    files = {}
+    for directory in THEMED_DIRS:
+        path = os.path.join(output_dir, directory)
+        files[directory] = sorted(name for name in os.listdir(path)
+                                  if os.path.isfile(os.path.join(path, name))) if os.path.isdir(path) else []
+    return files
+
 
 class AccessDatabaseAnalyzerWSL:
-    def __init__(self, db_path):
+    def __init__(self, db_path, sample_rows=None, check_environment=True):
         self.db_path = db_path
         self.report = {}
+        self.sample_rows = sample_rows  # None = profile every row
+        self._samples = {}
+        # Warm caches for watch mode (None = disabled)
+        self._command_cache = None   # mdbtools output, per analysis cycle
+        self._frame_cache = None     # parsed exports -> (frame, bytes), keyed by a digest of the export
+        self._frames_used = set()
+        self._export_digests = {}    # (table, export args) -> digest, per analysis cycle
+        self._quality_cache = {}     # table -> (digest, columns, data quality result)
+        self._table_cache = {}       # (pass, table) -> (inputs, result), see cached_table_result
+        self._schema = None          # table -> DDL, from one mdb-schema run (see schema_statements)
+        self._query_usage = None     # (lower table, lower column or None) -> saved query names
+        self._tightened = None       # (data_quality list, foreign key list, {(table, column): type})
+        if not check_environment:
+            return
         
         # Verify mdbtools is installed
         try:
@@ -36,47 +1384,177 @@ class AccessDatabaseAnalyzerWSL:
     
     def run_mdb_command(self, command, *args):
         """Run an mdbtools command and return output"""
+        return self.mdb_output(command, *args).decode(MDB_ENCODING, errors="replace")
+
+    def mdb_output(self, command, *args):
+        """Run an mdbtools command and return its raw output (bytes in MDB_ENCODING)
+
+        Exports are parsed straight from these bytes (read_csv(encoding=MDB_ENCODING)),
+        without decoding them to a str first.
+        """
+        cacheable = self._command_cache is not None and command != "mdb-export"
+        if cacheable and (command, args) in self._command_cache:
+            return self._command_cache[(command, args)]
         try:
             result = subprocess.run(
                 [command, self.db_path, *args],
                 capture_output=True,
-                text=True,
+                env=mdb_environment(),
                 check=True
             )
+            if cacheable:
+                self._command_cache[(command, args)] = result.stdout
             return result.stdout
         except subprocess.CalledProcessError as e:
-            print(f"   Warning: {command} failed - {e.stderr}")
-            return ""
+            print(f"   Warning: {command} failed - {e.stderr.decode(MDB_ENCODING, errors='replace')}")
+            return b""
+
+    def enable_warm_cache(self):
+        """Keep mdbtools output and parsed exports between analysis cycles (watch mode)
+
+        Within a cycle every table is exported once per set of export options;
+        across cycles an export whose digest is unchanged is not parsed or
+        profiled again, and the per-table results of the key and dead column
+        passes are reused (see cached_table_result). Parsed exports are held up
+        to WATCH_FRAME_CACHE_MB, least recently used first out; a table larger
+        than that is re-parsed when read and only its digest is kept.
+        """
+        self._command_cache = {}
+        self._frame_cache = {}
+
+    def begin_cycle(self):
+        """Start a fresh analysis pass over the (possibly changed) database
+
+        Returns the table digests of the previous cycle, so the caller can tell
+        which tables changed. Parsed exports not used by the previous cycle are dropped.
+        """
+        previous = self.table_digests()
+        self.report = {}
+        self._samples = {}
+        self._command_cache = {}
+        self._schema = None
+        self._export_digests = {}
+        self._frame_cache = {k: v for k, v in self._frame_cache.items() if k in self._frames_used}
+        self._frames_used = set()
+        return previous
+
+    def table_digests(self):
+        """Digest of each table's default export in the current cycle"""
+        return {table: digest for (table, args), digest in self._export_digests.items()
+                if args == without_blobs(())}
+
+    def _warm_export(self, table_name, export_args, read_options):
+        """export_table_to_df through the warm caches"""
+        cycle_key = (table_name, tuple(export_args))
+        options = repr(sorted(read_options.items()))
+        digest = self._export_digests.get(cycle_key)
+        frame_key = (digest, cycle_key, options)
+        if digest is not None and frame_key in self._frame_cache:
+            # Most recently used last, so eviction drops the stalest frames first
+            self._frame_cache[frame_key] = self._frame_cache.pop(frame_key)
+        else:
+            output = self.mdb_output("mdb-export", *export_args, table_name)
+            digest = self._export_digests[cycle_key] = hashlib.sha1(output).hexdigest()
+            frame_key = (digest, cycle_key, options)
+            if frame_key not in self._frame_cache:
+                frame = (pd.read_csv(io.BytesIO(output), encoding=MDB_ENCODING, **read_options)
+                         if output else pd.DataFrame())
+                size = int(frame.memory_usage(index=True, deep=True).sum())
+                budget = WATCH_FRAME_CACHE_MB * 1024 * 1024
+                if size > budget:
+                    return frame
+                self._frame_cache[frame_key] = (frame, size)
+                while sum(n for _, n in self._frame_cache.values()) > budget:
+                    del self._frame_cache[next(iter(self._frame_cache))]
+        self._frames_used.add(frame_key)
+        return self._frame_cache[frame_key][0].copy(deep=False)
+
+    def cached_table_result(self, pass_name, table, inputs, compute):
+        """compute() for one table, or the last cycle's result if nothing it reads changed (watch mode)
+
+        The result is reused while the table's export digest, its columns and
+        inputs (whatever else compute reads, e.g. another table's digest) are
+        unchanged. Outside watch mode compute() always runs.
+        """
+        digest = self.table_digests().get(table["name"]) if self._frame_cache is not None else None
+        if digest is None:
+            return compute()
+        key = (digest, table["columns"], inputs)
+        cached = self._table_cache.get((pass_name, table["name"]))
+        if cached and cached[0] == key:
+            return cached[1]
+        result = compute()
+        self._table_cache[(pass_name, table["name"])] = (key, result)
+        return result
+
+    def report_digests(self):
+        """Artifact group -> digest of the report sections its files are built from
+
+        Watch mode rewrites only the groups whose digest changed.
+        """
+        digests = {}
+        for group, needs in ARTIFACT_GROUPS.items():
+            keys = sorted({PASS_REPORT_KEYS.get(name, name) for name in pass_closure(needs)})
+            sections = json.dumps({key: self.report.get(key) for key in keys}, sort_keys=True, default=str)
+            digests[group] = hashlib.sha1(sections.encode("utf-8")).hexdigest()
+        return digests
     
-    def analyze_all(self):
-        """Run complete database analysis"""
+    def analyze_all(self, passes=None):
+        """Run complete database analysis
+
+        passes limits the run to those ANALYSIS_PASSES (see resolve_selection).
+        """
         print("=" * 60)
         print("ACCESS DATABASE ANALYZER (WSL/Linux)")
         print("=" * 60)
         print(f"Database: {self.db_path}")
+        if self.sample_rows:
+            print(f"Sampling: up to {self.sample_rows:,} random rows per table")
         print(f"Analysis started: {datetime.now()}\n")
         
         self.report["database_path"] = self.db_path
         self.report["analysis_date"] = str(datetime.now())
+        self.report["sample_rows"] = self.sample_rows
         
-        self.get_tables()
-        self.get_queries()
-        self.get_relationships()
-        self.analyze_table_details()
-        self.analyze_data_quality()
-        self.identify_potential_issues()
-
-        # Enhanced analysis methods
-        self.detect_primary_keys()
-        self.analyze_indexes()
-        self.analyze_powerbi_impact()
-        self.infer_foreign_keys()
-        self.validate_referential_integrity()
-        self.analyze_dax_impact()
-        self.detect_dead_columns()
+        if passes is not None:
+            skipped = [n for n in ANALYSIS_PASSES if n not in passes]
+            if skipped:
+                print(f"Skipping passes: {', '.join(skipped)}\n")
+
+        for name, (method, _) in ANALYSIS_PASSES.items():
+            if passes is None or name in passes:
+                getattr(self, method)()
 
         return self.report
     
+    def analyze_schema(self, output_dir=None):
+        """Catalog-only analysis for --schema-only: runs SCHEMA_ONLY_PASSES, exports no table data
+
+        When output_dir holds an earlier report of this database, its data-derived
+        results are kept (data quality, keys, Power BI impact, and the row counts
+        and primary keys of tables whose columns are unchanged), so the schema keeps
+        its tightened types and materialized views. Without one, the schema is
+        written from the catalog types.
+        """
+        previous = {}
+        if output_dir:
+            try:
+                previous = read_report(output_dir)
+            except FileNotFoundError:
+                pass
+        if os.path.abspath(previous.get("database_path") or "") != os.path.abspath(self.db_path):
+            previous = {}
+        catalog = set(SCHEMA_ONLY_PASSES) | {"database_path", "analysis_date", "sample_rows"}
+        self.report = {key: value for key, value in previous.items() if key not in catalog}
+        self.analyze_all(list(SCHEMA_ONLY_PASSES))
+
+        earlier = {t["name"]: t for t in previous.get("table_details", [])}
+        for detail in self.report["table_details"]:
+            before = earlier.get(detail["name"])
+            if before and [c["name"] for c in before["columns"]] == [c["name"] for c in detail["columns"]]:
+                detail.update({key: value for key, value in before.items() if key not in ("pg_name", "columns")})
+        return self.report
+
     def get_tables(self):
         """Get all user tables"""
         print("Analyzing tables...")
@@ -102,22 +1580,14 @@ class AccessDatabaseAnalyzerWSL:
         
         try:
             output = self.run_mdb_command("mdb-queries", "-L")
-            if output.strip():
-                for line in output.strip().split("\n"):
-                    if line.strip():
-                        queries.append({
-                            "name": line.strip(),
-                            "type": "QUERY",
-                            "sql": None
-                        })
-                
-                # Try to get SQL for each query
-                for q in queries:
-                    try:
-                        sql_output = self.run_mdb_command("mdb-queries", q["name"])
-                        q["sql"] = sql_output.strip()[:500]  # Limit length
-                    except:
-                        pass
+            names = [line.strip() for line in output.strip().split("\n") if line.strip()]
+            definitions = self.query_definitions(names)
+            for name in names:
+                queries.append({
+                    "name": name,
+                    "type": "QUERY",
+                    "sql": definitions.get(name)
+                })
         except Exception as e:
             print(f"   Warning: Could not read queries - {e}")
         
@@ -131,6 +1601,44 @@ class AccessDatabaseAnalyzerWSL:
             print("   WARNING: Review these queries - they may need recreation in PostgreSQL\n")
         
         return queries
+
+    def query_definitions(self, names, jobs=QUERY_JOBS, cache_dir=QUERY_CACHE_DIR):
+        """Full SQL of each saved query, {name: sql}
+
+        Definitions are extracted with concurrent mdb-queries runs and cached
+        under the database's content fingerprint, so a later run against an
+        unchanged file reads them from the cache instead.
+        """
+        cache_path, cached = None, {}
+        if cache_dir and names:
+            cache_path = os.path.join(cache_dir, f"{file_fingerprint(self.db_path)}.json")
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                cached = {}
+
+        definitions = {name: cached[name] for name in names if name in cached}
+        missing = [name for name in names if name not in definitions]
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                for name, output in zip(missing, pool.map(lambda n: self.run_mdb_command("mdb-queries", n), missing)):
+                    definitions[name] = output.strip()
+        if names:
+            print(f"   Query definitions: {len(names) - len(missing)} cached, {len(missing)} extracted")
+
+        if cache_path and missing:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Written aside and renamed, as batch workers may share the cache
+                partial = f"{cache_path}.{os.getpid()}.tmp"
+                with open(partial, "w", encoding="utf-8") as f:
+                    # Failed extractions (empty output) are retried next run
+                    json.dump({**cached, **{n: sql for n, sql in definitions.items() if sql}}, f, ensure_ascii=False)
+                os.replace(partial, cache_path)
+            except OSError as e:
+                print(f"   Warning: Could not write query cache - {e}")
+        return definitions
     
     def get_relationships(self):
         """Get relationships using mdb-schema"""
@@ -160,12 +1668,43 @@ class AccessDatabaseAnalyzerWSL:
         print(f"   Found {len(relationships)} relationships\n")
         return relationships
     
+    def schema_statements(self):
+        """Split one mdb-schema dump of the whole database into per-table DDL
+
+        Returns {table name: DDL text}, where a table's text holds its CREATE TABLE
+        block and the CREATE INDEX statements on it. One mdb-schema run replaces
+        a run per table (and another per table for the indexes).
+        """
+        if self._schema is None:
+            self._schema = {}
+            output = self.run_mdb_command("mdb-schema")
+            current = None
+            for line in output.split("\n"):
+                stripped = line.strip()
+                create = re.match(r'CREATE\s+TABLE\s+(.+?)\s*\(?$', stripped, re.IGNORECASE)
+                index = re.match(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+.+?\s+ON\s+(\[[^\]]+\]|"[^"]+"|`[^`]+`|\S+)',
+                                 stripped, re.IGNORECASE)
+                if create:
+                    current = create.group(1).strip('[]"`')
+                    self._schema.setdefault(current, "")
+                elif index:
+                    self._schema.setdefault(index.group(1).strip('[]"`'), "")
+                    self._schema[index.group(1).strip('[]"`')] += line + "\n"
+                    continue
+                if current is not None:
+                    self._schema[current] += line + "\n"
+                    if stripped.startswith(")"):
+                        current = None
+        return self._schema
+
     def get_table_schema(self, table_name):
         """Get column info for a table using mdb-schema"""
         columns = []
         
         try:
-            output = self.run_mdb_command("mdb-schema", "-T", table_name)
+            output = self.schema_statements().get(table_name)
+            if output is None:
+                output = self.run_mdb_command("mdb-schema", "-T", table_name)
             
             # Parse CREATE TABLE statement
             in_create = False
@@ -214,18 +1753,289 @@ class AccessDatabaseAnalyzerWSL:
         
         return columns
     
-    def export_table_to_df(self, table_name):
-        """Export a table to pandas DataFrame"""
+    def export_table_to_df(self, table_name, export_args=(), sample=True, **read_options):
+        """Export a table to pandas DataFrame
+
+        In sample mode this returns the table's sample instead (see sample_table),
+        unless sample=False asks for the whole table. Binary column contents are
+        left out unless export_args choose a -b mode.
+        """
+        export_args = without_blobs(export_args)
+        if self.sample_rows and sample:
+            try:
+                return self.sample_frame(table_name, export_args, read_options)
+            except Exception as e:
+                print(f"      Error sampling {table_name}: {e}")
+                return pd.DataFrame()
         try:
-            output = self.run_mdb_command("mdb-export", table_name)
+            if self._frame_cache is not None:
+                return self._warm_export(table_name, export_args, read_options)
+            output = self.mdb_output("mdb-export", *export_args, table_name)
             if output:
-                return pd.read_csv(io.StringIO(output))
+                return pd.read_csv(io.BytesIO(output), encoding=MDB_ENCODING, **read_options)
         except Exception as e:
             print(f"      Error exporting {table_name}: {e}")
         return pd.DataFrame()
-    
+
+    def spawn_mdb_command(self, command, *args):
+        """Start an mdbtools command with its output on a pipe"""
+        return subprocess.Popen(
+            [command, self.db_path, *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=mdb_environment()
+        )
+
+    def iter_table_chunks(self, table_name, chunksize, export_args=(), **read_options):
+        """Stream a table from mdb-export as DataFrame chunks
+
+        Only one chunk is held in memory at a time; mdb-export blocks on the
+        pipe while the consumer is busy. Binary column contents are left out
+        unless export_args choose a -b mode.
+        """
+        proc = self.spawn_mdb_command("mdb-export", *without_blobs(export_args), table_name)
+        try:
+            yield from pd.read_csv(proc.stdout, chunksize=chunksize, encoding=MDB_ENCODING, **read_options)
+        except pd.errors.EmptyDataError:
+            pass
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read().decode(MDB_ENCODING, errors="replace")
+            proc.stderr.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            raise RuntimeError(f"mdb-export failed for {table_name}: {stderr.strip()}")
+
+    def iter_blob_chunks(self, table_name, columns, max_rows=None):
+        """Stream columns of a hex blob export (-b hex) as DataFrames of strings (empty = None)
+
+        Chunks are cut by size, at BLOB_CHUNK_MB of field text, not by row count:
+        a thousand rows of attachments can be gigabytes. A row above the budget is
+        a chunk of its own. With max_rows, the export is stopped after that many rows.
+        """
+        budget = BLOB_CHUNK_MB * 1024 * 1024
+        csv.field_size_limit(sys.maxsize)   # one field holds a whole blob
+        proc = self.spawn_mdb_command("mdb-export", "-b", "hex", "-D", MDB_DATETIME_FORMAT,
+                                      "-T", MDB_DATETIME_FORMAT, table_name)
+        stopped = False
+        try:
+            reader = csv.reader(io.TextIOWrapper(proc.stdout, encoding=MDB_ENCODING, newline=""))
+            header = next(reader, None)
+            if header is not None:
+                positions = [header.index(column) for column in columns]
+                rows, size, read = [], 0, 0
+                for record in reader:
+                    if max_rows is not None and read >= max_rows:
+                        stopped = True
+                        break
+                    read += 1
+                    values = [record[i] or None for i in positions]
+                    row_size = sum(len(v) for v in values if v)
+                    if rows and size + row_size > budget:
+                        yield pd.DataFrame(rows, columns=columns, dtype=object)
+                        rows, size = [], 0
+                    rows.append(values)
+                    size += row_size
+                if rows:
+                    yield pd.DataFrame(rows, columns=columns, dtype=object)
+        finally:
+            if stopped:
+                proc.kill()
+            proc.stdout.close()
+            stderr = proc.stderr.read().decode(MDB_ENCODING, errors="replace")
+            proc.stderr.close()
+            returncode = proc.wait()
+        if returncode != 0 and not stopped:
+            raise RuntimeError(f"mdb-export failed for {table_name}: {stderr.strip()}")
+
+    def binary_columns(self, table):
+        """Catalog columns loaded as BYTEA"""
+        return [c for c in table["columns"] if fingerprint_class(self.pg_column_type(c)) is None]
+
+    def scan_blobs(self, table, blob_dir=None, max_rows=None):
+        """Stream a table's binary columns as hex, keeping only size and hash statistics
+
+        Returns (rows, {column: stats}); about BLOB_CHUNK_MB of hex is in memory at a time.
+        max_rows stops after the first rows (sample mode profiling).
+        With blob_dir, every distinct blob is written once (write_blob) and, for a
+        table with a primary key, blob_dir/<pg_name>.manifest.csv maps each
+        (key, column) to its blob. Keys are written as PostgreSQL prints the loaded
+        key (normalize_values), so the import can match them with key::text.
+        """
+        binary = self.binary_columns(table)
+        pk = next((c for c in table["columns"] if c["name"] == table.get("primary_key")), None)
+        if pk in binary:
+            pk = None
+        stats = {c["name"]: {"non_null": 0, "total_bytes": 0, "min_bytes": None, "max_bytes": None}
+                 for c in binary}
+        digests = {c["name"]: set() for c in binary}
+        manifest = f"{blob_dir}/{table['pg_name']}.manifest.csv" if blob_dir and pk else None
+        if manifest:
+            pd.DataFrame(columns=["key", "column", "sha256", "bytes"]).to_csv(manifest, index=False)
+
+        rows = 0
+        usecols = [c["name"] for c in binary] + ([pk["name"]] if pk else [])
+        for chunk in self.iter_blob_chunks(table["name"], usecols, max_rows):
+            rows += len(chunk)
+            keys = normalize_values(chunk[pk["name"]], self.pg_column_type(pk, table["name"])) if pk else None
+            entries = []
+            for col in binary:
+                column = stats[col["name"]]
+                for index, text in chunk[col["name"]].dropna().items():
+                    data = bytes.fromhex(text)
+                    digest = hashlib.sha256(data).hexdigest()
+                    digests[col["name"]].add(digest)
+                    column["non_null"] += 1
+                    column["total_bytes"] += len(data)
+                    column["min_bytes"] = len(data) if column["min_bytes"] is None else min(column["min_bytes"], len(data))
+                    column["max_bytes"] = max(column["max_bytes"] or 0, len(data))
+                    if blob_dir:
+                        write_blob(blob_dir, digest, data)
+                    if manifest and keys[index] is not None:
+                        entries.append((keys[index], col["name"], digest, len(data)))
+            if entries:
+                pd.DataFrame(entries).to_csv(manifest, mode="a", header=False, index=False)
+
+        for name, column in stats.items():
+            column["rows"] = rows
+            column["distinct_blobs"] = len(digests[name])
+            column["avg_bytes"] = round(column["total_bytes"] / column["non_null"]) if column["non_null"] else None
+        return rows, stats
+
+    def sample_table(self, table_name, export_args=SAMPLE_EXPORT_ARGS):
+        """Uniform random sample of up to sample_rows rows, and the table's total row count
+
+        Streams the export once, keeping the rows with the smallest random keys
+        (a reservoir sample), so only one chunk and the sample are in memory.
+        The sample is read the way the load paths read the export (ISO dates,
+        only empty fields are NULL) and shared by every profiling pass. Other
+        export_args take their own sample; the fixed seed picks the same rows.
+        """
+        export_args = without_blobs(export_args)
+        cache_key = (table_name, export_args)
+        if cache_key in self._samples:
+            return self._samples[cache_key]
+
+        rng = np.random.default_rng(SAMPLE_SEED)
+        sample, keys, total = pd.DataFrame(), np.empty(0), 0
+        for chunk in self.iter_table_chunks(table_name, STREAM_CHUNK_ROWS, export_args, **SAMPLE_READ_OPTIONS):
+            total += len(chunk)
+            sample = pd.concat([sample, chunk], ignore_index=True) if len(sample) else chunk.reset_index(drop=True)
+            keys = np.concatenate([keys, rng.random(len(chunk))])
+            if len(sample) > self.sample_rows:
+                keep = np.sort(np.argpartition(keys, self.sample_rows)[:self.sample_rows])
+                sample, keys = sample.iloc[keep].reset_index(drop=True), keys[keep]
+
+        self._samples[cache_key] = (sample, total)
+        return sample, total
+
+    def sample_frame(self, table_name, export_args=SAMPLE_EXPORT_ARGS, read_options=None):
+        """A table's sample as export_table_to_df would read it with these arguments
+
+        The sample holds the export's raw text, so other read_options are applied
+        by parsing that text again.
+        """
+        sample = self.sample_table(table_name, export_args)[0]
+        read_options = read_options or {}
+        if read_options == SAMPLE_READ_OPTIONS or sample.empty:
+            return sample.copy(deep=False)
+        text = io.StringIO()
+        sample.to_csv(text, index=False)
+        text.seek(0)
+        return pd.read_csv(text, **read_options)
+
+    def sample_note(self, table_name):
+        """How much of a table a data-derived finding is based on"""
+        if not self.sample_rows:
+            return "all rows"
+        sample, total = self.sample_table(table_name)
+        if len(sample) >= total:
+            return f"all {total:,} rows"
+        return f"sample of {len(sample):,} / {total:,} rows"
+
+    def is_sampled(self, table_name):
+        """True if findings for this table come from a partial sample"""
+        if not self.sample_rows:
+            return False
+        sample, total = self.sample_table(table_name)
+        return len(sample) < total
+
+    def sample_confidence(self, count, n):
+        """95% confidence statement for a rate observed as count of n sampled rows"""
+        if n == 0:
+            return "unknown (empty sample)"
+        if count == 0:
+            return f"< {300 / n:.2g}% (none in sample; 95%, rule of three)"
+        if count == n:
+            return f"> {100 - 300 / n:.4g}% (all of sample; 95%, rule of three)"
+        p = count / n
+        return f"{p * 100:.1f}% ± {196 * (p * (1 - p) / n) ** 0.5:.1f} pts (95%)"
+
+    def fits_in_memory(self, table):
+        """True if the table's DataFrame is expected to stay under HASH_MEMORY_MB"""
+        if self.sample_rows:
+            return True
+        return self._estimated_bytes(table) <= HASH_MEMORY_MB * 1024 * 1024
+
+    def _estimated_bytes(self, table):
+        # pandas keeps ~64 bytes per string value
+        row_count = table["row_count"] if isinstance(table["row_count"], int) else 0
+        return row_count * max(len(table["columns"]), 1) * 64
+
+    def spill_columns(self, table_name, columns):
+        """Stream a table into on-disk hash buckets for the given columns
+
+        Every spill uses the same bucket count, sized so that one bucket of the
+        largest table stays well under HASH_MEMORY_MB; spills of different
+        tables can therefore be compared bucket by bucket. Only the given
+        columns are parsed, as export text like key_frame reads them.
+        """
+        largest = max((self._estimated_bytes(t) for t in self.report["table_details"]), default=0)
+        buckets = max(8, 4 * -(-largest // max(int(HASH_MEMORY_MB * 1024 * 1024), 1)))
+        spilled = SpilledColumns(columns, buckets, SPILL_DIR)
+        wanted = set(columns)
+        try:
+            for chunk in self.iter_table_chunks(table_name, STREAM_CHUNK_ROWS, dtype=str,
+                                                keep_default_na=False, na_values=[""],
+                                                usecols=lambda name: name in wanted):
+                spilled.add(chunk)
+            spilled.close()
+        except Exception:
+            spilled.__exit__(None, None, None)
+            raise
+        return spilled
+
+    def key_frame(self, table_name):
+        """A table as export text (only empty fields are NULL) for the in-memory key checks
+
+        The out-of-core checks compare the same text (spill_columns), so both
+        paths agree on values such as "1" and "1.0".
+        """
+        return self.export_table_to_df(table_name, dtype=str, keep_default_na=False, na_values=[""])
+
+    def key_candidates(self, table):
+        """Columns that can hold a key: not binary and not MEMO"""
+        binary = self.binary_columns(table)
+        return [c for c in table["columns"]
+                if c not in binary and c["type"].upper() not in ("MEMO", "MEMO/HYPERLINK")]
+
+    def reference_check(self, child_table, child_column, parent_table, parent_column):
+        """Out-of-core check of child column values against parent column values
+
+        Both columns are spilled with the same bucket count and compared one
+        bucket at a time (see spilled_subset).
+        """
+        with self.spill_columns(parent_table, [parent_column]) as parent:
+            with self.spill_columns(child_table, [child_column]) as child:
+                result = spilled_subset(child, child_column, parent, parent_column)
+                result["parent_values"] = parent.non_null[parent_column]
+                return result
+
     def analyze_table_details(self):
-        """Detailed analysis of each table"""
+        """Detailed analysis of each table
+
+        Reads the catalog only; row counts come from count_table_rows.
+        """
         print("Analyzing table structures...")
         
         table_details = []
@@ -237,25 +2047,43 @@ class AccessDatabaseAnalyzerWSL:
                 "name": table,
                 "pg_name": table.lower().replace(" ", "_").replace("-", "_"),
                 "columns": [],
-                "row_count": 0,
+                "row_count": None,
                 "primary_key": None
             }
             
             # Get columns
             detail["columns"] = self.get_table_schema(table)
             
-            # Get row count by exporting and counting
-            try:
-                df = self.export_table_to_df(table)
-                detail["row_count"] = len(df)
-            except:
-                detail["row_count"] = 0
-            
             table_details.append(detail)
         
         self.report["table_details"] = table_details
         print()
         return table_details
+
+    def count_table_rows(self):
+        """Row count of each table, by exporting and counting"""
+        print("Counting rows...")
+
+        for detail in self.report["table_details"]:
+            table = detail["name"]
+            try:
+                if self.sample_rows:
+                    df, detail["row_count"] = self.sample_table(table)
+                    detail["sampled_rows"] = len(df)
+                elif self._frame_cache is not None:
+                    # Watch mode: this export is parsed once and shared by the other passes
+                    detail["row_count"] = len(self.export_table_to_df(table))
+                else:
+                    # Counted while streaming, so oversized tables are never held in memory
+                    detail["row_count"] = sum(
+                        len(chunk) for chunk in self.iter_table_chunks(table, STREAM_CHUNK_ROWS, dtype=str)
+                    )
+            except:
+                detail["row_count"] = 0
+            print(f"   {table}: {detail['row_count']:,}")
+
+        print()
+        return {t["name"]: t["row_count"] for t in self.report["table_details"]}
     
     def analyze_data_quality(self):
         """Analyze data quality"""
@@ -265,6 +2093,14 @@ class AccessDatabaseAnalyzerWSL:
         
         for table in self.report["table_details"]:
             table_name = table["name"]
+
+            # Watch mode: an unchanged export keeps its profile from the last cycle
+            digest = self.table_digests().get(table_name) if self._frame_cache is not None else None
+            cached = self._quality_cache.get(table_name)
+            if digest and cached and cached[:2] == (digest, table["columns"]):
+                print(f"   Profiling: {table_name} (unchanged)")
+                quality_report.append(cached[2])
+                continue
             print(f"   Profiling: {table_name}")
             
             table_quality = {
@@ -273,7 +2109,20 @@ class AccessDatabaseAnalyzerWSL:
             }
             
             try:
-                df = self.export_table_to_df(table_name)
+                # Read the export as it will be loaded (ISO dates, only empty fields are NULL)
+                # so the fingerprints match what ends up in PostgreSQL
+                df = self.export_table_to_df(
+                    table_name, ("-D", MDB_DATETIME_FORMAT, "-T", MDB_DATETIME_FORMAT),
+                    dtype=str, keep_default_na=False, na_values=[""]
+                )
+                sampled = self.is_sampled(table_name)
+                table_quality["rows"] = table["row_count"] if sampled else len(df)
+                table_quality["basis"] = self.sample_note(table_name)
+                # Binary columns were stripped from df; their statistics come from a separate
+                # streamed pass, over every row or, in sample mode, the first sample_rows rows
+                blob_rows, blobs = 0, {}
+                if self.binary_columns(table):
+                    blob_rows, blobs = self.scan_blobs(table, max_rows=self.sample_rows if sampled else None)
                 
                 for col in table["columns"]:
                     col_name = col["name"]
@@ -282,30 +2131,119 @@ class AccessDatabaseAnalyzerWSL:
                         "null_count": 0,
                         "null_percent": 0,
                         "distinct_count": 0,
-                        "sample_values": []
+                        "sample_values": [],
+                        "confidence": "exact",
+                        "fingerprint": None,
+                        "type_recommendation": None
                     }
-                    
-                    if col_name in df.columns:
+
+                    if col_name in blobs:
+                        stats = blobs[col_name]
+                        col_quality["null_count"] = blob_rows - stats["non_null"]
+                        if blob_rows:
+                            col_quality["null_percent"] = round(col_quality["null_count"] / blob_rows * 100, 2)
+                        col_quality["distinct_count"] = stats["distinct_blobs"]
+                        col_quality["blob_stats"] = stats
+                        if sampled:
+                            # The hex export cannot be sampled at random; these are its first rows
+                            col_quality["confidence"] = (
+                                f"NULL rate {self.sample_confidence(col_quality['null_count'], blob_rows)} "
+                                f"over the first {blob_rows:,} rows; blob counts and sizes are within them"
+                            )
+                    elif col_name in df.columns:
+                        pg_type = self.pg_column_type(col)
+                        recommendation = infer_pg_type(df[col_name], pg_type)
+                        if recommendation and sampled:
+                            # Rows outside the sample may not fit
+                            recommendation.update(partial=True, fits_observed=None)
+                        if recommendation and recommendation["fits_observed"] and TYPE_TIGHTENING:
+                            pg_type = recommendation["fits_observed"]
+                        col_quality["type_recommendation"] = recommendation
+                        if fingerprint_class(pg_type) == "datetime":
+                            col_quality["date_profile"] = date_profile(df[col_name])
                         col_quality["null_count"] = int(df[col_name].isna().sum())
                         if len(df) > 0:
                             col_quality["null_percent"] = round(
                                 (col_quality["null_count"] / len(df)) * 100, 2
                             )
                         col_quality["distinct_count"] = int(df[col_name].nunique())
+                        # Share of rows holding the most frequent value; unlike a distinct
+                        # count, a frequency estimated from a sample is not biased
+                        counts = df[col_name].value_counts(dropna=True)
+                        if len(df) > 0 and len(counts):
+                            col_quality["top_value_percent"] = round(int(counts.iloc[0]) / len(df) * 100, 4)
                         col_quality["sample_values"] = [
                             str(v)[:50] for v in df[col_name].dropna().unique()[:5]
                         ]
+                        if sampled:
+                            # Counts are within the sample; fingerprints need every row
+                            col_quality["confidence"] = (
+                                f"NULL rate {self.sample_confidence(col_quality['null_count'], len(df))}; "
+                                "distinct count is within the sample"
+                            )
+                        else:
+                            col_quality["fingerprint"] = column_fingerprint(df[col_name], pg_type)
                     
                     table_quality["columns"].append(col_quality)
             except Exception as e:
                 print(f"      Error profiling: {e}")
             
+            if digest:
+                self._quality_cache[table_name] = (digest, table["columns"], table_quality)
             quality_report.append(table_quality)
         
         self.report["data_quality"] = quality_report
         print()
         return quality_report
     
+    def analyze_query_usage(self):
+        """Index which tables and columns each saved query reads, from its parsed SQL"""
+        print("Indexing saved-query column usage...")
+
+        catalog = {
+            t["name"].lower(): (t["name"], {c["name"].lower(): c["name"] for c in t["columns"]})
+            for t in self.report["table_details"]
+        }
+        usage = {}
+        predicates = {}   # table -> column -> role ("join"/"filter") -> query names
+        unparsed = []
+        for query in self.report["queries"]["details"]:
+            if not query.get("sql"):
+                unparsed.append(query["name"])
+                continue
+            tables, columns, compared = access_sql_references(query["sql"], catalog)
+            for table in tables:
+                usage.setdefault((table.lower(), None), []).append(query["name"])
+            for table, column in columns:
+                usage.setdefault((table.lower(), column.lower()), []).append(query["name"])
+            for table, column, role in sorted(compared):
+                predicates.setdefault(table, {}).setdefault(column, {}).setdefault(role, []).append(query["name"])
+        self._query_usage = usage
+
+        self.report["query_usage"] = {
+            "tables": {t["name"]: usage.get((t["name"].lower(), None), []) for t in self.report["table_details"]},
+            "columns": {
+                t["name"]: {c["name"]: usage[(t["name"].lower(), c["name"].lower())] for c in t["columns"]
+                            if (t["name"].lower(), c["name"].lower()) in usage}
+                for t in self.report["table_details"]
+            },
+            "predicates": predicates,
+            "queries_without_sql": unparsed,
+        }
+        used_columns = sum(len(cols) for cols in self.report["query_usage"]["columns"].values())
+        total_columns = sum(len(t["columns"]) for t in self.report["table_details"])
+        print(f"   {used_columns} of {total_columns} columns are read by saved queries")
+        if unparsed:
+            print(f"   {len(unparsed)} queries without SQL were not indexed")
+        print()
+        return self.report["query_usage"]
+
+    def query_references(self, table, column=None):
+        """Saved queries that read a table (or one of its columns); None if usage was not indexed"""
+        if self._query_usage is None:
+            return None
+        return self._query_usage.get((table.lower(), column.lower() if column else None), [])
+
     def identify_potential_issues(self):
         """Identify potential migration issues"""
         print("Identifying potential migration issues...")
@@ -414,61 +2352,84 @@ class AccessDatabaseAnalyzerWSL:
         print("Detecting primary keys...")
 
         for table in self.report["table_details"]:
-            table_name = table["name"]
+            schema = self.run_mdb_command("mdb-schema", "-T", table["name"])
+            table.update(self.cached_table_result("primary_keys", table, schema,
+                                                  lambda: self._detect_primary_key(table, schema)))
 
-            # Method 1: Parse mdb-schema for PRIMARY KEY keywords
-            try:
-                schema = self.run_mdb_command("mdb-schema", "-T", table_name)
-                if "PRIMARY KEY" in schema.upper():
-                    # Extract PK column names from schema
-                    for line in schema.split("\n"):
-                        if "PRIMARY KEY" in line.upper():
-                            # Parse: PRIMARY KEY (`column_name`)
-                            import re
-                            pk_match = re.search(r'PRIMARY KEY\s*\(\s*[`"\[]?(\w+)[`"\]]?\s*\)', line, re.IGNORECASE)
-                            if pk_match:
-                                table["primary_key"] = pk_match.group(1)
-                                table["primary_key_type"] = "defined"
-                                continue
-            except Exception as e:
-                print(f"      Error parsing PK from schema: {e}")
+        pk_found = sum(1 for t in self.report["table_details"] if t.get("primary_key"))
+        print(f"   Detected primary keys in {pk_found}/{len(self.report['table_details'])} tables\n")
 
-            # Method 2: Check for ID column (likely auto-number)
-            if not table.get("primary_key"):
-                for col in table["columns"]:
-                    if col["name"].upper() == "ID" and col["type"] in ["LONG INTEGER", "COUNTER"]:
-                        table["primary_key"] = col["name"]
-                        table["primary_key_type"] = "auto_number_id"
-                        break
+    def _detect_primary_key(self, table, schema):
+        """Primary key fields (primary_key, _type, _confidence) for one table; schema is its mdb-schema DDL"""
+        table_name = table["name"]
 
-            # Method 3: Check for caceis_id (business key)
-            if not table.get("primary_key"):
-                for col in table["columns"]:
-                    if col["name"].lower() == "caceis_id" and not col["nullable"]:
-                        table["primary_key"] = col["name"]
-                        table["primary_key_type"] = "business_key"
-                        break
+        # Method 1: Parse mdb-schema for PRIMARY KEY keywords
+        try:
+            if "PRIMARY KEY" in schema.upper():
+                # Extract PK column names from schema
+                for line in schema.split("\n"):
+                    if "PRIMARY KEY" in line.upper():
+                        # Parse: PRIMARY KEY (`column_name`)
+                        import re
+                        pk_match = re.search(r'PRIMARY KEY\s*\(\s*[`"\[]?(\w+)[`"\]]?\s*\)', line, re.IGNORECASE)
+                        if pk_match:
+                            table["primary_key"] = pk_match.group(1)
+                            table["primary_key_type"] = "defined"
+                            continue
+        except Exception as e:
+            print(f"      Error parsing PK from schema: {e}")
 
-            # Method 4: Analyze data for uniqueness (check first column that's unique)
-            if not table.get("primary_key"):
-                try:
-                    df = self.export_table_to_df(table_name)
+        # Method 2: Check for ID column (likely auto-number)
+        if not table.get("primary_key"):
+            for col in table["columns"]:
+                if col["name"].upper() == "ID" and col["type"] in ["LONG INTEGER", "COUNTER"]:
+                    table["primary_key"] = col["name"]
+                    table["primary_key_type"] = "auto_number_id"
+                    break
+
+        # Method 3: Check for caceis_id (business key)
+        if not table.get("primary_key"):
+            for col in table["columns"]:
+                if col["name"].lower() == "caceis_id" and not col["nullable"]:
+                    table["primary_key"] = col["name"]
+                    table["primary_key_type"] = "business_key"
+                    break
+
+        # Method 4: Analyze data for uniqueness (check first column that's unique)
+        if not table.get("primary_key"):
+            try:
+                unique_col = None
+                candidates = self.key_candidates(table)
+                if self.fits_in_memory(table):
+                    df = self.key_frame(table_name)
                     if len(df) > 0:
-                        for col in table["columns"]:
+                        for col in candidates:
                             col_name = col["name"]
                             if col_name in df.columns:
                                 # Check if column has all unique non-null values
                                 non_null_count = df[col_name].notna().sum()
                                 unique_count = df[col_name].nunique()
                                 if non_null_count > 0 and non_null_count == unique_count == len(df):
-                                    table["primary_key"] = col_name
-                                    table["primary_key_type"] = "inferred_unique"
+                                    unique_col = col_name
                                     break
-                except:
-                    pass
+                else:
+                    # Too large for memory: check uniqueness one hash bucket at a time
+                    with self.spill_columns(table_name, [c["name"] for c in candidates]) as spilled:
+                        for col in candidates:
+                            non_null_count = spilled.non_null[col["name"]]
+                            if non_null_count > 0 and non_null_count == spilled.rows == spilled.distinct_count(col["name"]):
+                                unique_col = col["name"]
+                                break
+                if unique_col:
+                    table["primary_key"] = unique_col
+                    table["primary_key_type"] = (
+                        "inferred_unique_in_sample" if self.is_sampled(table_name) else "inferred_unique"
+                    )
+                    table["primary_key_confidence"] = f"unique in {self.sample_note(table_name)}"
+            except:
+                pass
 
-        pk_found = sum(1 for t in self.report["table_details"] if t.get("primary_key"))
-        print(f"   Detected primary keys in {pk_found}/{len(self.report['table_details'])} tables\n")
+        return {key: table[key] for key in ("primary_key", "primary_key_type", "primary_key_confidence") if key in table}
 
     def analyze_indexes(self):
         """Get index information from Access database"""
@@ -481,18 +2442,21 @@ class AccessDatabaseAnalyzerWSL:
 
             try:
                 # Try to get index info from schema
-                schema = self.run_mdb_command("mdb-schema", "-T", table_name, "--indexes")
+                schema = self.schema_statements().get(table_name)
+                if schema is None:
+                    schema = self.run_mdb_command("mdb-schema", "-T", table_name, "--indexes")
 
                 # Parse CREATE INDEX statements
                 for line in schema.split("\n"):
                     if "CREATE" in line.upper() and "INDEX" in line.upper():
                         import re
                         # Parse: CREATE [UNIQUE] INDEX index_name ON table_name (columns)
-                        index_match = re.search(r'CREATE\s+(UNIQUE\s+)?INDEX\s+(\w+)\s+ON\s+\w+\s*\(([^)]+)\)', line, re.IGNORECASE)
+                        index_match = re.search(r'CREATE\s+(UNIQUE\s+)?INDEX\s+(\[[^\]]+\]|"[^"]+"|\w+)\s+ON\s+'
+                                                r'(?:\[[^\]]+\]|"[^"]+"|\w+)\s*\((.+)\)', line, re.IGNORECASE)
                         if index_match:
                             indexes.append({
                                 "table": table_name,
-                                "index_name": index_match.group(2),
+                                "index_name": index_match.group(2).strip('[]"'),
                                 "columns": index_match.group(3).strip(),
                                 "is_unique": bool(index_match.group(1)),
                                 "is_primary_key": False,
@@ -505,13 +2469,295 @@ class AccessDatabaseAnalyzerWSL:
         for idx in indexes:
             for table in self.report["table_details"]:
                 if table["name"] == idx["table"] and table.get("primary_key"):
-                    if table["primary_key"] in idx["columns"]:
+                    if table["primary_key"] in index_column_names(idx["columns"]):
                         idx["is_primary_key"] = True
 
         self.report["indexes"] = indexes
         print(f"   Found {len(indexes)} indexes\n")
         return indexes
 
+    def recommend_indexes(self):
+        """Recommend secondary indexes from key findings, column selectivity and saved-query predicates
+
+        Candidates are inferred foreign keys (both ends) and the columns saved queries
+        join or filter on. A candidate is skipped when it is already indexed, its table
+        is below INDEX_MIN_ROWS, or its most frequent value matches more than
+        INDEX_MAX_MATCH_FRACTION of the rows (a sequential scan wins for that value).
+        Expected benefit is the rows a lookup of that value still avoids reading,
+        times the number of uses found.
+        """
+        print("Recommending indexes...")
+
+        details = {t["name"]: t for t in self.report["table_details"]}
+        quality = {(tq["table"], cq["column"]): cq
+                   for tq in self.report.get("data_quality", []) for cq in tq["columns"]}
+
+        candidates = {}   # (table, column) -> [reasons, uses]
+        for fk in self.report.get("inferred_foreign_keys", []):
+            if fk["confidence"] == "LOW":
+                continue
+            for table_name, column, reason in (
+                (fk["from_table"], fk["from_column"], f"foreign key to {fk['to_table']}.{fk['to_column']}"),
+                (fk["to_table"], fk["to_column"], f"referenced by {fk['from_table']}.{fk['from_column']}"),
+            ):
+                entry = candidates.setdefault((table_name, column), [[], 0])
+                entry[0].append(f"{reason} ({fk['confidence']})")
+                entry[1] += 1
+        predicates = (self.report.get("query_usage") or {}).get("predicates", {})
+        for table_name, columns in predicates.items():
+            for column, roles in columns.items():
+                entry = candidates.setdefault((table_name, column), [[], 0])
+                for role, queries in sorted(roles.items()):
+                    entry[0].append(f"{role} in saved queries ({len(queries)})")
+                    entry[1] += len(queries)
+
+        # Columns that lead an index 02_import_finalize.sql already builds
+        indexed = {(t["name"], t["primary_key"].lower()) for t in details.values()
+                   if t.get("primary_key") and not t.get("primary_key_type", "").startswith("inferred_unique")}
+        for idx in self.report.get("indexes", []):
+            names = index_column_names(idx["columns"])
+            if names:
+                indexed.add((idx["table"], names[0].lower()))
+
+        advice = []
+        for (table_name, column), (reasons, uses) in candidates.items():
+            table = details.get(table_name)
+            col = next((c for c in table["columns"] if c["name"] == column), None) if table else None
+            if col is None:
+                continue
+            cq = quality.get((table_name, column))
+            rows = table.get("row_count") or 0
+            entry = {
+                "table": table_name,
+                "column": column,
+                "pg_table": table["pg_name"],
+                "pg_column": col["pg_name"],
+                "reasons": "; ".join(reasons),
+                "uses": uses,
+                "rows": rows,
+                "distinct_count": cq["distinct_count"] if cq else None,
+                "match_fraction": None,
+                "selectivity": None,
+                "method": None,
+                "expected_benefit": 0,
+                "action": "SKIP",
+                "skip_reason": None,
+                "sql": None,
+            }
+            if (table_name, column.lower()) in indexed:
+                entry["skip_reason"] = "already indexed (primary key or Access index)"
+            elif (fingerprint_class(self.pg_column_type(col, table_name)) is None
+                  or col["type"].upper() in ("MEMO", "MEMO/HYPERLINK")):
+                entry["skip_reason"] = f"{col['type']} column"
+            elif rows < INDEX_MIN_ROWS:
+                entry["skip_reason"] = f"{rows} rows - below INDEX_MIN_ROWS ({INDEX_MIN_ROWS})"
+            elif not cq or not cq["distinct_count"]:
+                entry["skip_reason"] = "no profiled values"
+            else:
+                # Share of rows a lookup of the most frequent value returns. The average,
+                # non-NULL share / distinct count, hides skew and is inflated by the low
+                # distinct count of a sample; it is only used for reports without the top value.
+                if cq.get("top_value_percent") is not None:
+                    fraction = cq["top_value_percent"] / 100
+                    selectivity = f"the most frequent value matches {fraction:.1%} of rows"
+                else:
+                    fraction = (1 - cq["null_percent"] / 100) / cq["distinct_count"]
+                    selectivity = f"a value matches {fraction:.1%} of rows on average"
+                entry["match_fraction"] = round(fraction, 6)
+                entry["selectivity"] = selectivity
+                if fraction > INDEX_MAX_MATCH_FRACTION:
+                    entry["skip_reason"] = f"low selectivity - {selectivity}"
+                else:
+                    index_name = f"ix_{table['pg_name']}_{col['pg_name']}"[:63]
+                    entry["method"] = "brin" if brin_suitable(rows, cq.get("date_profile")) else "btree"
+                    using = " USING brin" if entry["method"] == "brin" else ""
+                    entry["expected_benefit"] = round(rows * (1 - fraction) * uses)
+                    entry["action"] = "CREATE"
+                    entry["sql"] = (f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+                                    f'ON "{table["pg_name"]}"{using} ("{col["pg_name"]}");')
+            advice.append(entry)
+
+        advice.sort(key=lambda a: (a["action"] != "CREATE", -a["expected_benefit"], a["table"], a["column"]))
+        self.report["index_advice"] = advice
+        recommended = sum(1 for a in advice if a["action"] == "CREATE")
+        print(f"   {recommended} indexes recommended, {len(advice) - recommended} candidates skipped\n")
+        return advice
+
+    def generate_index_script(self, filepath):
+        """Write the recommended indexes as a CREATE INDEX CONCURRENTLY script, highest benefit first"""
+        recommended = [a for a in self.report.get("index_advice", []) if a["action"] == "CREATE"]
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write("-- Recommended secondary indexes (FK, join and filter columns)\n")
+            f.write(f"-- Generated: {datetime.now()}\n")
+            f.write("-- Ordered by expected benefit; CONCURRENTLY keeps the tables writable, so run\n")
+            f.write("-- after 02_import_finalize.sql and outside a transaction block:\n")
+            f.write("--   psql -v ON_ERROR_STOP=1 -f index_recommendations.sql\n")
+            f.write("-- Skipped candidates and their reasons are in index_recommendations.xlsx\n")
+            partitioned = {p["table"] for p in self.report.get("partition_advice", []) if p["partition_interval"]}
+            if partitioned:
+                f.write("-- Run 01-schema/partitioning.sql first; partitioned tables do not support CONCURRENTLY\n")
+            f.write("\n")
+            for a in recommended:
+                f.write(f"-- {a['table']}.{a['column']}: {a['reasons']}; "
+                        f"{a['selectivity']} ({a['rows']} rows)\n")
+                if a["table"] in partitioned:
+                    f.write(a["sql"].replace(" CONCURRENTLY", "") + "\n\n")
+                else:
+                    f.write(a["sql"] + "\n\n")
+            for pg_table in dict.fromkeys(a["pg_table"] for a in recommended):
+                f.write(f'ANALYZE "{pg_table}";\n')
+
+    def recommend_partitioning(self):
+        """Recommend range partitioning and BRIN or B-tree date indexes for large date-keyed tables
+
+        Each table's key is the date column saved queries filter on most, then the
+        one with the fewest NULLs and the longest span. Tables above PARTITION_MIN_ROWS
+        are partitioned by the finest interval (month, then year) whose partitions
+        average PARTITION_MIN_PARTITION_ROWS. The key gets a BRIN index when its values
+        follow the physical row order, else a B-tree (and a CLUSTER suggestion).
+        Tables below both PARTITION_MIN_ROWS and BRIN_MIN_ROWS are left to the index
+        advisor (recommend_indexes).
+        """
+        print("Recommending partitioning...")
+
+        details = {t["name"]: t for t in self.report["table_details"]}
+        predicates = (self.report.get("query_usage") or {}).get("predicates", {})
+        advice = []
+        for tq in self.report.get("data_quality", []):
+            table = details.get(tq["table"])
+            rows = (table or {}).get("row_count") or 0
+            dated = [cq for cq in tq["columns"] if cq.get("date_profile")]
+            if not table or not dated or rows < min(PARTITION_MIN_ROWS, BRIN_MIN_ROWS):
+                continue
+
+            filters = {column: len(roles.get("filter", [])) for column, roles in predicates.get(tq["table"], {}).items()}
+            key = max(dated, key=lambda cq: (filters.get(cq["column"], 0), -cq["null_percent"],
+                                             len(cq["date_profile"]["months"])))
+            profile = key["date_profile"]
+            # Ranges span the bulk of the dates; outliers and placeholder dates go to DEFAULT
+            first = pd.Timestamp(profile.get("low", profile["min"]))
+            last = pd.Timestamp(profile.get("high", profile["max"]))
+            months_spanned = (last.year - first.year) * 12 + last.month - first.month + 1
+            years_spanned = last.year - first.year + 1
+            # Month counts come from the profiled rows; scale them to the whole table
+            dated_rows = rows * (1 - key["null_percent"] / 100)
+            scale = dated_rows / max(sum(profile["months"].values()), 1)
+
+            interval = None
+            if dated_rows / months_spanned >= PARTITION_MIN_PARTITION_ROWS:
+                interval = "month"
+            elif dated_rows / years_spanned >= PARTITION_MIN_PARTITION_ROWS:
+                interval = "year"
+            partition = rows >= PARTITION_MIN_ROWS and interval is not None
+            if partition:
+                reason = f"{rows:,} rows over {months_spanned} months - partition by {interval}"
+            elif rows < PARTITION_MIN_ROWS:
+                reason = f"{rows:,} rows - below PARTITION_MIN_ROWS ({PARTITION_MIN_ROWS:,})"
+            else:
+                reason = f"under {PARTITION_MIN_PARTITION_ROWS:,} rows per yearly partition"
+
+            brin = brin_suitable(rows, profile)
+            column = next(c for c in table["columns"] if c["name"] == key["column"])
+            advice.append({
+                "table": tq["table"],
+                "pg_table": table["pg_name"],
+                "date_column": key["column"],
+                "pg_column": column["pg_name"],
+                "rows": rows,
+                "min": profile["min"],
+                "max": profile["max"],
+                "partition_from": first.strftime(MDB_DATETIME_FORMAT),
+                "partition_to": last.strftime(MDB_DATETIME_FORMAT),
+                "months_spanned": months_spanned,
+                "avg_rows_per_month": round(dated_rows / months_spanned),
+                "peak_rows_per_month": round(max(profile["months"].values()) * scale),
+                "null_percent": key["null_percent"],
+                "correlation": profile["correlation"],
+                "filtered_by_queries": filters.get(key["column"], 0),
+                "partition_interval": interval if partition else None,
+                "partitions": len(partition_bounds(first, last, interval)) if partition else 0,
+                "index_method": "brin" if brin else "btree",
+                "cluster": not brin and rows >= BRIN_MIN_ROWS,
+                "reason": reason,
+                "basis": tq.get("basis"),
+            })
+
+        advice.sort(key=lambda a: -a["rows"])
+        self.report["partition_advice"] = advice
+        partitioned = sum(1 for a in advice if a["partition_interval"])
+        print(f"   {partitioned} of {len(advice)} date-keyed tables recommended for partitioning\n")
+        return advice
+
+    def generate_partitioning_ddl(self, filepath):
+        """Write partitioned replacements and date indexes for the partition_advice tables
+
+        A partitioned copy is created next to each loaded table, filled from it and
+        swapped in by renaming, so it runs after the import. Views keep pointing at the
+        renamed original, so the swap recreates the table's compatibility view; views
+        created by hand must be recreated too.
+        """
+        details = {t["name"]: t for t in self.report["table_details"]}
+        plan = self.materialized_view_plan()
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write("-- Range partitioning and date indexes for large date-keyed tables\n")
+            f.write(f"-- Generated: {datetime.now()}\n")
+            f.write("-- Run after 02_import_finalize.sql and before 04-relationships/index_recommendations.sql:\n")
+            f.write("--   psql -v ON_ERROR_STOP=1 -f partitioning.sql\n")
+            f.write("-- Reasons and per-table profiles are in partitioning_advice.xlsx\n\n")
+
+            for a in self.report.get("partition_advice", []):
+                table = details[a["table"]]
+                pg_table, pg_col = a["pg_table"], a["pg_column"]
+                index_name = f"ix_{pg_table}_{pg_col}"[:63]
+                using = "brin" if a["index_method"] == "brin" else "btree"
+                f.write(f"-- {a['table']}: {a['reason']}; \"{a['date_column']}\" {a['min']} .. {a['max']}, "
+                        f"correlation {a['correlation']}\n")
+
+                if a["partition_interval"]:
+                    parent = pg_suffixed(pg_table, "_partitioned")
+                    heap = pg_suffixed(pg_table, "_heap")
+                    f.write(f'CREATE TABLE "{parent}" (\n')
+                    f.write(",\n".join(self.pg_column_definitions(table)))
+                    f.write(f'\n) PARTITION BY RANGE ("{pg_col}");\n')
+                    first, last = a.get("partition_from", a["min"]), a.get("partition_to", a["max"])
+                    f.write(f"-- Ranges cover {first} .. {last} "
+                            f"(percentiles {PARTITION_BOUND_PERCENTILE}-{100 - PARTITION_BOUND_PERCENTILE})\n")
+                    for suffix, start, end in partition_bounds(first, last, a["partition_interval"]):
+                        partition = pg_suffixed(pg_table, f"_p{suffix}")
+                        f.write(f'CREATE TABLE "{partition}" PARTITION OF "{parent}" '
+                                f"FOR VALUES FROM ('{start}') TO ('{end}');\n")
+                    # NULL keys and dates outside the generated ranges
+                    f.write(f'CREATE TABLE "{pg_suffixed(pg_table, "_default")}" PARTITION OF "{parent}" DEFAULT;\n')
+                    f.write(f'CREATE INDEX "{index_name}" ON "{parent}" USING {using} ("{pg_col}");\n')
+                    if table.get("primary_key"):
+                        pk_col = self._pg_column_name(table, table["primary_key"])
+                        f.write(f"-- A primary key on a partitioned table must include the partition key:\n")
+                        f.write(f'-- ALTER TABLE "{parent}" ADD PRIMARY KEY ("{pk_col}", "{pg_col}");\n')
+                    f.write(f'INSERT INTO "{parent}" SELECT * FROM "{pg_table}";\n')
+                    f.write("BEGIN;\n")
+                    f.write(f'ALTER TABLE "{pg_table}" RENAME TO "{heap}";\n')
+                    f.write(f'ALTER TABLE "{parent}" RENAME TO "{pg_table}";\n')
+                    view_sql = self.compatibility_view_sql(table, plan)
+                    if view_sql:
+                        # Views are bound to the table, not its name: rebind this one to the partitioned table
+                        f.write(view_sql.rstrip("\n") + "\n")
+                    f.write("COMMIT;\n")
+                    f.write(f'-- Other views on "{pg_table}" now read "{heap}"; recreate them before dropping it\n')
+                    if any(fk["to_table"] == a["table"] for fk in self.report.get("inferred_foreign_keys", [])):
+                        f.write(f'-- Foreign keys referencing "{pg_table}" stay on "{heap}"; recreate them\n')
+                        f.write("-- against the partitioned table (its unique key includes the partition key).\n")
+                    f.write(f'ANALYZE "{pg_table}";\n')
+                    f.write(f'-- DROP TABLE "{heap}";  -- once the partitioned table is verified\n\n')
+                elif a["index_method"] == "btree" and not a["cluster"]:
+                    f.write("-- No date index here: B-trees for filtered columns are in index_recommendations.sql\n\n")
+                else:
+                    f.write(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{pg_table}" USING {using} ("{pg_col}");\n')
+                    if a["cluster"]:
+                        f.write("-- Rows are not stored in date order; clustering once makes date ranges\n")
+                        f.write("-- contiguous (takes an exclusive lock, rewrites the table):\n")
+                        f.write(f'-- CLUSTER "{pg_table}" USING "{index_name}";\n')
+                    f.write("\n")
+
     def analyze_powerbi_impact(self):
         """Analyze specific Power BI migration impacts"""
         print("Analyzing Power BI impact...")
@@ -527,6 +2773,8 @@ class AccessDatabaseAnalyzerWSL:
                 "column_count": len(table["columns"]),
                 "columns_with_name_changes": 0,
                 "columns_with_special_chars": 0,
+                "renamed_columns_used_by_queries": 0,
+                "saved_queries_using_table": len(self.query_references(table["name"]) or []),
                 "complexity_score": 0.0,
                 "migration_risk": "",
                 "recommended_approach": "",
@@ -538,6 +2786,8 @@ class AccessDatabaseAnalyzerWSL:
             for col in table["columns"]:
                 if col["name"] != col["pg_name"]:
                     impact["columns_with_name_changes"] += 1
+                    if self.query_references(table["name"], col["name"]):
+                        impact["renamed_columns_used_by_queries"] += 1
                 if any(c in col["name"] for c in [" ", "(", ")", "/", "%", "-"]):
                     impact["columns_with_special_chars"] += 1
 
@@ -545,7 +2795,8 @@ class AccessDatabaseAnalyzerWSL:
             impact["complexity_score"] = min(10, (
                 (5 if impact["name_will_change"] == "YES" else 0) +
                 (impact["columns_with_name_changes"] * 0.3) +
-                (impact["columns_with_special_chars"] * 0.2)
+                (impact["columns_with_special_chars"] * 0.2) +
+                (impact["renamed_columns_used_by_queries"] * 0.2)
             ))
             impact["complexity_score"] = round(impact["complexity_score"], 1)
 
@@ -632,40 +2883,135 @@ class AccessDatabaseAnalyzerWSL:
             f.write(f"-- Source: {self.db_path}\n\n")
             f.write("-- USAGE: Point Power BI to these views initially, then gradually migrate to base tables\n\n")
 
-            for table in self.report["table_details"]:
-                # Create view if table or any column name changed
-                has_changes = (table["name"] != table["pg_name"]) or any(
-                    col["name"] != col["pg_name"] for col in table["columns"]
-                )
-
-                if has_changes:
-                    view_name = f"{table['pg_name']}_compat_view"
-
-                    f.write(f"-- Compatibility view for Access table: {table['name']}\n")
-                    f.write(f"DROP VIEW IF EXISTS \"{view_name}\" CASCADE;\n")
-                    f.write(f"CREATE OR REPLACE VIEW \"{view_name}\" AS\n")
-                    f.write("SELECT\n")
-
-                    # Map columns back to original names if needed
-                    col_mappings = []
-                    for col in table["columns"]:
-                        if col["name"] != col["pg_name"]:
-                            # Rename back to Access name
-                            col_mappings.append(f'    "{col["pg_name"]}" AS "{col["name"]}"')
-                        else:
-                            col_mappings.append(f'    "{col["pg_name"]}"')
-
-                    f.write(",\n".join(col_mappings))
-                    f.write(f'\nFROM "{table["pg_name"]}";\n\n')
-
-                    # Add comment
-                    f.write(f"COMMENT ON VIEW \"{view_name}\" IS 'Compatibility view preserving Access names for table: {table['name']}';\n\n")
+            plan = self.materialized_view_plan()
+            if plan:
+                f.write(f"-- {len(plan)} views over heavy Power BI tables are MATERIALIZED; keep them current\n")
+                f.write("-- with refresh_materialized_views.sql after each load\n\n")
 
+            for table in self.report["table_details"]:
+                sql = self.compatibility_view_sql(table, plan)
+                if sql:
+                    f.write(sql)
                     views_created += 1
 
         print(f"      Created {views_created} compatibility views")
         return views_created
 
+    def compatibility_view_sql(self, table, plan):
+        """DDL (re)creating a table's compatibility view, or None if no name changed
+
+        Shared with partitioning.sql, which recreates the views of the tables it swaps.
+        """
+        # Create view if table or any column name changed
+        has_changes = (table["name"] != table["pg_name"]) or any(
+            col["name"] != col["pg_name"] for col in table["columns"]
+        )
+        if not has_changes:
+            return None
+
+        view_name = f"{table['pg_name']}_compat_view"
+        materialized = plan.get(table["name"])
+        literal = f'"{view_name}"'.replace("'", "''")
+        lines = [f"-- Compatibility view for Access table: {table['name']}"]
+        if materialized:
+            lines.append(f"-- Materialized: {materialized['reason']}")
+        # DROP VIEW fails on a materialized view and vice versa; a previous run with other
+        # COMPAT_MATERIALIZED settings may have created either kind
+        lines.append("DO $$")
+        lines.append("BEGIN")
+        lines.append(f"    CASE (SELECT relkind FROM pg_class WHERE oid = to_regclass('{literal}'))")
+        lines.append(f"        WHEN 'm' THEN DROP MATERIALIZED VIEW \"{view_name}\" CASCADE;")
+        lines.append(f"        WHEN 'v' THEN DROP VIEW \"{view_name}\" CASCADE;")
+        lines.append("        ELSE NULL;")
+        lines.append("    END CASE;")
+        lines.append("END $$;")
+        if materialized:
+            lines.append(f"CREATE MATERIALIZED VIEW \"{view_name}\" AS")
+        else:
+            lines.append(f"CREATE OR REPLACE VIEW \"{view_name}\" AS")
+        lines.append("SELECT")
+
+        # Map columns back to original names if needed
+        col_mappings = []
+        for col in table["columns"]:
+            if col["name"] != col["pg_name"]:
+                # Rename back to Access name
+                col_mappings.append(f'    "{col["pg_name"]}" AS "{col["name"]}"')
+            else:
+                col_mappings.append(f'    "{col["pg_name"]}"')
+        lines.append(",\n".join(col_mappings))
+        lines.append(f'FROM "{table["pg_name"]}";')
+        lines.append("")
+
+        if materialized:
+            # REFRESH ... CONCURRENTLY needs a unique index on plain columns
+            unique = materialized["unique_column"]
+            lines.append(f'CREATE UNIQUE INDEX "{f"ux_{view_name}"[:63]}" ON "{view_name}" ("{unique}");')
+            for column, method in materialized["index_columns"]:
+                index_name = f"ix_{view_name}_{self._pg_column_name(table, column)}"[:63]
+                lines.append(f'CREATE INDEX "{index_name}" ON "{view_name}" USING {method} ("{column}");')
+            lines.append(f"COMMENT ON MATERIALIZED VIEW \"{view_name}\" IS 'Materialized compatibility view preserving Access names for table: {table['name']}';")
+        else:
+            lines.append(f"COMMENT ON VIEW \"{view_name}\" IS 'Compatibility view preserving Access names for table: {table['name']}';")
+        return "\n".join(lines) + "\n\n"
+
+    def materialized_view_plan(self):
+        """Compatibility views to materialize: {table: reason, unique_column, index_columns}
+
+        Chosen by Power BI complexity and row count (COMPAT_MATERIALIZED,
+        MATVIEW_MIN_COMPLEXITY, MATVIEW_MIN_ROWS). A view qualifies only if its
+        primary key was profiled unique and non-NULL over the whole table: it gets the
+        unique index REFRESH MATERIALIZED VIEW CONCURRENTLY requires. Key columns
+        (inferred foreign keys, recommended indexes, the partitioning date key) are
+        indexed too. Columns are named as the view exposes them (Access names).
+        """
+        if not COMPAT_MATERIALIZED:
+            return {}
+        impacts = {i["access_table_name"]: i for i in self.report.get("powerbi_impact", [])}
+        quality = {(tq["table"], cq["column"]): (tq, cq)
+                   for tq in self.report.get("data_quality", []) for cq in tq["columns"]}
+        plan = {}
+        for table in self.report["table_details"]:
+            impact = impacts.get(table["name"])
+            rows = table.get("row_count") or 0
+            pk = table.get("primary_key")
+            tq, cq = quality.get((table["name"], pk), (None, None))
+            unique = bool(cq and cq["fingerprint"] and cq["null_count"] == 0 and cq["distinct_count"] == tq["rows"])
+            if not impact or impact["complexity_score"] < MATVIEW_MIN_COMPLEXITY or rows < MATVIEW_MIN_ROWS or not unique:
+                continue
+            columns = {}
+            for fk in self.report.get("inferred_foreign_keys", []):
+                if fk["from_table"] == table["name"] and fk["confidence"] != "LOW":
+                    columns.setdefault(fk["from_column"], "btree")
+            for advice in self.report.get("index_advice", []):
+                if advice["table"] == table["name"] and advice["action"] == "CREATE":
+                    columns.setdefault(advice["column"], advice["method"])
+            for advice in self.report.get("partition_advice", []):
+                if advice["table"] == table["name"]:
+                    columns.setdefault(advice["date_column"], advice["index_method"])
+            columns.pop(pk, None)
+            plan[table["name"]] = {
+                "reason": f"Power BI complexity {impact['complexity_score']}/10, {rows:,} rows",
+                "unique_column": pk,
+                "index_columns": sorted(columns.items()),
+            }
+        return plan
+
+    def generate_matview_refresh(self, filepath):
+        """Write REFRESH MATERIALIZED VIEW CONCURRENTLY for every materialized compatibility view"""
+        details = {t["name"]: t for t in self.report["table_details"]}
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write("-- Refresh the materialized compatibility views\n")
+            f.write(f"-- Generated: {datetime.now()}\n")
+            f.write("-- Run after each load: psql -v ON_ERROR_STOP=1 -f refresh_materialized_views.sql\n")
+            f.write("-- CONCURRENTLY keeps the views readable by Power BI during the refresh; it uses the\n")
+            f.write("-- unique index created with each view in postgresql_compatibility_views.sql\n\n")
+            for table_name in self.materialized_view_plan():
+                view_name = f"{details[table_name]['pg_name']}_compat_view"
+                f.write(f"\\echo 'Refreshing {view_name}...'\n")
+                f.write(f'REFRESH MATERIALIZED VIEW CONCURRENTLY "{view_name}";\n')
+                f.write(f'ANALYZE "{view_name}";\n\n')
+
     def infer_foreign_keys(self):
         """Infer foreign key relationships from naming patterns and data"""
         print("Inferring foreign key relationships...")
@@ -673,73 +3019,111 @@ class AccessDatabaseAnalyzerWSL:
         inferred_fks = []
 
         # Get LIST FUNDS caceis_id values (the main reference table)
+        list_funds = next((t for t in self.report["table_details"] if t["name"] == "LIST FUNDS"), None)
         list_funds_ids = set()
         try:
-            df = self.export_table_to_df("LIST FUNDS")
-            if "caceis_id" in df.columns:
-                list_funds_ids = set(df["caceis_id"].dropna().unique())
+            if list_funds is None or self.fits_in_memory(list_funds):
+                df = self.key_frame("LIST FUNDS")
+                if "caceis_id" in df.columns:
+                    list_funds_ids = set(df["caceis_id"].dropna().unique())
         except:
             pass
 
+        # Pattern 2 matches column names against every table name
+        names = [(t["name"], t["pg_name"]) for t in self.report["table_details"]]
+        inputs = (self.table_digests().get("LIST FUNDS"), names)
         for table in self.report["table_details"]:
-            table_name = table["name"]
-
             # Skip the reference table itself
-            if table_name == "LIST FUNDS":
+            if table["name"] == "LIST FUNDS":
                 continue
+            inferred_fks.extend(self.cached_table_result(
+                "inferred_foreign_keys", table, inputs,
+                lambda: self._infer_table_foreign_keys(table, list_funds, list_funds_ids)))
 
-            try:
-                df = self.export_table_to_df(table_name)
+        self.report["inferred_foreign_keys"] = inferred_fks
+        print(f"   Inferred {len(inferred_fks)} potential foreign key relationships\n")
+        return inferred_fks
 
-                for col in table["columns"]:
-                    col_name = col["name"]
+    def _infer_table_foreign_keys(self, table, list_funds, list_funds_ids):
+        """Inferred foreign keys from one table; list_funds_ids are the LIST FUNDS caceis_id values"""
+        table_name = table["name"]
+        foreign_keys = []
 
-                    # Pattern 1: caceis_id references LIST FUNDS
-                    if col_name.lower() == "caceis_id" and col_name in df.columns:
-                        # Check if values match LIST FUNDS
-                        if list_funds_ids:
-                            col_values = set(df[col_name].dropna().unique())
-                            if col_values and col_values.issubset(list_funds_ids):
+        try:
+            in_memory = self.fits_in_memory(table) and (list_funds is None or self.fits_in_memory(list_funds))
+            if in_memory:
+                df = self.key_frame(table_name)
+                columns = df.columns
+            else:
+                columns = [c["name"] for c in table["columns"]]
+
+            for col in table["columns"]:
+                col_name = col["name"]
+
+                # Pattern 1: caceis_id references LIST FUNDS
+                if col_name.lower() == "caceis_id" and col_name in columns:
+                    # Check if values match LIST FUNDS
+                    confidence = None
+                    if not in_memory:
+                        # Too large for memory: compare one hash bucket at a time
+                        check = self.reference_check(table_name, col_name, "LIST FUNDS", "caceis_id")
+                        if check["parent_values"]:
+                            if check["child_distinct"] and not check["missing_distinct"]:
                                 confidence = "HIGH"
-                            elif col_values and len(col_values.intersection(list_funds_ids)) > 0:
+                            elif check["child_distinct"] > check["missing_distinct"]:
                                 confidence = "MEDIUM"
                             else:
                                 confidence = "LOW"
+                    elif list_funds_ids:
+                        col_values = set(df[col_name].dropna().unique())
+                        if col_values and col_values.issubset(list_funds_ids):
+                            confidence = "HIGH"
+                        elif col_values and len(col_values.intersection(list_funds_ids)) > 0:
+                            confidence = "MEDIUM"
+                        else:
+                            confidence = "LOW"
+                    if confidence:
+                        # Sampled data can show a subset but cannot prove one (nor disprove
+                        # it if LIST FUNDS itself is only partly sampled)
+                        if confidence == "HIGH" and self.is_sampled(table_name):
+                            confidence = "HIGH_IN_SAMPLE"
+                        elif confidence != "HIGH" and self.is_sampled("LIST FUNDS"):
+                            confidence = "MEDIUM"
+
+                        foreign_keys.append({
+                            "from_table": table_name,
+                            "from_column": col_name,
+                            "to_table": "LIST FUNDS",
+                            "to_column": "caceis_id",
+                            "confidence": confidence,
+                            "evidence": f"{self.sample_note(table_name)}; LIST FUNDS: {self.sample_note('LIST FUNDS')}",
+                            "pattern": "exact_name_match",
+                            "postgres_fk_sql": f'ALTER TABLE "{table["pg_name"]}" ADD CONSTRAINT "fk_{table["pg_name"]}_caceis_id" FOREIGN KEY ("{col["pg_name"]}") REFERENCES "list_funds" ("caceis_id");'
+                        })
 
-                            inferred_fks.append({
+                # Pattern 2: _id or _code suffix columns
+                elif col_name.lower().endswith("_id") or col_name.lower().endswith("_code"):
+                    # Try to find referenced table
+                    potential_ref = col_name.lower().replace("_id", "").replace("_code", "")
+                    # Look for matching table
+                    for ref_table in self.report["table_details"]:
+                        if potential_ref in ref_table["name"].lower():
+                            foreign_keys.append({
                                 "from_table": table_name,
                                 "from_column": col_name,
-                                "to_table": "LIST FUNDS",
-                                "to_column": "caceis_id",
-                                "confidence": confidence,
-                                "pattern": "exact_name_match",
-                                "postgres_fk_sql": f'ALTER TABLE "{table["pg_name"]}" ADD CONSTRAINT "fk_{table["pg_name"]}_caceis_id" FOREIGN KEY ("{col["pg_name"]}") REFERENCES "list_funds" ("caceis_id");'
+                                "to_table": ref_table["name"],
+                                "to_column": "ID",  # Assumption
+                                "confidence": "LOW",
+                                "evidence": "column name only",
+                                "pattern": "naming_convention",
+                                "postgres_fk_sql": f"-- Verify and create: FK from {table['pg_name']}.{col['pg_name']} to {ref_table['pg_name']}.id"
                             })
+                            break
 
-                    # Pattern 2: _id or _code suffix columns
-                    elif col_name.lower().endswith("_id") or col_name.lower().endswith("_code"):
-                        # Try to find referenced table
-                        potential_ref = col_name.lower().replace("_id", "").replace("_code", "")
-                        # Look for matching table
-                        for ref_table in self.report["table_details"]:
-                            if potential_ref in ref_table["name"].lower():
-                                inferred_fks.append({
-                                    "from_table": table_name,
-                                    "from_column": col_name,
-                                    "to_table": ref_table["name"],
-                                    "to_column": "ID",  # Assumption
-                                    "confidence": "LOW",
-                                    "pattern": "naming_convention",
-                                    "postgres_fk_sql": f"-- Verify and create: FK from {table['pg_name']}.{col['pg_name']} to {ref_table['pg_name']}.id"
-                                })
-                                break
+        except Exception as e:
+            print(f"      Error analyzing {table_name}: {e}")
 
-            except Exception as e:
-                print(f"      Error analyzing {table_name}: {e}")
-
-        self.report["inferred_foreign_keys"] = inferred_fks
-        print(f"   Inferred {len(inferred_fks)} potential foreign key relationships\n")
-        return inferred_fks
+        return foreign_keys
 
     def generate_connection_docs(self, output_dir):
         """Generate PostgreSQL connection documentation for Power BI"""
@@ -843,7 +3227,10 @@ class AccessDatabaseAnalyzerWSL:
             f.write(f"- [ ] Add {sum(1 for t in self.report['table_details'] if not t.get('primary_key'))} missing primary keys\n")
             f.write(f"- [ ] Create {len(self.report.get('indexes', []))} indexes\n")
             f.write(f"- [ ] Add {len(self.report.get('inferred_foreign_keys', []))} foreign keys (review inferred_foreign_keys.xlsx)\n")
+            f.write(f"- [ ] Run index_recommendations.sql ({sum(1 for a in self.report.get('index_advice', []) if a['action'] == 'CREATE')} recommended indexes)\n")
             f.write("- [ ] Run postgresql_compatibility_views.sql to create compatibility views\n")
+            if self.materialized_view_plan():
+                f.write("- [ ] Schedule refresh_materialized_views.sql after each data load\n")
             f.write("- [ ] Verify all tables created successfully\n")
             f.write("- [ ] Run GRANT statements for Power BI service account\n\n")
 
@@ -903,6 +3290,93 @@ class AccessDatabaseAnalyzerWSL:
                     f.write(f"  - Complexity: {table_impact['complexity_score']}/10\n")
                     f.write(f"  - Approach: {table_impact['recommended_approach']}\n\n")
 
+    def _sql_literal(self, value, quoted):
+        """SQL literal for an expected fingerprint value"""
+        if value is None:
+            return "NULL"
+        if quoted:
+            return "'" + str(value).replace("'", "''") + "'"
+        return str(value)
+
+    def _validation_query(self, table, quality=None):
+        """Single-scan validation query for one table, returning one result row
+
+        Every check is a (conditional) aggregate over the same scan: row count,
+        NULLs in NOT NULL columns, primary key duplicates, date ranges and the
+        content fingerprints profiled from the Access data.
+        """
+        pg_name = table["pg_name"]
+        expected_rows = table["row_count"] if isinstance(table["row_count"], int) else 0
+        pk_col = None
+        if table.get("primary_key"):
+            pk_col = next((c["pg_name"] for c in table["columns"] if c["name"] == table["primary_key"]), None)
+        not_null_cols = [c["pg_name"] for c in table["columns"] if not c["nullable"]]
+        date_cols = [c["pg_name"] for c in table["columns"] if c["type"] == "DATETIME"]
+        fingerprints = {}
+        if quality:
+            fingerprints = {c["column"]: c.get("fingerprint") for c in quality["columns"]}
+        # A fingerprint is only comparable while the column keeps the type class it was
+        # profiled for (aligning foreign key types can put a column back to its catalog type)
+        fingerprint_cols = [(c, fingerprints[c["name"]]) for c in table["columns"]
+                            if fingerprints.get(c["name"]) and fingerprints[c["name"]]["class"]
+                            == fingerprint_class(self.pg_column_type(c, table["name"]))]
+
+        aggregates = ["COUNT(*) AS actual_rows"]
+        for i, col in enumerate(not_null_cols):
+            aggregates.append(f'COUNT(*) FILTER (WHERE "{col}" IS NULL) AS nulls_{i}')
+        if pk_col:
+            aggregates.append(f'COUNT(*) - COUNT(DISTINCT "{pk_col}") AS pk_duplicates')
+        for i, col in enumerate(date_cols):
+            aggregates.append(f'MIN("{col}") AS min_{i}')
+            aggregates.append(f'MAX("{col}") AS max_{i}')
+        mismatches = []
+        for i, (col, expected) in enumerate(fingerprint_cols):
+            sql = fingerprint_sql_aggregates(col["pg_name"], self.pg_column_type(col, table["name"]))
+            checks = []
+            for field, label in (("non_null", "non-null"), ("hash_sum", "hash"), ("sum", "sum"),
+                                 ("min", "min"), ("max", "max")):
+                if field not in sql:
+                    continue
+                aggregates.append(f"{sql[field]} AS fp{i}_{field}")
+                quoted = field in ("min", "max") and expected["class"] in ("datetime", "text")
+                literal = self._sql_literal(expected[field], quoted)
+                checks.append((f"fp{i}_{field} IS DISTINCT FROM {literal}", label))
+            mismatches.append((col["pg_name"], checks))
+
+        not_null_sum = " + ".join(f"nulls_{i}" for i in range(len(not_null_cols))) or "0"
+        failures = [f"CASE WHEN actual_rows <> {expected_rows} THEN 'row count ' || actual_rows || ' <> {expected_rows}' END"]
+        for i, col in enumerate(not_null_cols):
+            failures.append(f"CASE WHEN nulls_{i} > 0 THEN '{col}: ' || nulls_{i} || ' NULLs' END")
+        if pk_col:
+            failures.append(f"CASE WHEN pk_duplicates > 0 THEN '{pk_col}: ' || pk_duplicates || ' duplicate/NULL keys' END")
+        for col, checks in mismatches:
+            labels = ", ".join(f"CASE WHEN {cond} THEN '{label}' END" for cond, label in checks)
+            failures.append(f"'{col}: ' || NULLIF(concat_ws(', ', {labels}), '') || ' differ'")
+        fingerprint_mismatches = "\n        + ".join(
+            "(CASE WHEN " + " OR ".join(cond for cond, _ in checks) + " THEN 1 ELSE 0 END)"
+            for _, checks in mismatches
+        ) or "0"
+        date_ranges = ", ".join(f"'{col}: ' || COALESCE(min_{i}::text || ' .. ' || max_{i}::text, 'no values')" for i, col in enumerate(date_cols))
+
+        lines = []
+        lines.append(f"-- {table['name']}: row count, {len(not_null_cols)} NOT NULL, "
+                     f"{'PK' if pk_col else 'no PK'}, {len(date_cols)} date range(s), "
+                     f"{len(fingerprint_cols)} column fingerprint(s)")
+        lines.append("SELECT")
+        lines.append(f"    '{pg_name}' AS table_name,")
+        lines.append("    actual_rows,")
+        lines.append(f"    {expected_rows} AS expected_rows,")
+        lines.append(f"    {not_null_sum} AS not_null_violations,")
+        lines.append("    pk_duplicates," if pk_col else "    NULL::bigint AS pk_duplicates,")
+        lines.append(f"    concat_ws('; ', {date_ranges}) AS date_ranges," if date_cols else "    NULL::text AS date_ranges,")
+        lines.append(f"    {fingerprint_mismatches} AS fingerprint_mismatches,")
+        lines.append(f"    concat_ws('; ',\n        " + ",\n        ".join(failures) + "\n    ) AS failed_checks")
+        lines.append("FROM (")
+        lines.append("    SELECT\n        " + ",\n        ".join(aggregates))
+        lines.append(f'    FROM "{pg_name}"')
+        lines.append(") scan")
+        return "\n".join(lines)
+
     def generate_data_validation_queries(self, filepath):
         """Generate SQL queries for Access vs PostgreSQL data validation"""
         print("   Generating data validation queries...")
@@ -913,70 +3387,32 @@ class AccessDatabaseAnalyzerWSL:
             f.write(f"-- Generated: {datetime.now()}\n\n")
 
             f.write("-- =====================================\n")
-            f.write("-- SECTION 1: Row Count Validation\n")
-            f.write("-- =====================================\n\n")
-
-            for table in self.report["table_details"]:
-                pg_name = table["pg_name"]
-                expected_rows = table["row_count"]
-
-                f.write(f"-- Validate row count for: {table['name']}\n")
-                f.write(f"SELECT\n")
-                f.write(f"    '{pg_name}' as table_name,\n")
-                f.write(f"    COUNT(*) as actual_rows,\n")
-                f.write(f"    {expected_rows} as expected_rows,\n")
-                f.write(f"    CASE\n")
-                f.write(f"        WHEN COUNT(*) = {expected_rows} THEN 'PASS'\n")
-                f.write(f"        ELSE 'FAIL - Row count mismatch'\n")
-                f.write(f"    END as status\n")
-                f.write(f'FROM "{pg_name}";\n\n')
-
-            f.write("\n-- =====================================\n")
-            f.write("-- SECTION 2: NOT NULL Constraint Validation\n")
-            f.write("-- =====================================\n\n")
-
-            for table in self.report["table_details"]:
-                pg_name = table["pg_name"]
-                for col in table["columns"]:
-                    if not col["nullable"]:
-                        f.write(f"-- Check for NULL violations: {pg_name}.{col['pg_name']}\n")
-                        f.write(f"SELECT '{pg_name}.{col['pg_name']}' as column_name, COUNT(*) as null_violations\n")
-                        f.write(f'FROM "{pg_name}"\n')
-                        f.write(f'WHERE "{col["pg_name"]}" IS NULL;\n')
-                        f.write(f"-- Expected: 0 violations\n\n")
-
-            f.write("\n-- =====================================\n")
-            f.write("-- SECTION 3: Primary Key Uniqueness\n")
-            f.write("-- =====================================\n\n")
-
-            for table in self.report["table_details"]:
-                if table.get("primary_key"):
-                    pg_name = table["pg_name"]
-                    pk_col = next((c["pg_name"] for c in table["columns"] if c["name"] == table["primary_key"]), None)
-                    if pk_col:
-                        f.write(f"-- Check PK uniqueness: {pg_name}.{pk_col}\n")
-                        f.write(f"SELECT\n")
-                        f.write(f"    '{pg_name}.{pk_col}' as pk_column,\n")
-                        f.write(f'    "{pk_col}",\n')
-                        f.write(f"    COUNT(*) as duplicate_count\n")
-                        f.write(f'FROM "{pg_name}"\n')
-                        f.write(f'GROUP BY "{pk_col}"\n')
-                        f.write(f"HAVING COUNT(*) > 1;\n")
-                        f.write(f"-- Expected: No rows (all PKs should be unique)\n\n")
-
-            f.write("\n-- =====================================\n")
-            f.write("-- SECTION 4: Data Type Validation\n")
-            f.write("-- =====================================\n\n")
-
-            f.write("-- Check for invalid date values\n")
-            for table in self.report["table_details"]:
-                pg_name = table["pg_name"]
-                date_cols = [c for c in table["columns"] if c["type"] == "DATETIME"]
-                for col in date_cols:
-                    f.write(f"SELECT '{pg_name}.{col['pg_name']}' as column_name, MIN(\"{col['pg_name']}\") as min_date, MAX(\"{col['pg_name']}\") as max_date FROM \"{pg_name}\";\n")
+            f.write("-- SECTION 1: Table Validation (one scan per table)\n")
+            f.write("-- =====================================\n")
+            f.write("-- Each table is read once; row count, NOT NULL, primary key and date\n")
+            f.write("-- checks are conditional aggregates over that scan. Column fingerprints\n")
+            f.write("-- (non-NULL count, order-independent hash of normalized values, sum, min,\n")
+            f.write("-- max) are compared with the values profiled from the Access data, so any\n")
+            f.write("-- content difference shows up here. One row per table, failing tables first.\n\n")
+
+            quality = {q["table"]: q for q in self.report.get("data_quality", [])}
+            if self.report["table_details"]:
+                f.write("SELECT\n")
+                f.write("    table_name, actual_rows, expected_rows, not_null_violations, pk_duplicates, date_ranges,\n")
+                f.write("    fingerprint_mismatches,\n")
+                f.write("    CASE WHEN failed_checks = '' THEN 'PASS' ELSE 'FAIL' END AS status,\n")
+                f.write("    failed_checks\n")
+                f.write("FROM (\n\n")
+                f.write("\n\nUNION ALL\n\n".join(
+                    self._validation_query(t, quality.get(t["name"])) for t in self.report["table_details"]
+                ))
+                f.write("\n\n) validation\n")
+                f.write("ORDER BY status, table_name;\n\n")
+            else:
+                f.write("-- No tables to validate\n\n")
 
             f.write("\n-- =====================================\n")
-            f.write("-- SECTION 5: Summary Validation Report\n")
+            f.write("-- SECTION 2: Summary Validation Report\n")
             f.write("-- =====================================\n\n")
 
             f.write("-- Generate summary of all tables\n")
@@ -996,11 +3432,20 @@ class AccessDatabaseAnalyzerWSL:
 
         integrity_issues = []
 
+        details = {t["name"]: t for t in self.report["table_details"]}
+        list_funds = details.get("LIST FUNDS")
+        parent_fits = list_funds is None or self.fits_in_memory(list_funds)
+
         # Get LIST FUNDS caceis_id values (the reference)
         try:
-            list_funds_df = self.export_table_to_df("LIST FUNDS")
-            if "caceis_id" in list_funds_df.columns:
-                valid_caceis_ids = set(list_funds_df["caceis_id"].dropna().unique())
+            if parent_fits:
+                list_funds_df = self.key_frame("LIST FUNDS")
+                has_reference = "caceis_id" in list_funds_df.columns
+                valid_caceis_ids = set(list_funds_df["caceis_id"].dropna().unique()) if has_reference else set()
+            else:
+                # Too large for memory: every check goes through reference_check
+                has_reference = any(c["name"] == "caceis_id" for c in list_funds["columns"])
+            if has_reference:
 
                 # Tables that should reference LIST FUNDS
                 referencing_tables = [
@@ -1011,23 +3456,48 @@ class AccessDatabaseAnalyzerWSL:
 
                 for ref_table in referencing_tables:
                     try:
-                        df = self.export_table_to_df(ref_table)
-                        if "caceis_id" in df.columns:
+                        child = details.get(ref_table)
+                        if child and not (parent_fits and self.fits_in_memory(child)):
+                            # Too large for memory: find orphans one hash bucket at a time
+                            if not any(c["name"] == "caceis_id" for c in child["columns"]):
+                                continue
+                            check = self.reference_check(ref_table, "caceis_id", "LIST FUNDS", "caceis_id")
+                            orphan_count, orphan_values = check["missing_rows"], check["missing_values"]
+                            checked_rows = child["row_count"]
+                        else:
+                            df = self.key_frame(ref_table)
+                            if "caceis_id" not in df.columns:
+                                continue
                             # Find orphan records
                             orphans = df[~df["caceis_id"].isin(valid_caceis_ids) & df["caceis_id"].notna()]
-                            if len(orphans) > 0:
-                                integrity_issues.append({
-                                    "type": "ORPHAN_RECORD",
-                                    "severity": "HIGH",
-                                    "parent_table": "LIST FUNDS",
-                                    "parent_column": "caceis_id",
-                                    "child_table": ref_table,
-                                    "child_column": "caceis_id",
-                                    "orphan_count": len(orphans),
-                                    "orphan_values": ", ".join(str(v) for v in orphans["caceis_id"].unique()[:5]),
-                                    "action": "Clean up orphan records or add missing entries to LIST FUNDS before migration",
-                                    "postgres_fk_constraint": f"FK from {ref_table} to LIST FUNDS will fail with {len(orphans)} orphans"
-                                })
+                            orphan_count, orphan_values = len(orphans), orphans["caceis_id"].unique()[:5]
+                            checked_rows = len(df)
+
+                        if orphan_count > 0:
+                            issue = {
+                                "type": "ORPHAN_RECORD",
+                                "severity": "HIGH",
+                                "parent_table": "LIST FUNDS",
+                                "parent_column": "caceis_id",
+                                "child_table": ref_table,
+                                "child_column": "caceis_id",
+                                "orphan_count": orphan_count,
+                                "orphan_values": ", ".join(str(v) for v in orphan_values),
+                                "evidence": f"{self.sample_note(ref_table)}; LIST FUNDS: {self.sample_note('LIST FUNDS')}",
+                                "action": "Clean up orphan records or add missing entries to LIST FUNDS before migration",
+                                "postgres_fk_constraint": f"FK from {ref_table} to LIST FUNDS will fail with {orphan_count} orphans"
+                            }
+                            if self.is_sampled("LIST FUNDS"):
+                                # The missing parents may just not be in the LIST FUNDS sample
+                                issue["type"] = "POSSIBLE_ORPHAN_RECORD"
+                                issue["severity"] = "MEDIUM"
+                                issue["action"] = "Re-check without --sample: " + issue["action"]
+                            if self.is_sampled(ref_table):
+                                issue["postgres_fk_constraint"] = (
+                                    f"FK from {ref_table} to LIST FUNDS will fail - {orphan_count} orphans in "
+                                    f"{self.sample_note(ref_table)}, orphan rate {self.sample_confidence(orphan_count, checked_rows)}"
+                                )
+                            integrity_issues.append(issue)
                     except Exception as e:
                         print(f"      Error checking {ref_table}: {e}")
         except Exception as e:
@@ -1068,166 +3538,1090 @@ class AccessDatabaseAnalyzerWSL:
         print(f"   Identified {len(dax_impacts)} column changes that will impact DAX\n")
         return dax_impacts
 
-    def generate_etl_scripts(self, output_dir):
+    def powerbi_patterns(self, server=POWERBI_PG_SERVER, database=POWERBI_PG_DATABASE, schema=POWERBI_PG_SCHEMA):
+        """Search patterns for Access names in Power BI M and DAX, with their PostgreSQL replacements
+
+        Covers the Access.Database source and the navigation step of every table,
+        and the DAX/M references to every renamed table and column. Identical
+        pattern text from several tables (a column name used in more than one
+        table) is one pattern listing all of them.
+        """
+        patterns = {}
+
+        def add(pattern, kind, replace_with, table, column=None):
+            entry = patterns.setdefault(pattern, {
+                "pattern": pattern, "kind": kind, "replace_with": replace_with,
+                "access_table": table, "access_column": column,
+            })
+            if table and table not in entry["access_table"].split(", "):
+                entry["access_table"] += f", {table}"
+
+        add("Access.Database(", "m_source", f'PostgreSQL.Database("{server}", "{database}")', "")
+        for table in self.report["table_details"]:
+            name, pg_name = table["name"], table["pg_name"]
+            navigation = f'[Schema="{schema}",Item="{pg_name}"]'
+            add(f'[Name="{name}"]', "m_table", navigation, name)
+            add(f'[Schema="",Item="{name}"]', "m_table", navigation, name)
+            add(f'Item="{name}"', "m_table", f'Item="{pg_name}"', name)
+            if name != pg_name:
+                add(f"'{name}'", "dax_table", f"'{pg_name}'" if " " in pg_name else pg_name, name)
+            for col in table["columns"]:
+                if col["name"] == col["pg_name"]:
+                    continue
+                pg_table = f"'{pg_name}'" if " " in pg_name else pg_name
+                add(f'{name}[{col["name"]}]', "dax_column", f'{pg_table}[{col["pg_name"]}]', name, col["name"])
+                add(f"'{name}'[{col['name']}]", "dax_column", f'{pg_table}[{col["pg_name"]}]', name, col["name"])
+                add(f'[{col["name"]}]', "column", f'[{col["pg_name"]}]', name, col["name"])
+                add(f'"{col["name"]}"', "m_column", f'"{col["pg_name"]}"', name, col["name"])
+        return list(patterns.values())
+
+    def scan_powerbi_models(self, paths, output_dir):
+        """Find the measures, columns and queries in exported Power BI models that use Access names
+
+        paths are .bim / DataModelSchema / .pbit model exports and .pq / .m / .dax
+        scripts, or directories of them. Writes 02-powerbi/powerbi_model_scan.xlsx.
+        """
+        print("Scanning Power BI models...")
+        patterns = self.powerbi_patterns()
+        hits = scan_powerbi_sources(paths, patterns)
+
+        powerbi_dir = os.path.join(output_dir, POWERBI_DIR)
+        os.makedirs(powerbi_dir, exist_ok=True)
+        columns = ["file", "location", "line", "pattern", "kind", "access_table", "access_column", "replace_with", "snippet"]
+        pd.DataFrame(hits, columns=columns).to_excel(f"{powerbi_dir}/powerbi_model_scan.xlsx", index=False)
+
+        files = {h["file"] for h in hits}
+        objects = {(h["file"], h["location"]) for h in hits}
+        found = {h["pattern"] for h in hits}
+        print(f"   {len(patterns)} patterns, {len(hits)} matches in {len(objects)} objects across {len(files)} files")
+        print(f"   {len(found)} of {len(patterns)} patterns occur at least once")
+        print(f"   Saved: {POWERBI_DIR}/powerbi_model_scan.xlsx\n")
+        return hits
+
+    def rewrite_powerbi_models(self, source_dir, output_dir, jobs=POWERBI_REWRITE_JOBS,
+                               server=POWERBI_PG_SERVER, database=POWERBI_PG_DATABASE, schema=POWERBI_PG_SCHEMA):
+        """Apply every table and column rename to exported M scripts, DAX and model files
+
+        Rewritten copies of source_dir (.pq / .m / .dax scripts, .bim and
+        DataModelSchema models) go to 02-powerbi/rewritten/ with the same layout;
+        the originals are not touched. Every replacement is listed in
+        02-powerbi/powerbi_rewrite_report.xlsx for review.
+        """
+        print("Rewriting Power BI sources...")
+        patterns = self.powerbi_patterns(server, database, schema)
+        tables = {t["name"]: t["pg_name"] for t in self.report["table_details"] if t["name"] != t["pg_name"]}
+        columns = {c["name"]: c["pg_name"] for t in self.report["table_details"]
+                   for c in t["columns"] if c["name"] != c["pg_name"]}
+
+        powerbi_dir = os.path.join(output_dir, POWERBI_DIR)
+        target_dir = os.path.join(powerbi_dir, "rewritten")
+        files = []
+        for root, _, names in os.walk(source_dir):
+            for name in sorted(names):
+                lower = name.lower()
+                if lower.endswith(POWERBI_SCRIPT_EXTENSIONS) or lower.endswith((".bim", ".json")) or name == "DataModelSchema":
+                    source = os.path.join(root, name)
+                    files.append((source, os.path.join(target_dir, os.path.relpath(source, source_dir))))
+
+        changes = []
+        with ProcessPoolExecutor(max_workers=max(1, jobs), initializer=_init_rewriter,
+                                 initargs=(patterns, tables, columns)) as pool:
+            futures = {pool.submit(rewrite_powerbi_file, source, target): source for source, target in files}
+            for future in as_completed(futures):
+                try:
+                    changes.extend(future.result())
+                except Exception as e:
+                    print(f"   Warning: Could not rewrite {futures[future]} - {e}")
+        changes.sort(key=lambda c: (c["file"], c["location"], c["line"] or 0))
+
+        os.makedirs(powerbi_dir, exist_ok=True)
+        report_columns = ["file", "location", "line", "kind", "before", "after"]
+        pd.DataFrame(changes, columns=report_columns).to_excel(f"{powerbi_dir}/powerbi_rewrite_report.xlsx", index=False)
+
+        changed_files = {c["file"] for c in changes}
+        print(f"   {len(changes)} replacements in {len(changed_files)} of {len(files)} files")
+        print(f"   Saved: {POWERBI_DIR}/rewritten/ and {POWERBI_DIR}/powerbi_rewrite_report.xlsx\n")
+        return changes
+
+    def generate_etl_scripts(self, output_dir, jobs=EXPORT_JOBS, compress=EXPORT_COMPRESS, load_format=LOAD_FORMAT):
         """Generate data migration scripts"""
         print("   Generating ETL migration scripts...")
 
         # CSV files will be in the same ETL directory
         csv_dir = f"{output_dir}/csv"
+        csv_ext = "csv.gz" if compress else "csv"
 
         # 1. Export script (Bash - from Access to CSV)
         export_script = f"{output_dir}/01_export_from_access.sh"
         with open(export_script, "w", encoding="utf-8") as f:
-            f.write("#!/bin/bash\n")
-            f.write("# Export all tables from Access to CSV\n")
-            f.write(f"# Generated: {datetime.now()}\n\n")
+            if load_format == "binary":
+                self._write_binary_export_script(f)
+            else:
+                self._write_csv_export_script(f, csv_dir, jobs, compress)
+            if any(self.binary_columns(t) for t in self.report["table_details"]):
+                f.write("\n# OLE/LONGBINARY columns were stripped above; write their contents for 04_import_blobs.sql\n")
+                if load_format != "binary":
+                    # Set by the binary script's header; ANALYZER=path overrides the location of analysis.py
+                    f.write(f'ANALYZER="${{ANALYZER:-{os.path.abspath(__file__)}}}"\n')
+                    f.write('REPORT_DIR="$(cd "$(dirname "$0")/.." && pwd)"\n')
+                f.write('python3 "$ANALYZER" --db "$DB_PATH" --output "$REPORT_DIR" export-blobs || exit 1\n')
+            if load_format == "binary":
+                f.write('echo "Export complete!"\n')
+            else:
+                f.write("\n# Convert the raw exports to PostgreSQL input values: 02_import_* load csv_transformed/\n")
+                f.write('python3 "$(dirname "$0")/03_transform_data.py" || exit 1\n')
+                f.write('echo "Export complete! Manifest: $CSV_DIR/manifest.tsv"\n')
 
-            f.write("# Create CSV output directory\n")
-            f.write(f'mkdir -p "{csv_dir}"\n\n')
+        # Make script executable
+        os.chmod(export_script, 0o755)
 
-            f.write("echo 'Starting Access database export...'\n\n")
+        # 2. PostgreSQL bulk load scripts (SQL - from the transformed CSV to PostgreSQL)
+        self.generate_import_scripts(output_dir, f"{csv_dir}_transformed", compress, load_format)
 
-            for table in self.report["table_details"]:
-                f.write(f"# Export: {table['name']}\n")
-                f.write(f'echo "Exporting {table["name"]}..."\n')
-                f.write(f'mdb-export "{self.db_path}" "{table["name"]}" > "{csv_dir}/{table["pg_name"]}.csv"\n')
-                f.write(f'echo "  -> {table["row_count"]} rows"\n\n')
+        # 3. Python transformation script (for data cleaning)
+        transform_script = f"{output_dir}/03_transform_data.py"
+        transformations = {}
+        for table in self.report["table_details"]:
+            # Every table goes through the stage: the import scripts only read its output
+            transformations[f"{table['pg_name']}.{csv_ext}"] = self.build_transformations(table)
+
+        with open(transform_script, "w", encoding="utf-8") as f:
+            f.write("#!/usr/bin/env python3\n")
+            f.write('"""Data transformation script for Access to PostgreSQL migration"""\n')
+            f.write("# This script handles data type conversions and cleaning\n")
+            f.write(f"# Generated: {datetime.now()}\n")
+            f.write("# Files are processed in chunks sized to WORKER_MEMORY_MB, several files at a time\n")
+            f.write("# (override with WORKERS=n and WORKER_MEMORY_MB=n).\n\n")
 
-            f.write('echo "Export complete!"\n')
+            f.write("import gzip\n")
+            f.write("import os\n")
+            f.write("from concurrent.futures import ProcessPoolExecutor, as_completed\n\n")
+            f.write("import numpy as np\n")
+            f.write("import pandas as pd\n\n")
 
-        # Make script executable
-        import os
-        os.chmod(export_script, 0o755)
+            f.write(f'CSV_DIR = "{csv_dir}"\n')
+            f.write(f'OUTPUT_DIR = "{csv_dir}_transformed"\n')
+            f.write(f'WORKERS = int(os.environ.get("WORKERS", {TRANSFORM_WORKERS}))\n')
+            f.write(f'WORKER_MEMORY_MB = int(os.environ.get("WORKER_MEMORY_MB", {TRANSFORM_WORKER_MEMORY_MB}))\n\n')
+
+            f.write(f"MDB_DATETIME_FORMAT = {MDB_DATETIME_FORMAT!r}\n")
+            f.write(f"BOOLEAN_TRUE_VALUES = {BOOLEAN_TRUE_VALUES!r}\n")
+            f.write(f"BOOLEAN_FALSE_VALUES = {BOOLEAN_FALSE_VALUES!r}\n")
+            f.write(f"TRIM_WHITESPACE = {TRIM_WHITESPACE!r}\n")
+            f.write(f"DECIMAL_SEPARATOR = {DECIMAL_SEPARATOR!r}\n\n")
+
+            f.write("# Table-specific transformations, generated from the schema catalog\n")
+            f.write("# (datetime, boolean, currency, text = trimmed) - adjust as needed\n")
+            f.write(f"TRANSFORMATIONS = {json.dumps(transformations, indent=4, ensure_ascii=False)}\n\n\n")
+
+            for func in [parse_decimal_text, apply_transformations, transform_chunk_rows, transform_csv_file]:
+                f.write(inspect.getsource(func))
+                f.write("\n\n")
+
+            f.write("def main():\n")
+            f.write("    os.makedirs(OUTPUT_DIR, exist_ok=True)\n")
+            f.write("    with ProcessPoolExecutor(max_workers=WORKERS) as pool:\n")
+            f.write("        futures = {}\n")
+            f.write("        for filename, transformations in TRANSFORMATIONS.items():\n")
+            f.write("            src = os.path.join(CSV_DIR, filename)\n")
+            f.write("            if not os.path.exists(src):\n")
+            f.write("                print(f'Skipping {filename} (not exported)')\n")
+            f.write("                continue\n")
+            f.write("            dst = os.path.join(OUTPUT_DIR, filename)\n")
+            f.write("            futures[pool.submit(transform_csv_file, src, dst, transformations, WORKER_MEMORY_MB)] = filename\n")
+            f.write("        for future in as_completed(futures):\n")
+            f.write("            print(f'Transformed {futures[future]}: {future.result():,} rows')\n")
+            f.write("    print('Transformation complete!')\n\n\n")
+
+            f.write('if __name__ == "__main__":\n')
+            f.write("    main()\n")
 
-        # 2. PostgreSQL COPY script (SQL - from CSV to PostgreSQL)
-        import_script = f"{output_dir}/02_import_to_postgres.sql"
-        with open(import_script, "w", encoding="utf-8") as f:
-            f.write("-- Import CSV files to PostgreSQL\n")
+        os.chmod(transform_script, 0o755)
+
+        # 4. BYTEA import (SQL - from the export-blobs side files)
+        if any(self.binary_columns(t) for t in self.report["table_details"]):
+            self.generate_blob_import(output_dir)
+        else:
+            remove_stale_artifact(f"{output_dir}/04_import_blobs.sql")
+
+        print(f"      Generated ETL scripts: export, import (prepare/load/finalize, parallel driver), transform")
+
+    def _write_csv_export_script(self, f, csv_dir, jobs, compress):
+        """Body of 01_export_from_access.sh for the CSV load: parallel, resumable mdb-export runs"""
+        csv_ext = "csv.gz" if compress else "csv"
+        f.write("#!/bin/bash\n")
+        f.write("# Export all tables from Access to CSV (OLE/LONGBINARY contents go to blob side files)\n")
+        f.write(f"# Generated: {datetime.now()}\n")
+        f.write("#\n")
+        f.write("# Tables are exported in parallel (JOBS=n overrides the default job count).\n")
+        f.write("# Every finished file is recorded in manifest.tsv with its row count and\n")
+        f.write("# SHA-256 checksum. Re-running the script skips tables whose file still\n")
+        f.write("# matches the manifest, so an interrupted export resumes where it stopped.\n")
+        f.write("# Set FORCE=1 to re-export every table.\n\n")
+
+        f.write("set -u\n")
+        f.write("set -o pipefail\n\n")
+
+        f.write(f"DB_PATH={shlex.quote(self.db_path)}\n")
+        f.write(f"CSV_DIR={shlex.quote(csv_dir)}\n")
+        f.write(f'JOBS="${{JOBS:-{jobs}}}"\n')
+        f.write('FORCE="${FORCE:-0}"\n')
+        f.write(f"COMPRESS={1 if compress else 0}  # Must match the COPY commands in 02_import_to_postgres.sql\n")
+        f.write(f"DATE_FORMAT={shlex.quote(MDB_DATETIME_FORMAT)}  # ISO dates, as expected by 03_transform_data.py\n")
+        f.write("export MDB_ICONV=UTF-8  # CSV text encoding, whatever the locale; the COPY commands read UTF8\n")
+        if MDB_JET3_CHARSET:
+            f.write(f"export MDB_JET3_CHARSET={shlex.quote(MDB_JET3_CHARSET)}  # Code page of Access 97 text\n")
+        f.write('MANIFEST_DIR="$CSV_DIR/.manifest"\n\n')
+
+        f.write("# Create CSV output directory\n")
+        f.write('mkdir -p "$CSV_DIR" "$MANIFEST_DIR"\n\n')
+
+        f.write("# Count CSV records (not lines): a line only ends a record when the number of\n")
+        f.write("# double quotes seen so far is even, so multi-line memo values count once.\n")
+        f.write("count_records() {\n")
+        f.write("    awk 'NR > 1 { q += gsub(/\"/, \"&\"); if (q % 2 == 0) { n++; q = 0 } } END { print n + 0 }'\n")
+        f.write("}\n\n")
+
+        f.write("read_file() {\n")
+        f.write('    if [ "$COMPRESS" = "1" ]; then gzip -dc "$1"; else cat "$1"; fi\n')
+        f.write("}\n\n")
+
+        f.write("export_table() {\n")
+        f.write('    local table="$1" pg_name="$2" expected_rows="$3"\n')
+        f.write(f'    local file="$CSV_DIR/$pg_name.{csv_ext}"\n')
+        f.write('    local entry="$MANIFEST_DIR/$pg_name.tsv"\n')
+        f.write('    rm -f "$MANIFEST_DIR/$pg_name.failed"\n\n')
+
+        f.write("    # Resume: skip tables whose file still matches its manifest entry\n")
+        f.write('    if [ "$FORCE" != "1" ] && [ -f "$file" ] && [ -f "$entry" ]; then\n')
+        f.write('        if [ "$(sha256sum "$file" | cut -d\' \' -f1)" = "$(cut -f4 "$entry")" ]; then\n')
+        f.write('            echo "Skipping $table (checksum matches manifest)"\n')
+        f.write("            return 0\n")
+        f.write("        fi\n")
+        f.write("    fi\n\n")
+
+        f.write('    echo "Exporting $table..."\n')
+        f.write('    rm -f "$entry"\n')
+        f.write("    # Write to a temporary file first so a partial export never looks complete\n")
+        f.write('    local tmp="$file.partial"\n')
+        f.write('    if [ "$COMPRESS" = "1" ]; then\n')
+        f.write('        mdb-export -b strip -D "$DATE_FORMAT" -T "$DATE_FORMAT" "$DB_PATH" "$table" | gzip -c > "$tmp"\n')
+        f.write("    else\n")
+        f.write('        mdb-export -b strip -D "$DATE_FORMAT" -T "$DATE_FORMAT" "$DB_PATH" "$table" > "$tmp"\n')
+        f.write("    fi\n")
+        f.write("    if [ $? -ne 0 ]; then\n")
+        f.write('        echo "  !! Export failed: $table" >&2\n')
+        f.write('        rm -f "$tmp"\n')
+        f.write('        touch "$MANIFEST_DIR/$pg_name.failed"\n')
+        f.write("        return 1\n")
+        f.write("    fi\n\n")
+
+        f.write("    local rows checksum\n")
+        f.write('    rows=$(read_file "$tmp" | count_records)\n')
+        f.write('    checksum=$(sha256sum "$tmp" | cut -d\' \' -f1)\n')
+        f.write('    mv "$tmp" "$file"\n')
+        f.write("    printf '%s\\t%s\\t%s\\t%s\\n' \"$table\" \"$(basename \"$file\")\" \"$rows\" \"$checksum\" > \"$entry\"\n\n")
+
+        f.write('    if [ "$rows" != "$expected_rows" ]; then\n')
+        f.write('        echo "  -> $table: $rows rows (analysis found $expected_rows - source changed?)"\n')
+        f.write("    else\n")
+        f.write('        echo "  -> $table: $rows rows"\n')
+        f.write("    fi\n")
+        f.write("}\n\n")
+
+        f.write("# Wait until a job slot is free\n")
+        f.write("throttle() {\n")
+        f.write('    while [ "$(jobs -rp | wc -l)" -ge "$JOBS" ]; do\n')
+        f.write("        wait -n\n")
+        f.write("    done\n")
+        f.write("}\n\n")
+
+        f.write('echo "Starting Access database export ($JOBS parallel jobs)..."\n\n')
+
+        for table in self.report["table_details"]:
+            f.write(f"throttle; export_table {shlex.quote(table['name'])} {shlex.quote(table['pg_name'])} {table['row_count']} &\n")
+
+        f.write("wait\n\n")
+
+        f.write("# Assemble the manifest from the per-table entries\n")
+        f.write("{\n")
+        f.write("    printf 'table\\tfile\\trows\\tsha256\\n'\n")
+        f.write('    cat "$MANIFEST_DIR"/*.tsv 2>/dev/null\n')
+        f.write('} > "$CSV_DIR/manifest.tsv"\n\n')
+
+        f.write('failed=$(find "$MANIFEST_DIR" -name \'*.failed\' | wc -l)\n')
+        f.write('if [ "$failed" -gt 0 ]; then\n')
+        f.write('    echo "Export finished with $failed failed table(s) - re-run to retry them" >&2\n')
+        f.write("    exit 1\n")
+        f.write("fi\n")
+
+    def _write_binary_export_script(self, f):
+        """Body of 01_export_from_access.sh for LOAD_FORMAT = "binary": one export-binary run"""
+        f.write("#!/bin/bash\n")
+        f.write("# Export all tables from Access as PostgreSQL binary COPY files (bin/*.pgcopy)\n")
+        f.write(f"# Generated: {datetime.now()}\n")
+        f.write("#\n")
+        f.write("# analysis.py reads each table once and writes the files 02_import_* load.\n")
+        f.write("# ANALYZER=path overrides the location of analysis.py.\n\n")
+
+        f.write("set -u\n\n")
+
+        f.write(f"DB_PATH={shlex.quote(self.db_path)}\n")
+        f.write(f'ANALYZER="${{ANALYZER:-{os.path.abspath(__file__)}}}"\n')
+        f.write('REPORT_DIR="$(cd "$(dirname "$0")/.." && pwd)"\n\n')
+
+        f.write('python3 "$ANALYZER" --db "$DB_PATH" --output "$REPORT_DIR" export-binary || exit 1\n')
+
+    def generate_blob_import(self, output_dir):
+        """Write 04_import_blobs.sql, filling BYTEA columns from the export-blobs files
+
+        The CSV load leaves binary columns NULL (mdb-export -b strip). Each table's
+        blob manifest is copied into a temporary table and joined on the primary key.
+        """
+        blob_dir = os.path.abspath(f"{output_dir}/blobs")
+        with open(f"{output_dir}/04_import_blobs.sql", "w", encoding="utf-8") as f:
+            f.write("-- Load OLE/LONGBINARY contents into the BYTEA columns\n")
             f.write(f"-- Generated: {datetime.now()}\n")
-            f.write("-- Run this script as PostgreSQL superuser\n\n")
+            f.write("--\n")
+            f.write("-- Run after 02_import_to_postgres.sql and after the export-blobs command has\n")
+            f.write("-- written blobs/ (01_export_from_access.sh runs it). Blob files are read by the\n")
+            f.write("-- server (pg_read_binary_file): the directory must be readable by the PostgreSQL\n")
+            f.write("-- server process, and the role needs superuser or pg_read_server_files.\n")
+            f.write("-- Override the location with: psql -v blob_dir=/path/on/server -f 04_import_blobs.sql\n\n")
+
+            f.write("\\set ON_ERROR_STOP on\n")
+            f.write("\\if :{?blob_dir}\n")
+            f.write("\\else\n")
+            f.write(f"\\set blob_dir '{blob_dir}'\n")
+            f.write("\\endif\n\n")
 
-            f.write("-- Disable triggers during import for performance\n")
-            f.write("SET session_replication_role = 'replica';\n\n")
+            f.write('CREATE TEMP TABLE blob_manifest (key text, "column" text, sha256 text, bytes bigint);\n\n')
 
             for table in self.report["table_details"]:
-                f.write(f"-- Import: {table['name']} -> {table['pg_name']}\n")
-                f.write(f"\\echo 'Importing {table['pg_name']}...'\n")
-                f.write(f"\\COPY \"{table['pg_name']}\" FROM '{csv_dir}/{table['pg_name']}.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8', NULL '');\n\n")
+                binary = self.binary_columns(table)
+                if not binary:
+                    continue
+                pg_name = table["pg_name"]
+                pk = next((c for c in table["columns"] if c["name"] == table.get("primary_key")), None)
+                f.write(f"-- {table['name']} -> {pg_name}\n")
+                if pk is None or pk in binary:
+                    f.write("-- No primary key to match blobs on: load these columns manually\n\n")
+                    continue
+                f.write("TRUNCATE blob_manifest;\n")
+                f.write(f"\\COPY blob_manifest FROM '{blob_dir}/{pg_name}.manifest.csv' WITH (FORMAT csv, HEADER true)\n")
+                for col in binary:
+                    access_name = col["name"].replace("'", "''")
+                    f.write(f'UPDATE "{pg_name}" AS t\n')
+                    f.write(f"SET \"{col['pg_name']}\" = pg_read_binary_file(:'blob_dir' || '/' || left(m.sha256, 2) || '/' || m.sha256)\n")
+                    f.write("FROM blob_manifest AS m\n")
+                    f.write(f"WHERE m.\"column\" = '{access_name}' AND t.\"{pk['pg_name']}\"::text = m.key;\n")
+                f.write("-- Rows whose stored size differs from the manifest (expect 0)\n")
+                f.write(f'SELECT count(*) AS size_mismatches FROM blob_manifest AS m JOIN "{pg_name}" AS t\n')
+                f.write(f"  ON t.\"{pk['pg_name']}\"::text = m.key\n")
+                f.write("WHERE " + " OR ".join(
+                    f"(m.\"column\" = '{col['name'].replace(chr(39), chr(39) * 2)}' AND octet_length(t.\"{col['pg_name']}\") IS DISTINCT FROM m.bytes)"
+                    for col in binary
+                ) + ";\n\n")
+
+    def _import_session_statements(self):
+        """Memory settings used by the load and index build sessions"""
+        return [
+            f"SET maintenance_work_mem = '{IMPORT_MAINTENANCE_WORK_MEM}'",
+            f"SET work_mem = '{IMPORT_WORK_MEM}'",
+            f"SET max_parallel_maintenance_workers = {IMPORT_PARALLEL_INDEX_WORKERS}",
+            "SET synchronous_commit = off",
+        ]
+
+    def _import_session_settings(self, f):
+        """Write the memory settings used by the load and index build sessions"""
+        f.write("-- Session settings for bulk loading and index builds\n")
+        for statement in self._import_session_statements():
+            f.write(statement + ";\n")
+        f.write("\n")
+
+    def _pg_column_name(self, table, access_name):
+        """Map an Access column reference (possibly bracketed) to its PostgreSQL name"""
+        access_name = access_name.strip().strip("[]`\"")
+        for col in table["columns"]:
+            if col["name"] == access_name:
+                return col["pg_name"]
+        return access_name.lower().replace(" ", "_").replace("-", "_")
+
+    def binary_copy_files(self, table, binary_dir):
+        """Binary COPY file(s) for a table - one per IMPORT_RANGE_ROWS rows, like the CSV ranges"""
+        row_count = table["row_count"] if isinstance(table["row_count"], int) else 0
+        if row_count <= IMPORT_RANGE_ROWS:
+            return [f"{binary_dir}/{table['pg_name']}.pgcopy"]
+        part_count = -(-row_count // IMPORT_RANGE_ROWS)
+        return [f"{binary_dir}/{table['pg_name']}.part{i + 1:03d}.pgcopy" for i in range(part_count)]
+
+    def import_copy_commands(self, table, csv_dir, compress, load_format="csv"):
+        """\\COPY commands for one table
+
+        Returns a list of (label, command) pairs: one per binary part file written
+        by export_binary_copy, or a single command for the table's CSV file.
+        02_import_parallel.sh splits large CSV files into range files instead.
+        """
+        pg_name = table["pg_name"]
+        if load_format == "binary":
+            binary_dir = f"{os.path.dirname(csv_dir)}/bin"
+            col_list = ", ".join(f'"{c["pg_name"]}"' for c in table["columns"])
+            files = self.binary_copy_files(table, binary_dir)
+            return [
+                (pg_name if len(files) == 1 else f"{pg_name} [part {i + 1}/{len(files)}]",
+                 f'\\COPY "{pg_name}" ({col_list}) FROM {self._sql_literal(path, True)} WITH (FORMAT binary);')
+                for i, path in enumerate(files)
+            ]
+
+        csv_file = f"{csv_dir}/{pg_name}.csv.gz" if compress else f"{csv_dir}/{pg_name}.csv"
+        if compress:
+            source = f"PROGRAM {self._sql_literal('gzip -dc ' + shlex.quote(csv_file), True)}"
+        else:
+            source = self._sql_literal(csv_file, True)
+        return [(pg_name, f'\\COPY "{pg_name}" FROM {source} WITH ({IMPORT_CSV_OPTIONS}, HEADER true);')]
+
+    def generate_import_scripts(self, output_dir, csv_dir, compress=EXPORT_COMPRESS, load_format=LOAD_FORMAT):
+        """Generate the bulk load scripts
+
+        Tables are created UNLOGGED without indexes, loaded, then given their
+        primary keys and indexes, switched to LOGGED and analyzed.
+        """
+        prepare_script = f"{output_dir}/02_import_prepare.sql"
+        finalize_script = f"{output_dir}/02_import_finalize.sql"
+        import_script = f"{output_dir}/02_import_to_postgres.sql"
+        parallel_script = f"{output_dir}/02_import_parallel.sh"
+        split_script = f"{output_dir}/csv_split.awk"
+
+        tables = self.report["table_details"]
+        tables_by_name = {t["name"]: t for t in tables}
+
+        # One-pass splitter: large CSV files are cut into range files loaded by separate sessions
+        with open(split_script, "w", encoding="utf-8") as f:
+            f.write("# Split a CSV file into range files of `rows` records each, header excluded:\n")
+            f.write("# prefix.part001.csv, prefix.part002.csv, ... The file is read once.\n")
+            f.write("# A line only ends a record when the number of double quotes seen so far\n")
+            f.write("# is even, so multi-line quoted values stay in one piece.\n")
+            f.write("NR == 1 { next }\n")
+            f.write("{\n")
+            f.write("    if (q == 0 && r % rows == 0) {\n")
+            f.write("        if (out) close(out)\n")
+            f.write('        out = sprintf("%s.part%03d.csv", prefix, r / rows + 1)\n')
+            f.write("    }\n")
+            f.write("    print > out\n")
+            f.write('    q += gsub(/"/, "&")\n')
+            f.write("    if (q % 2 == 0) { r++; q = 0 }\n")
+            f.write("}\n")
+
+        # Phase 1: UNLOGGED tables without indexes or constraints (except NOT NULL)
+        with open(prepare_script, "w", encoding="utf-8") as f:
+            f.write("-- Bulk load phase 1: create target tables for loading\n")
+            f.write(f"-- Generated: {datetime.now()}\n")
+            f.write("-- WARNING: drops and recreates every migrated table (and dependent views)\n")
+            f.write("-- Tables are UNLOGGED and carry no indexes until 02_import_finalize.sql\n\n")
+
+            for table in tables:
+                f.write(f"-- Table: {table['name']}\n")
+                f.write(f'DROP TABLE IF EXISTS "{table["pg_name"]}" CASCADE;\n')
+                f.write(f'CREATE UNLOGGED TABLE "{table["pg_name"]}" (\n')
+                f.write(",\n".join(self.pg_column_definitions(table)))
+                f.write("\n);\n\n")
+
+        # Phase 3: constraints, indexes, LOGGED, statistics
+        with open(finalize_script, "w", encoding="utf-8") as f:
+            f.write("-- Bulk load phase 3: build constraints and indexes on the loaded data\n")
+            f.write(f"-- Generated: {datetime.now()}\n\n")
+            self._import_session_settings(f)
 
-            f.write("-- Re-enable triggers\n")
-            f.write("SET session_replication_role = 'origin';\n\n")
+            f.write("-- Primary keys\n")
+            for table in tables:
+                if not table.get("primary_key"):
+                    continue
+                pk_col = self._pg_column_name(table, table["primary_key"])
+                statement = f'ALTER TABLE "{table["pg_name"]}" ADD PRIMARY KEY ("{pk_col}");'
+                if table.get("primary_key_type", "").startswith("inferred_unique"):
+                    f.write(f"-- Inferred from data only - review before enabling:\n-- {statement}\n")
+                else:
+                    f.write(f"\\echo 'Primary key {table['pg_name']}.{pk_col}...'\n")
+                    f.write(statement + "\n")
+            f.write("\n")
+
+            f.write("-- Secondary indexes (from Access)\n")
+            for idx in self.report.get("indexes", []):
+                table = tables_by_name.get(idx["table"])
+                if not table or idx.get("is_primary_key"):
+                    continue
+                cols = [self._pg_column_name(table, c) for c in index_column_names(idx["columns"])]
+                index_name = f"ix_{table['pg_name']}_{'_'.join(cols)}"[:63]
+                unique = "UNIQUE " if idx.get("is_unique") else ""
+                col_list = ", ".join(f'"{c}"' for c in cols)
+                f.write(f'CREATE {unique}INDEX "{index_name}" ON "{table["pg_name"]}" ({col_list});\n')
+            f.write("\n")
+
+            f.write("-- Switch tables to LOGGED now that data and indexes are in place\n")
+            for table in tables:
+                f.write(f"\\echo 'Logging {table['pg_name']}...'\n")
+                f.write(f'ALTER TABLE "{table["pg_name"]}" SET LOGGED;\n')
+            f.write("\n")
+
+            # PostgreSQL refuses to SET LOGGED a table referencing an unlogged one,
+            # so foreign keys come after every table is logged
+            f.write("-- Foreign keys confirmed by the data (HIGH confidence inferences)\n")
+            for fk in self.report.get("inferred_foreign_keys", []):
+                target = tables_by_name.get(fk["to_table"])
+                if (fk.get("confidence") == "HIGH" and fk["postgres_fk_sql"].startswith("ALTER TABLE")
+                        and target and target.get("primary_key") == fk["to_column"]):
+                    f.write(fk["postgres_fk_sql"] + "\n")
+            f.write("\n")
 
             f.write("-- Update sequences for tables with auto-increment IDs\n")
-            for table in self.report["table_details"]:
+            for table in tables:
                 if table.get("primary_key") and table.get("primary_key_type") == "auto_number_id":
                     pk_col = next((c["pg_name"] for c in table["columns"] if c["name"] == table["primary_key"]), None)
                     if pk_col:
                         f.write(f"SELECT setval(pg_get_serial_sequence('\"{table['pg_name']}\"', '{pk_col}'), COALESCE((SELECT MAX({pk_col}) FROM \"{table['pg_name']}\"), 1));\n")
+            f.write("\n")
+
+            f.write("-- Refresh planner statistics\n")
+            for table in tables:
+                f.write(f'ANALYZE "{table["pg_name"]}";\n')
+
+        # Single-session entry point: prepare, load every table, finalize
+        with open(import_script, "w", encoding="utf-8") as f:
+            if load_format == "binary":
+                f.write("-- Import binary COPY files (written by 01_export_from_access.sh) to PostgreSQL\n")
+            else:
+                f.write("-- Import CSV files to PostgreSQL\n")
+            f.write(f"-- Generated: {datetime.now()}\n")
+            f.write("-- Run with: psql -v ON_ERROR_STOP=1 -f 02_import_to_postgres.sql\n")
+            f.write("-- For concurrent loading of large tables use 02_import_parallel.sh instead\n\n")
+
+            self._import_session_settings(f)
 
+            f.write("\\ir 02_import_prepare.sql\n\n")
+
+            for table in tables:
+                f.write(f"-- Import: {table['name']} -> {table['pg_name']}\n")
+                for label, command in self.import_copy_commands(table, csv_dir, compress, load_format):
+                    f.write(f"\\echo 'Importing {label}...'\n")
+                    f.write(command + "\n")
+                f.write("\n")
+
+            f.write("\\ir 02_import_finalize.sql\n")
             f.write("\n\\echo 'Import complete!'\n")
 
-        # 3. Python transformation script (for data cleaning)
-        transform_script = f"{output_dir}/03_transform_data.py"
-        with open(transform_script, "w", encoding="utf-8") as f:
-            f.write("#!/usr/bin/env python3\n")
-            f.write('"""Data transformation script for Access to PostgreSQL migration"""\n')
-            f.write("# This script handles data type conversions and cleaning\n")
-            f.write(f"# Generated: {datetime.now()}\n\n")
+        # Parallel driver: same phases, loads run as concurrent psql sessions
+        with open(parallel_script, "w", encoding="utf-8") as f:
+            f.write("#!/bin/bash\n")
+            f.write("# Parallel bulk load: prepare -> concurrent COPY sessions -> finalize\n")
+            f.write(f"# Generated: {datetime.now()}\n")
+            f.write("# Connection settings come from the usual PGHOST/PGDATABASE/PGUSER variables.\n")
+            f.write("# JOBS=n overrides the number of concurrent COPY sessions.\n\n")
+
+            f.write("set -u\n\n")
+            f.write(f'JOBS="${{JOBS:-{IMPORT_JOBS}}}"\n')
+            f.write('PSQL="${PSQL:-psql}"\n')
+            f.write(f"ETL_DIR={shlex.quote(output_dir)}\n")
+            f.write(f"RANGE_ROWS={IMPORT_RANGE_ROWS}\n")
+            f.write('FAILED_DIR=$(mktemp -d)\n')
+            f.write('RANGE_DIR=$(mktemp -d)\n')
+            f.write('trap \'rm -rf "$FAILED_DIR" "$RANGE_DIR"\' EXIT\n\n')
+
+            f.write("# Same session settings as 02_import_to_postgres.sql\n")
+            f.write("SESSION_SETTINGS=(" + " ".join(
+                f"-c {shlex.quote(statement)}" for statement in self._import_session_statements()) + ")\n\n")
+
+            f.write("run_psql() {\n")
+            f.write('    $PSQL -X -q -v ON_ERROR_STOP=1 "$@"\n')
+            f.write("}\n\n")
+
+            f.write("load() {\n")
+            f.write('    local label="$1" command="$2"\n')
+            f.write('    echo "Importing $label..."\n')
+            f.write('    if ! run_psql "${SESSION_SETTINGS[@]}" -c "$command"; then\n')
+            f.write('        echo "  !! Import failed: $label" >&2\n')
+            f.write('        touch "$FAILED_DIR/$(echo "$label" | tr -c \'[:alnum:]\' _)"\n')
+            f.write("    fi\n")
+            f.write("}\n\n")
+
+            f.write("throttle() {\n")
+            f.write('    while [ "$(jobs -rp | wc -l)" -ge "$JOBS" ]; do\n')
+            f.write("        wait -n\n")
+            f.write("    done\n")
+            f.write("}\n\n")
+
+            f.write("# Cut a large CSV file into RANGE_ROWS-record files in one pass, then load the\n")
+            f.write("# ranges as concurrent sessions (the COPY path is quoted as a SQL literal)\n")
+            f.write("load_ranges() {\n")
+            f.write('    local file="$1" pg_name="$2" part\n')
+            f.write('    echo "Splitting $pg_name into ranges..."\n')
+            reader = '"$file"' if not compress else '<(gzip -dc "$file")'
+            f.write(f'    if ! awk -v rows="$RANGE_ROWS" -v prefix="$RANGE_DIR/$pg_name" -f "$ETL_DIR/csv_split.awk" {reader}; then\n')
+            f.write('        echo "  !! Split failed: $pg_name" >&2\n')
+            f.write('        touch "$FAILED_DIR/$pg_name"\n')
+            f.write("        return\n")
+            f.write("    fi\n")
+            f.write('    for part in "$RANGE_DIR/$pg_name".part*.csv; do\n')
+            f.write('        [ -e "$part" ] || continue\n')
+            f.write("        throttle\n")
+            f.write("        local literal=${part//\\'/\\'\\'}\n")
+            f.write(f'        load "$pg_name [$(basename "$part" .csv)]" '
+                    f'"\\\\COPY \\"$pg_name\\" FROM \'$literal\' WITH ({IMPORT_CSV_OPTIONS}, HEADER false);" &\n')
+            f.write("    done\n")
+            f.write("}\n\n")
+
+            f.write('run_psql -f "$ETL_DIR/02_import_prepare.sql" || exit 1\n\n')
+
+            f.write('echo "Loading tables ($JOBS parallel sessions)..."\n')
+            # Largest tables first so their ranges start before the small tables
+            by_size = sorted(tables, key=lambda t: t["row_count"] if isinstance(t["row_count"], int) else 0, reverse=True)
+            for table in by_size:
+                row_count = table["row_count"] if isinstance(table["row_count"], int) else 0
+                if load_format != "binary" and row_count > IMPORT_RANGE_ROWS:
+                    csv_file = f"{csv_dir}/{table['pg_name']}.{'csv.gz' if compress else 'csv'}"
+                    f.write(f"load_ranges {shlex.quote(csv_file)} {shlex.quote(table['pg_name'])}\n")
+                    continue
+                for label, command in self.import_copy_commands(table, csv_dir, compress, load_format):
+                    f.write(f"throttle; load {shlex.quote(label)} {shlex.quote(command)} &\n")
+            f.write("wait\n\n")
+
+            f.write('if [ -n "$(ls -A "$FAILED_DIR")" ]; then\n')
+            f.write('    echo "Load failed for: $(ls "$FAILED_DIR" | tr \'\\n\' \' \')- not finalizing" >&2\n')
+            f.write("    exit 1\n")
+            f.write("fi\n\n")
+
+            f.write('run_psql -f "$ETL_DIR/02_import_finalize.sql" || exit 1\n')
+            f.write('echo "Import complete!"\n')
+
+        os.chmod(parallel_script, 0o755)
+
+    def build_transformations(self, table):
+        """Per-column transformations for a table, derived from the schema catalog"""
+        transformations = {}
+        for col in table["columns"]:
+            col_type = col["type"].upper()
+            tightened = fingerprint_class(self.pg_column_type(col, table["name"]))
+            if tightened == "integer" and col_type in ["SINGLE", "DOUBLE"]:
+                # Whole-valued floats export as "12.0", which COPY rejects for an integer column
+                transformations[col["name"]] = "integer"
+            elif col_type == "DATETIME":
+                transformations[col["name"]] = "datetime"
+            elif col_type == "BOOLEAN":
+                transformations[col["name"]] = "boolean"
+            elif col_type == "CURRENCY":
+                transformations[col["name"]] = "currency"
+            elif col_type in ["TEXT", "VARCHAR"] or (
+                    # Tightened memos: the inferred length is measured after the strip
+                    col_type in ["MEMO", "MEMO/HYPERLINK"] and (table["name"], col["name"]) in self.tightened_types()):
+                transformations[col["name"]] = "text"
+        return transformations
+
+    def export_binary_copy(self, output_dir, tables=None):
+        """Export tables as PostgreSQL binary COPY files for COPY ... WITH (FORMAT binary)
+
+        Values are parsed once here (dates, numbers, booleans) and written in
+        PostgreSQL's binary representation, so the server does no text parsing
+        at load time. Tables above IMPORT_RANGE_ROWS are split into part files
+        that 02_import_parallel.sh loads concurrently.
+        """
+        print("Exporting binary COPY files...")
+
+        binary_dir = f"{output_dir}/bin"
+        os.makedirs(binary_dir, exist_ok=True)
+        export_args = ("-D", MDB_DATETIME_FORMAT, "-T", MDB_DATETIME_FORMAT)
+        tables = tables or self.report["tables"]["names"]
+        details = {t["name"]: t for t in self.report["table_details"]}
+        exported = []
+
+        for table_name in tables:
+            table = details[table_name]
+            columns = [c["name"] for c in table["columns"]]
+            pg_types = [self.pg_column_type(c, table_name) for c in table["columns"]]
+            transformations = self.build_transformations(table)
+            files = self.binary_copy_files(table, binary_dir)
+
+            rows = 0
+            part = 0
+            out = open(files[0] + ".partial", "wb")
+            out.write(COPY_BINARY_HEADER)
+            try:
+                for df in self.iter_table_chunks(
+                    table_name, STREAM_CHUNK_ROWS, export_args,
+                    dtype=str, keep_default_na=False, na_values=[""]
+                ):
+                    df = apply_transformations(df, transformations)
+                    while len(df):
+                        # Rows left for the current part (the last part takes the remainder)
+                        room = len(df) if part == len(files) - 1 else (part + 1) * IMPORT_RANGE_ROWS - rows
+                        if room == 0:
+                            out.write(COPY_BINARY_TRAILER)
+                            out.close()
+                            os.replace(files[part] + ".partial", files[part])
+                            part += 1
+                            out = open(files[part] + ".partial", "wb")
+                            out.write(COPY_BINARY_HEADER)
+                            continue
+                        out.write(encode_binary_copy(df.iloc[:room], columns, pg_types))
+                        rows += min(room, len(df))
+                        df = df.iloc[room:]
+                out.write(COPY_BINARY_TRAILER)
+                out.close()
+                os.replace(files[part] + ".partial", files[part])
+                # Parts the data did not reach still have to exist for the import script
+                for path in files[part + 1:]:
+                    with open(path, "wb") as empty:
+                        empty.write(COPY_BINARY_HEADER + COPY_BINARY_TRAILER)
+            except Exception as e:
+                out.close()
+                print(f"      Error exporting {table_name}: {e}")
+                continue
 
-            f.write("import pandas as pd\n")
-            f.write("import os\n")
-            f.write("from datetime import datetime\n\n")
+            print(f"   {table_name} -> {len(files)} file(s), {rows:,} rows")
+            exported.append({"table": table_name, "files": files, "rows": rows})
 
-            f.write(f'CSV_DIR = "{csv_dir}"\n')
-            f.write(f'OUTPUT_DIR = "{csv_dir}_transformed"\n\n')
+        print(f"   Exported {len(exported)} tables to {binary_dir}\n")
+        return exported
+
+    def stream_to_postgres(self, dsn, tables=None, load_format="csv"):
+        """Load tables straight from mdb-export into PostgreSQL with COPY FROM STDIN
+
+        No intermediate CSV files: a reader thread converts export chunks and
+        hands them to the COPY writer through a bounded queue, so a slow
+        database throttles mdb-export instead of filling memory.
 
-            f.write("os.makedirs(OUTPUT_DIR, exist_ok=True)\n\n")
+        Target tables must exist - run 06-etl/02_import_prepare.sql first and
+        02_import_finalize.sql afterwards. load_format="binary" sends binary
+        COPY tuples instead of CSV text.
+        """
+        try:
+            import psycopg
+        except ImportError:
+            raise RuntimeError("psycopg not installed. Run: pip install 'psycopg[binary]'")
+
+        print("Streaming tables to PostgreSQL...")
+
+        tables = tables or self.report["tables"]["names"]
+        details = {t["name"]: t for t in self.report["table_details"]}
+        loaded = []
+
+        with psycopg.connect(dsn) as conn:
+            # Payloads are UTF-8 whatever PGCLIENTENCODING says; binary COPY text fields
+            # are read in the client encoding, CSV in the ENCODING option
+            conn.execute("SET client_encoding TO 'UTF8'")
+            for table_name in tables:
+                table = details[table_name]
+                started = time.monotonic()
+                rows = self._stream_table(conn, table, load_format)
+                conn.commit()
+                elapsed = time.monotonic() - started
+                print(f"   {table_name} -> {table['pg_name']}: {rows:,} rows in {elapsed:.1f}s")
+                loaded.append({"table": table_name, "pg_table": table["pg_name"], "rows": rows, "seconds": round(elapsed, 2)})
+
+        print(f"   Streamed {len(loaded)} tables\n")
+        return loaded
+
+    def _stream_table(self, conn, table, load_format="csv"):
+        """Stream one table through a bounded queue into COPY FROM STDIN"""
+        chunks = queue.Queue(maxsize=STREAM_QUEUE_CHUNKS)
+        stop = threading.Event()
+        done = object()
+        export_args = ("-D", MDB_DATETIME_FORMAT, "-T", MDB_DATETIME_FORMAT)
+        transformations = self.build_transformations(table)
+        pg_types = [self.pg_column_type(c, table["name"]) for c in table["columns"]]
+        if load_format == "binary":
+            copy_options, header, trailer = "FORMAT binary", COPY_BINARY_HEADER, COPY_BINARY_TRAILER
+        else:
+            copy_options, header, trailer = IMPORT_CSV_OPTIONS, b"", b""
+
+        def put(item):
+            # Blocks while the queue is full (backpressure), but gives up if the writer stopped
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
 
-            f.write("def transform_table(filename, transformations):\n")
-            f.write("    df = pd.read_csv(os.path.join(CSV_DIR, filename))\n")
-            f.write("    # Apply transformations\n")
-            f.write("    for col, transform in transformations.items():\n")
-            f.write("        if col in df.columns:\n")
-            f.write("            if transform == 'datetime':\n")
-            f.write("                df[col] = pd.to_datetime(df[col], errors='coerce')\n")
-            f.write("            elif transform == 'boolean':\n")
-            f.write("                df[col] = df[col].map({'Yes': True, 'No': False, '1': True, '0': False})\n")
-            f.write("    df.to_csv(os.path.join(OUTPUT_DIR, filename), index=False)\n")
-            f.write("    print(f'Transformed {filename}')\n\n")
+        def produce():
+            try:
+                for df in self.iter_table_chunks(
+                    table["name"], STREAM_CHUNK_ROWS, export_args,
+                    dtype=str, keep_default_na=False, na_values=[""]
+                ):
+                    df = apply_transformations(df, transformations)
+                    if load_format == "binary":
+                        pg_columns = [c["pg_name"] for c in table["columns"]]
+                        payload = encode_binary_copy(df, [c["name"] for c in table["columns"]], pg_types)
+                    else:
+                        pg_columns = [self._pg_column_name(table, c) for c in df.columns]
+                        payload = df.to_csv(index=False, header=False, float_format="%.4f").encode("utf-8")
+                    if not put((pg_columns, len(df), payload)):
+                        return
+                put(done)
+            except Exception as e:
+                put(e)
 
-            f.write("# Table-specific transformations\n")
-            f.write("# Add your transformations here\n\n")
+        def take():
+            item = chunks.get()
+            if isinstance(item, Exception):
+                raise item
+            return item
 
-            f.write("print('Transformation complete!')\n")
+        reader = threading.Thread(target=produce, name=f"export-{table['pg_name']}", daemon=True)
+        reader.start()
 
-        os.chmod(transform_script, 0o755)
+        rows = 0
+        try:
+            # The first chunk carries the column order of the export header
+            item = take()
+            if item is done:
+                return rows
+            col_list = ", ".join(f'"{c}"' for c in item[0])
+            with conn.cursor() as cur:
+                with cur.copy(f'COPY "{table["pg_name"]}" ({col_list}) FROM STDIN WITH ({copy_options})') as copy:
+                    copy.write(header)
+                    while item is not done:
+                        _, count, payload = item
+                        copy.write(payload)
+                        rows += count
+                        item = take()
+                    copy.write(trailer)
+        finally:
+            stop.set()
+            reader.join()
+        return rows
+
+    def load_report(self, output_dir):
+        """Load the full_analysis.json written by a previous analysis run"""
+        self.report = read_report(output_dir)
+        return self.report
+
+    @classmethod
+    def from_report(cls, output_dir):
+        """Analyzer over a saved report only, for commands that never open the database
+
+        Neither mdbtools nor the database file has to be present.
+        """
+        analyzer = cls(None, check_environment=False)
+        analyzer.load_report(output_dir)
+        analyzer.db_path = analyzer.report.get("database_path")
+        return analyzer
+
+    def reconcile_table(self, table_name, dsn=None, csv_dir=None,
+                        fanout=RECONCILE_FANOUT, leaf_rows=RECONCILE_LEAF_ROWS):
+        """Find the rows that differ between an Access table and its PostgreSQL copy
+
+        The Access side is the analyzer's table export; the other side is the
+        database (dsn) or a CSV stand-in, csv_dir/<pg_name>.csv. Rows are matched
+        by the table's primary key.
+        """
+        table = next((t for t in self.report["table_details"] if t["name"] == table_name), None)
+        if table is None:
+            raise ValueError(f"Unknown table: {table_name}")
+        columns = [c for c in table["columns"] if fingerprint_class(self.pg_column_type(c, table_name))]
+        key_index = next((i for i, c in enumerate(columns) if c["name"] == table.get("primary_key")), None)
+        if key_index is None:
+            raise ValueError(f"{table_name} has no primary key to reconcile on")
+        pg_types = [self.pg_column_type(c, table_name) for c in columns]
+        if fingerprint_class(pg_types[key_index]) not in ("integer", "numeric", "datetime", "text"):
+            raise ValueError(f"{table_name}: cannot reconcile on a {pg_types[key_index]} key")
+
+        read_options = dict(dtype=str, keep_default_na=False, na_values=[""])
+        # Always the whole table: a sample would report every unsampled row as missing
+        df = self.export_table_to_df(table_name, ("-D", MDB_DATETIME_FORMAT, "-T", MDB_DATETIME_FORMAT),
+                                     sample=False, **read_options)
+        source = FrameRangeSide(df, [c["name"] for c in columns], pg_types, key_index)
+
+        started = time.monotonic()
+        if csv_dir:
+            target_df = pd.read_csv(f"{csv_dir}/{table['pg_name']}.csv", **read_options)
+            target_df = target_df.rename(columns={c["name"]: c["pg_name"] for c in columns})
+            target = FrameRangeSide(target_df, [c["pg_name"] for c in columns], pg_types, key_index)
+            result = reconcile_ranges(source, target, fanout, leaf_rows)
+        else:
+            try:
+                import psycopg
+            except ImportError:
+                raise RuntimeError("psycopg not installed. Run: pip install 'psycopg[binary]'")
+            with psycopg.connect(dsn) as conn:
+                target = PostgresRangeSide(conn, table["pg_name"], [c["pg_name"] for c in columns], pg_types, key_index)
+                result = reconcile_ranges(source, target, fanout, leaf_rows)
+
+        result.update({
+            "table": table_name,
+            "pg_table": table["pg_name"],
+            "key": table["primary_key"],
+            "source_rows": len(source.keys),
+            "source_null_keys": source.null_keys,
+            "target_null_keys": target.null_keys,
+            "seconds": round(time.monotonic() - started, 2),
+        })
+        for kind in ("missing", "extra", "changed"):
+            result[kind] = [str(k) for k in result[kind]]
+        return result
+
+    def reconcile(self, output_dir, tables, dsn=None, csv_dir=None,
+                  fanout=RECONCILE_FANOUT, leaf_rows=RECONCILE_LEAF_ROWS):
+        """Reconcile tables and save the differing keys to 03-data-quality/reconciliation.json"""
+        print("Reconciling Access and PostgreSQL...")
+
+        results = []
+        for table_name in tables:
+            result = self.reconcile_table(table_name, dsn, csv_dir, fanout, leaf_rows)
+            status = "MATCH" if not (result["missing"] or result["extra"] or result["changed"]) else "DIFFERENT"
+            print(f"   {table_name}: {status} - {len(result['missing'])} missing, {len(result['extra'])} extra, "
+                  f"{len(result['changed'])} changed ({result['ranges_compared']} ranges, "
+                  f"{result['rows_fetched']:,} rows fetched, {result['seconds']}s)")
+            results.append(result)
+
+        quality_dir = f"{output_dir}/{DATA_QUALITY_DIR}"
+        os.makedirs(quality_dir, exist_ok=True)
+        with open(f"{quality_dir}/reconciliation.json", "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"   Saved: {DATA_QUALITY_DIR}/reconciliation.json\n")
+        return results
+
+    def export_blobs(self, output_dir, tables=None):
+        """Write binary column contents to 06-etl/blobs for 04_import_blobs.sql
+
+        Streams each table once (scan_blobs), so memory stays at one chunk
+        however large the attachments are.
+        """
+        print("Exporting binary columns...")
+        blob_dir = f"{output_dir}/{ETL_DIR}/blobs"
+        os.makedirs(blob_dir, exist_ok=True)
+
+        exported = {}
+        for table in self.report["table_details"]:
+            if tables and table["name"] not in tables or not self.binary_columns(table):
+                continue
+            rows, blobs = self.scan_blobs(table, blob_dir)
+            total = sum(stats["total_bytes"] for stats in blobs.values())
+            stored = sum(stats["non_null"] for stats in blobs.values())
+            note = "" if table.get("primary_key") else " (no primary key: blobs written, no manifest)"
+            print(f"   {table['name']}: {stored:,} blobs, {total:,} bytes in {rows:,} rows{note}")
+            exported[table["name"]] = blobs
 
-        print(f"      Generated 3 ETL scripts: export, import, transform")
+        print(f"   Saved: {ETL_DIR}/blobs/\n")
+        return exported
 
     def detect_dead_columns(self):
-        """Find columns that are always null or have only one distinct value"""
+        """Find columns that are always null or have only one distinct value
+
+        A column no saved query reads is a candidate to leave out of the migration
+        altogether; one that queries do read is only flagged for review.
+        """
         print("Detecting dead/unused columns...")
 
         dead_columns = []
 
         for table in self.report["table_details"]:
             table_name = table["name"]
+            # Binary columns are stripped from the export; data_quality holds their blob statistics
+            blobs = {cq["column"]: cq["blob_stats"]
+                     for tq in self.report.get("data_quality", []) if tq["table"] == table_name
+                     for cq in tq["columns"] if cq.get("blob_stats")}
+            readers = [self.query_references(table_name, col["name"]) for col in table["columns"]]
+            dead_columns.extend(self.cached_table_result("dead_columns", table, (blobs, readers),
+                                                         lambda: self._table_dead_columns(table, blobs)))
 
-            try:
-                df = self.export_table_to_df(table_name)
+        self.report["dead_columns"] = dead_columns
+        print(f"   Found {len(dead_columns)} potentially dead/unused columns\n")
+        return dead_columns
 
-                if len(df) == 0:
-                    continue
+    def _table_dead_columns(self, table, blobs):
+        """detect_dead_columns findings for one table; blobs are its binary columns' blob statistics"""
+        table_name = table["name"]
+        dead_columns = []
 
-                for col in table["columns"]:
-                    col_name = col["name"]
-                    if col_name in df.columns:
-                        null_count = df[col_name].isna().sum()
-                        null_pct = (null_count / len(df)) * 100 if len(df) > 0 else 0
-                        distinct_count = df[col_name].nunique()
-
-                        # Always null
-                        if null_pct == 100:
-                            dead_columns.append({
-                                "table": table_name,
-                                "column": col_name,
-                                "issue": "ALWAYS_NULL",
-                                "recommendation": "DISCARD - Column never used",
-                                "null_percent": 100.0,
-                                "distinct_count": 0,
-                                "sample_value": None
-                            })
+        try:
+            df = self.export_table_to_df(table_name)
 
-                        # Only one value (and not a small lookup table)
-                        elif distinct_count == 1 and len(df) > 10:
-                            sample_val = str(df[col_name].dropna().iloc[0]) if len(df[col_name].dropna()) > 0 else None
-                            dead_columns.append({
-                                "table": table_name,
-                                "column": col_name,
-                                "issue": "SINGLE_VALUE",
-                                "recommendation": "REVIEW - May be deprecated or constant",
-                                "null_percent": null_pct,
-                                "distinct_count": 1,
-                                "sample_value": sample_val[:50] if sample_val else None
-                            })
+            if len(df) == 0:
+                return dead_columns
+            sampled = self.is_sampled(table_name)
+            basis = self.sample_note(table_name)
 
-                        # Mostly null (> 95%)
-                        elif null_pct > 95 and len(df) > 10:
-                            dead_columns.append({
-                                "table": table_name,
-                                "column": col_name,
-                                "issue": "MOSTLY_NULL",
-                                "recommendation": "REVIEW - Rarely used",
-                                "null_percent": round(null_pct, 2),
-                                "distinct_count": distinct_count,
-                                "sample_value": None
-                            })
+            for col in table["columns"]:
+                col_name = col["name"]
+                if col_name in blobs:
+                    if blobs[col_name]["non_null"] == 0:
+                        readers = self.query_references(table_name, col_name)
+                        # In sample mode only the first rows' blobs were scanned
+                        scanned = blobs[col_name].get("rows")
+                        partial = scanned is not None and scanned < (table.get("row_count") or 0)
+                        dead_columns.append({
+                            "table": table_name,
+                            "column": col_name,
+                            "issue": "ALWAYS_NULL",
+                            "recommendation": ("REVIEW - Always NULL but read by saved queries" if readers
+                                               else "DISCARD - Column never used"),
+                            "null_percent": 100.0,
+                            "distinct_count": 0,
+                            "sample_value": None,
+                            "saved_query_references": len(readers) if readers is not None else None,
+                            "basis": f"first {scanned:,} / {table['row_count']:,} rows" if partial else "all rows",
+                            "confidence": f"non-NULL rate {self.sample_confidence(0, scanned)}" if partial else "exact"
+                        })
+                elif col_name in df.columns:
+                    readers = self.query_references(table_name, col_name)
+                    null_count = df[col_name].isna().sum()
+                    null_pct = (null_count / len(df)) * 100 if len(df) > 0 else 0
+                    distinct_count = df[col_name].nunique()
+
+                    # Always null
+                    if null_pct == 100:
+                        dead_columns.append({
+                            "table": table_name,
+                            "column": col_name,
+                            "issue": "ALWAYS_NULL",
+                            "recommendation": ("REVIEW - Always NULL but read by saved queries" if readers
+                                               else "DISCARD - Column never used"),
+                            "null_percent": 100.0,
+                            "distinct_count": 0,
+                            "sample_value": None,
+                            "saved_query_references": len(readers) if readers is not None else None,
+                            "basis": basis,
+                            "confidence": f"non-NULL rate {self.sample_confidence(0, len(df))}" if sampled else "exact"
+                        })
 
-            except Exception as e:
-                print(f"      Error analyzing {table_name}: {e}")
+                    # Only one value (and not a small lookup table)
+                    elif distinct_count == 1 and len(df) > 10:
+                        sample_val = str(df[col_name].dropna().iloc[0]) if len(df[col_name].dropna()) > 0 else None
+                        dead_columns.append({
+                            "table": table_name,
+                            "column": col_name,
+                            "issue": "SINGLE_VALUE",
+                            "recommendation": ("DISCARD - Constant; no saved query reads it (check Power BI)" if readers == []
+                                               else "REVIEW - May be deprecated or constant"),
+                            "null_percent": null_pct,
+                            "distinct_count": 1,
+                            "sample_value": sample_val[:50] if sample_val else None,
+                            "saved_query_references": len(readers) if readers is not None else None,
+                            "basis": basis,
+                            "confidence": (f"other values {self.sample_confidence(0, len(df) - int(null_count))}"
+                                           if sampled else "exact")
+                        })
+
+                    # Mostly null (> 95%)
+                    elif null_pct > 95 and len(df) > 10:
+                        dead_columns.append({
+                            "table": table_name,
+                            "column": col_name,
+                            "issue": "MOSTLY_NULL",
+                            "recommendation": ("DISCARD - Rarely filled; no saved query reads it (check Power BI)" if readers == []
+                                               else "REVIEW - Rarely used"),
+                            "null_percent": round(null_pct, 2),
+                            "distinct_count": distinct_count,
+                            "sample_value": None,
+                            "saved_query_references": len(readers) if readers is not None else None,
+                            "basis": basis,
+                            "confidence": f"NULL rate {self.sample_confidence(int(null_count), len(df))}" if sampled else "exact"
+                        })
+
+        except Exception as e:
+            print(f"      Error analyzing {table_name}: {e}")
 
-        self.report["dead_columns"] = dead_columns
-        print(f"   Found {len(dead_columns)} potentially dead/unused columns\n")
         return dead_columns
 
     def generate_output_readme(self, output_dir):
@@ -1244,8 +4638,11 @@ class AccessDatabaseAnalyzerWSL:
 
             f.write("### 📐 01-schema/\n")
             f.write("**Database structure files**\n")
-            f.write("- `postgresql_schema.sql` - PostgreSQL CREATE TABLE statements\n")
-            f.write("- `postgresql_compatibility_views.sql` - Views that preserve Access naming\n\n")
+            f.write("- `postgresql_schema.sql` - PostgreSQL CREATE TABLE statements, plus data-driven type tightening\n")
+            f.write("- `postgresql_compatibility_views.sql` - Views that preserve Access naming (materialized and indexed for heavy Power BI tables)\n")
+            f.write("- `refresh_materialized_views.sql` - REFRESH MATERIALIZED VIEW CONCURRENTLY for the materialized views\n")
+            f.write("- `partitioning.sql` - Range-partitioned replacements and BRIN/B-tree date indexes for large date-keyed tables\n")
+            f.write("- `partitioning_advice.xlsx` - Date range, rows per month and index choice per table\n\n")
 
             f.write("### 📊 02-powerbi/\n")
             f.write("**Power BI migration guidance**\n")
@@ -1253,21 +4650,26 @@ class AccessDatabaseAnalyzerWSL:
             f.write("- `powerbi_impact_analysis.xlsx` - Impact of naming changes on reports\n")
             f.write("- `dax_impact_analysis.xlsx` - DAX formulas that need updates\n")
             f.write("- `naming_mapping_tables.xlsx` - Table name mappings (Access → PostgreSQL)\n")
-            f.write("- `naming_mapping_columns.xlsx` - Column name mappings (Access → PostgreSQL)\n\n")
+            f.write("- `naming_mapping_columns.xlsx` - Column name mappings (Access → PostgreSQL)\n")
+            f.write("- `powerbi_model_scan.xlsx` - Measures, columns and queries that use Access names, written by `python analysis.py scan-powerbi <model exports>`\n")
+            f.write("- `rewritten/`, `powerbi_rewrite_report.xlsx` - M/DAX/model copies with the PostgreSQL names and every replacement made, written by `python analysis.py rewrite-powerbi <dir>`\n\n")
 
             f.write("### ✅ 03-data-quality/\n")
             f.write("**Data quality assessment and validation**\n")
-            f.write("- `data_quality.xlsx` - Null counts, distinct values, sample data\n")
+            f.write("- `data_quality.xlsx` - Null counts, distinct values, sample data, recommended types\n")
             f.write("- `issues.xlsx` - Detected migration issues and warnings\n")
             f.write("- `dead_columns_analysis.xlsx` - Unused or deprecated columns\n")
             f.write("- `referential_integrity_issues.xlsx` - Foreign key violations\n")
-            f.write("- `data_validation_queries.sql` - Post-migration validation queries\n\n")
+            f.write("- `data_validation_queries.sql` - Post-migration validation, one scan per table, checked against Access content fingerprints\n")
+            f.write("- `reconciliation.json` - Differing keys per table, written by `python analysis.py reconcile <table> --dsn ...`\n\n")
 
             f.write("### 🔗 04-relationships/\n")
             f.write("**Database relationships and keys**\n")
             f.write("- `relationships.xlsx` - Detected Access relationships\n")
             f.write("- `inferred_foreign_keys.xlsx` - AI-inferred foreign key relationships\n")
-            f.write("- `indexes.xlsx` - Index definitions for PostgreSQL\n\n")
+            f.write("- `indexes.xlsx` - Index definitions for PostgreSQL\n")
+            f.write("- `index_recommendations.sql` - CREATE INDEX CONCURRENTLY for FK, join and filter columns, by expected benefit\n")
+            f.write("- `index_recommendations.xlsx` - Every index candidate with its selectivity, benefit or skip reason\n\n")
 
             f.write("### 📋 05-migration-planning/\n")
             f.write("**Migration planning and execution tracking**\n")
@@ -1278,11 +4680,17 @@ class AccessDatabaseAnalyzerWSL:
 
             f.write("### 🔄 06-etl/\n")
             f.write("**ETL scripts and data export**\n")
-            f.write("- `01_export_from_access.sh` - Bash script to export Access tables to CSV\n")
-            f.write("- `02_import_to_postgres.sql` - SQL script to import CSV to PostgreSQL\n")
-            f.write("- `03_transform_data.py` - Python script for data transformations\n")
+            f.write("- `01_export_from_access.sh` - Bash script to export Access tables to CSV (parallel, resumable)\n")
+            f.write("- `02_import_to_postgres.sql` - SQL script to import CSV to PostgreSQL (UNLOGGED load, indexes built afterwards)\n")
+            f.write("- `02_import_prepare.sql` / `02_import_finalize.sql` - Load phases used by the import scripts\n")
+            f.write("- `02_import_parallel.sh` - Same import with concurrent COPY sessions and large tables split into ranges\n")
+            f.write("- `03_transform_data.py` - Converts `csv/` to PostgreSQL input values in `csv_transformed/` (run by the export script)\n")
+            f.write("- `04_import_blobs.sql` - Fills BYTEA columns from `blobs/` (only when tables have OLE/binary columns)\n")
             f.write("- `queries.xlsx` - Access saved queries (if any)\n")
-            f.write("- `csv/` - Exported CSV files (created when running export script)\n\n")
+            f.write("- `csv/` - Exported CSV files and `manifest.tsv` row counts/checksums (created when running export script)\n")
+            f.write("- `csv_transformed/` - The files the import scripts load (written by `03_transform_data.py`)\n")
+            f.write("- `bin/` - Binary COPY files when LOAD_FORMAT = \"binary\" (written by the export script via `export-binary`)\n")
+            f.write("- `blobs/` - OLE/binary contents stored by SHA-256, with a per-table manifest (created by `export-blobs`)\n\n")
 
             f.write("### 📈 07-analysis/\n")
             f.write("**Core database analysis tables**\n")
@@ -1290,12 +4698,17 @@ class AccessDatabaseAnalyzerWSL:
             f.write("- `columns_detail.xlsx` - Detailed column information\n\n")
 
             f.write("## Quick Start Guide\n\n")
+            if self.sample_rows:
+                f.write(f"> These reports were produced with `--sample {self.sample_rows}`: data findings are estimates "
+                        "from a random sample per table. Re-run without `--sample` for the migration itself.\n\n")
             f.write("### For Database Administrators\n")
             f.write("1. Review `05-migration-planning/MIGRATION_SUMMARY.md`\n")
             f.write("2. Check `03-data-quality/issues.xlsx` for critical issues\n")
             f.write("3. Execute `01-schema/postgresql_schema.sql` to create tables\n")
-            f.write("4. Run `06-etl/01_export_from_access.sh` to export data\n")
-            f.write("5. Execute `06-etl/02_import_to_postgres.sql` to import data\n\n")
+            f.write("4. Run `06-etl/01_export_from_access.sh` to export and transform data\n")
+            f.write("5. Execute `06-etl/02_import_to_postgres.sql` (or `06-etl/02_import_parallel.sh`) to import data\n")
+            f.write("   - Or skip the CSV files: run `02_import_prepare.sql`, then `python3 analysis.py stream --dsn ...`, "
+                    "then `02_import_finalize.sql` (needs psycopg)\n\n")
 
             f.write("### For Power BI Developers\n")
             f.write("1. Read `02-powerbi/powerbi_connection_guide.md`\n")
@@ -1308,20 +4721,33 @@ class AccessDatabaseAnalyzerWSL:
             f.write("2. Distribute `05-migration-planning/migration_review_checklist.xlsx` to stakeholders\n")
             f.write("3. Follow `05-migration-planning/migration_checklist.md` for execution plan\n\n")
 
+            # Counted from the files this run wrote (README.md itself included)
+            files = output_files(output_dir)
+            names = [name for directory in files.values() for name in directory] + ["README.md"]
+            extensions = collections.Counter(os.path.splitext(name)[1] for name in names)
             f.write("## File Counts\n\n")
-            f.write(f"- **Total Files:** ~26 files\n")
-            f.write(f"- **Excel Files:** ~15 files (.xlsx)\n")
-            f.write(f"- **SQL Scripts:** 4 files (.sql)\n")
-            f.write(f"- **Documentation:** 4 files (.md)\n")
-            f.write(f"- **ETL Scripts:** 3 files (.sh, .sql, .py)\n")
-            f.write(f"- **JSON Data:** 1 file (.json)\n\n")
+            f.write(f"- **Total Files:** {len(names)} files\n")
+            f.write(f"- **Excel Files:** {extensions['.xlsx']} files (.xlsx)\n")
+            f.write(f"- **SQL Scripts:** {extensions['.sql']} files (.sql)\n")
+            f.write(f"- **Documentation:** {extensions['.md']} files (.md)\n")
+            f.write(f"- **ETL Scripts:** {sum(1 for name in files[ETL_DIR] if not name.endswith('.xlsx'))} files "
+                    f"(.sh, .sql, .py, .awk)\n")
+            f.write(f"- **JSON Data:** {extensions['.json']} file(s) (.json)\n\n")
 
             f.write("## Support\n\n")
             f.write("For questions about this analysis, contact your migration team lead.\n")
 
-    def export_reports(self, output_dir):
-        """Export all reports to files"""
+    def export_reports(self, output_dir, groups=None, catalog_only=False):
+        """Export all reports to files
+
+        groups limits the output to those ARTIFACT_GROUPS (see resolve_selection).
+        catalog_only (--schema-only) leaves the data-derived schema files of the last
+        full run in place instead of removing the ones this report does not call for.
+        """
         print("Exporting reports...")
+        partial = groups is not None and set(groups) != set(ARTIFACT_GROUPS)
+        if groups is None:
+            groups = list(ARTIFACT_GROUPS)
 
         # Create main output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -1336,246 +4762,355 @@ class AccessDatabaseAnalyzerWSL:
         analysis_dir = os.path.join(output_dir, ANALYSIS_DIR)
 
         for directory in [schema_dir, powerbi_dir, quality_dir, rel_dir, migration_dir, etl_dir, analysis_dir]:
-            os.makedirs(directory, exist_ok=True)
+            if os.path.basename(directory) in groups:
+                os.makedirs(directory, exist_ok=True)
 
         print(f"   Created thematic subdirectories")
 
         # ========================================
         # 07-ANALYSIS: Core Analysis Files
         # ========================================
-
-        # Table summary Excel
-        table_summary = []
-        for t in self.report["table_details"]:
-            table_summary.append({
-                "access_name": t["name"],
-                "postgresql_name": t["pg_name"],
-                "columns": len(t["columns"]),
-                "rows": t["row_count"],
-                "primary_key": t.get("primary_key") or "NONE",
-                "name_changed": t["name"] != t["pg_name"]
-            })
-        pd.DataFrame(table_summary).to_excel(f"{analysis_dir}/tables_summary.xlsx", index=False)
-        print(f"   Saved: {ANALYSIS_DIR}/tables_summary.xlsx")
-
-        # Columns detail Excel
-        columns_detail = []
-        for t in self.report["table_details"]:
-            for c in t["columns"]:
-                columns_detail.append({
-                    "table": t["name"],
-                    "column": c["name"],
-                    "pg_column": c["pg_name"],
-                    "type": c["type"],
-                    "size": c["size"],
-                    "nullable": c["nullable"],
-                    "name_changed": c["name"] != c["pg_name"]
+        if ANALYSIS_DIR in groups:
+            # Table summary Excel
+            table_summary = []
+            for t in self.report["table_details"]:
+                table_summary.append({
+                    "access_name": t["name"],
+                    "postgresql_name": t["pg_name"],
+                    "columns": len(t["columns"]),
+                    "rows": t["row_count"],
+                    "primary_key": t.get("primary_key") or "NONE",
+                    "primary_key_source": t.get("primary_key_type"),
+                    "primary_key_confidence": t.get("primary_key_confidence"),
+                    "profiled_rows": t.get("sampled_rows", t["row_count"]),
+                    "name_changed": t["name"] != t["pg_name"]
                 })
-        pd.DataFrame(columns_detail).to_excel(f"{analysis_dir}/columns_detail.xlsx", index=False)
-        print(f"   Saved: {ANALYSIS_DIR}/columns_detail.xlsx")
+            pd.DataFrame(table_summary).to_excel(f"{analysis_dir}/tables_summary.xlsx", index=False)
+            print(f"   Saved: {ANALYSIS_DIR}/tables_summary.xlsx")
+
+            # Columns detail Excel
+            columns_detail = []
+            for t in self.report["table_details"]:
+                for c in t["columns"]:
+                    columns_detail.append({
+                        "table": t["name"],
+                        "column": c["name"],
+                        "pg_column": c["pg_name"],
+                        "type": c["type"],
+                        "size": c["size"],
+                        "nullable": c["nullable"],
+                        "name_changed": c["name"] != c["pg_name"]
+                    })
+            pd.DataFrame(columns_detail).to_excel(f"{analysis_dir}/columns_detail.xlsx", index=False)
+            print(f"   Saved: {ANALYSIS_DIR}/columns_detail.xlsx")
 
         # ========================================
         # 05-MIGRATION-PLANNING: Planning & Execution Files
         # ========================================
+        if MIGRATION_DIR in groups:
+            # Full JSON report
+            with open(f"{migration_dir}/full_analysis.json", "w", encoding="utf-8") as f:
+                json.dump(self.report, f, indent=2, default=str, ensure_ascii=False)
+            print(f"   Saved: {MIGRATION_DIR}/full_analysis.json")
 
-        # Full JSON report
-        with open(f"{migration_dir}/full_analysis.json", "w", encoding="utf-8") as f:
-            json.dump(self.report, f, indent=2, default=str, ensure_ascii=False)
-        print(f"   Saved: {MIGRATION_DIR}/full_analysis.json")
+            # Migration Summary
+            self.generate_summary(f"{migration_dir}/MIGRATION_SUMMARY.md")
+            print(f"   Saved: {MIGRATION_DIR}/MIGRATION_SUMMARY.md")
 
-        # Migration Summary
-        self.generate_summary(f"{migration_dir}/MIGRATION_SUMMARY.md")
-        print(f"   Saved: {MIGRATION_DIR}/MIGRATION_SUMMARY.md")
+            # Migration Checklist
+            self.generate_migration_checklist_md(f"{migration_dir}/migration_checklist.md")
+            print(f"   Saved: {MIGRATION_DIR}/migration_checklist.md")
 
-        # Migration Checklist
-        self.generate_migration_checklist_md(f"{migration_dir}/migration_checklist.md")
-        print(f"   Saved: {MIGRATION_DIR}/migration_checklist.md")
-
-        # Migration Review Checklist
-        self.generate_migration_review_checklist(f"{migration_dir}/migration_review_checklist.xlsx")
-        print(f"   Saved: {MIGRATION_DIR}/migration_review_checklist.xlsx")
+            # Migration Review Checklist
+            self.generate_migration_review_checklist(f"{migration_dir}/migration_review_checklist.xlsx")
+            print(f"   Saved: {MIGRATION_DIR}/migration_review_checklist.xlsx")
 
         # ========================================
         # 04-RELATIONSHIPS: Foreign Keys & Relationships
         # ========================================
+        if RELATIONSHIPS_DIR in groups:
+            # Relationships
+            if self.report["relationships"]["details"]:
+                pd.DataFrame(self.report["relationships"]["details"]).to_excel(
+                    f"{rel_dir}/relationships.xlsx", index=False
+                )
+                print(f"   Saved: {RELATIONSHIPS_DIR}/relationships.xlsx")
 
-        # Relationships
-        if self.report["relationships"]["details"]:
-            pd.DataFrame(self.report["relationships"]["details"]).to_excel(
-                f"{rel_dir}/relationships.xlsx", index=False
-            )
-            print(f"   Saved: {RELATIONSHIPS_DIR}/relationships.xlsx")
+            # Inferred Foreign Keys
+            if self.report.get("inferred_foreign_keys"):
+                pd.DataFrame(self.report["inferred_foreign_keys"]).to_excel(
+                    f"{rel_dir}/inferred_foreign_keys.xlsx", index=False
+                )
+                print(f"   Saved: {RELATIONSHIPS_DIR}/inferred_foreign_keys.xlsx")
 
-        # Inferred Foreign Keys
-        if self.report.get("inferred_foreign_keys"):
-            pd.DataFrame(self.report["inferred_foreign_keys"]).to_excel(
-                f"{rel_dir}/inferred_foreign_keys.xlsx", index=False
-            )
-            print(f"   Saved: {RELATIONSHIPS_DIR}/inferred_foreign_keys.xlsx")
+            # Indexes
+            if self.report.get("indexes"):
+                pd.DataFrame(self.report["indexes"]).to_excel(
+                    f"{rel_dir}/indexes.xlsx", index=False
+                )
+                print(f"   Saved: {RELATIONSHIPS_DIR}/indexes.xlsx")
 
-        # Indexes
-        if self.report.get("indexes"):
-            pd.DataFrame(self.report["indexes"]).to_excel(
-                f"{rel_dir}/indexes.xlsx", index=False
-            )
-            print(f"   Saved: {RELATIONSHIPS_DIR}/indexes.xlsx")
+            # Index recommendations
+            if self.report.get("index_advice"):
+                pd.DataFrame(self.report["index_advice"]).to_excel(
+                    f"{rel_dir}/index_recommendations.xlsx", index=False
+                )
+                print(f"   Saved: {RELATIONSHIPS_DIR}/index_recommendations.xlsx")
+                self.generate_index_script(f"{rel_dir}/index_recommendations.sql")
+                print(f"   Saved: {RELATIONSHIPS_DIR}/index_recommendations.sql")
 
         # ========================================
         # 03-DATA-QUALITY: Data Quality & Validation
         # ========================================
+        if DATA_QUALITY_DIR in groups:
+            # Data quality Excel
+            quality_rows = []
+            for tq in self.report["data_quality"]:
+                for cq in tq["columns"]:
+                    quality_rows.append({
+                        "table": tq["table"],
+                        "column": cq["column"],
+                        "null_count": cq.get("null_count"),
+                        "null_percent": cq.get("null_percent"),
+                        "distinct_count": cq.get("distinct_count"),
+                        "sample_values": "; ".join(str(v) for v in cq.get("sample_values", [])),
+                        "basis": tq.get("basis"),
+                        "confidence": cq.get("confidence"),
+                        "recommended_type": (cq.get("type_recommendation") or {}).get("type"),
+                        "type_partial_fit": (cq.get("type_recommendation") or {}).get("partial"),
+                        "cast_failures": (cq.get("type_recommendation") or {}).get("cast_failures"),
+                    })
+            pd.DataFrame(quality_rows).to_excel(f"{quality_dir}/data_quality.xlsx", index=False)
+            print(f"   Saved: {DATA_QUALITY_DIR}/data_quality.xlsx")
 
-        # Data quality Excel
-        quality_rows = []
-        for tq in self.report["data_quality"]:
-            for cq in tq["columns"]:
-                quality_rows.append({
-                    "table": tq["table"],
-                    "column": cq["column"],
-                    "null_count": cq.get("null_count"),
-                    "null_percent": cq.get("null_percent"),
-                    "distinct_count": cq.get("distinct_count"),
-                    "sample_values": "; ".join(str(v) for v in cq.get("sample_values", []))
-                })
-        pd.DataFrame(quality_rows).to_excel(f"{quality_dir}/data_quality.xlsx", index=False)
-        print(f"   Saved: {DATA_QUALITY_DIR}/data_quality.xlsx")
-
-        # Issues Excel
-        if self.report["potential_issues"]["details"]:
-            pd.DataFrame(self.report["potential_issues"]["details"]).to_excel(
-                f"{quality_dir}/issues.xlsx", index=False
-            )
-            print(f"   Saved: {DATA_QUALITY_DIR}/issues.xlsx")
+            # Issues Excel
+            if self.report["potential_issues"]["details"]:
+                pd.DataFrame(self.report["potential_issues"]["details"]).to_excel(
+                    f"{quality_dir}/issues.xlsx", index=False
+                )
+                print(f"   Saved: {DATA_QUALITY_DIR}/issues.xlsx")
 
-        # Dead Columns Analysis
-        if self.report.get("dead_columns"):
-            pd.DataFrame(self.report["dead_columns"]).to_excel(
-                f"{quality_dir}/dead_columns_analysis.xlsx", index=False
-            )
-            print(f"   Saved: {DATA_QUALITY_DIR}/dead_columns_analysis.xlsx")
+            # Dead Columns Analysis
+            if self.report.get("dead_columns"):
+                pd.DataFrame(self.report["dead_columns"]).to_excel(
+                    f"{quality_dir}/dead_columns_analysis.xlsx", index=False
+                )
+                print(f"   Saved: {DATA_QUALITY_DIR}/dead_columns_analysis.xlsx")
 
-        # Referential Integrity Issues
-        if self.report.get("referential_integrity_issues"):
-            pd.DataFrame(self.report["referential_integrity_issues"]).to_excel(
-                f"{quality_dir}/referential_integrity_issues.xlsx", index=False
-            )
-            print(f"   Saved: {DATA_QUALITY_DIR}/referential_integrity_issues.xlsx")
+            # Referential Integrity Issues
+            if self.report.get("referential_integrity_issues"):
+                pd.DataFrame(self.report["referential_integrity_issues"]).to_excel(
+                    f"{quality_dir}/referential_integrity_issues.xlsx", index=False
+                )
+                print(f"   Saved: {DATA_QUALITY_DIR}/referential_integrity_issues.xlsx")
 
-        # Data Validation Queries SQL
-        self.generate_data_validation_queries(f"{quality_dir}/data_validation_queries.sql")
-        print(f"   Saved: {DATA_QUALITY_DIR}/data_validation_queries.sql")
+            # Data Validation Queries SQL
+            self.generate_data_validation_queries(f"{quality_dir}/data_validation_queries.sql")
+            print(f"   Saved: {DATA_QUALITY_DIR}/data_validation_queries.sql")
 
         # ========================================
         # 02-POWERBI: Power BI Migration Files
         # ========================================
+        if POWERBI_DIR in groups:
+            # Power BI Impact Analysis
+            if self.report.get("powerbi_impact"):
+                pd.DataFrame(self.report["powerbi_impact"]).to_excel(
+                    f"{powerbi_dir}/powerbi_impact_analysis.xlsx", index=False
+                )
+                print(f"   Saved: {POWERBI_DIR}/powerbi_impact_analysis.xlsx")
 
-        # Power BI Impact Analysis
-        if self.report.get("powerbi_impact"):
-            pd.DataFrame(self.report["powerbi_impact"]).to_excel(
-                f"{powerbi_dir}/powerbi_impact_analysis.xlsx", index=False
-            )
-            print(f"   Saved: {POWERBI_DIR}/powerbi_impact_analysis.xlsx")
+            # DAX Impact Analysis
+            if self.report.get("dax_impact"):
+                pd.DataFrame(self.report["dax_impact"]).to_excel(
+                    f"{powerbi_dir}/dax_impact_analysis.xlsx", index=False
+                )
+                print(f"   Saved: {POWERBI_DIR}/dax_impact_analysis.xlsx")
 
-        # DAX Impact Analysis
-        if self.report.get("dax_impact"):
-            pd.DataFrame(self.report["dax_impact"]).to_excel(
-                f"{powerbi_dir}/dax_impact_analysis.xlsx", index=False
+            # Naming Mappings
+            table_map, col_map = self.generate_naming_mapping()
+            pd.DataFrame(table_map).to_excel(
+                f"{powerbi_dir}/naming_mapping_tables.xlsx", index=False
             )
-            print(f"   Saved: {POWERBI_DIR}/dax_impact_analysis.xlsx")
-
-        # Naming Mappings
-        table_map, col_map = self.generate_naming_mapping()
-        pd.DataFrame(table_map).to_excel(
-            f"{powerbi_dir}/naming_mapping_tables.xlsx", index=False
-        )
-        print(f"   Saved: {POWERBI_DIR}/naming_mapping_tables.xlsx")
+            print(f"   Saved: {POWERBI_DIR}/naming_mapping_tables.xlsx")
 
-        if col_map:
-            pd.DataFrame(col_map).to_excel(
-                f"{powerbi_dir}/naming_mapping_columns.xlsx", index=False
-            )
-            print(f"   Saved: {POWERBI_DIR}/naming_mapping_columns.xlsx")
+            if col_map:
+                pd.DataFrame(col_map).to_excel(
+                    f"{powerbi_dir}/naming_mapping_columns.xlsx", index=False
+                )
+                print(f"   Saved: {POWERBI_DIR}/naming_mapping_columns.xlsx")
 
-        # Connection Guide
-        self.generate_connection_docs(powerbi_dir)
-        print(f"   Saved: {POWERBI_DIR}/powerbi_connection_guide.md")
+            # Connection Guide
+            self.generate_connection_docs(powerbi_dir)
+            print(f"   Saved: {POWERBI_DIR}/powerbi_connection_guide.md")
 
         # ========================================
         # 01-SCHEMA: Database Schema Files
         # ========================================
-
-        # PostgreSQL schema
-        self.generate_pg_schema(f"{schema_dir}/postgresql_schema.sql")
-        print(f"   Saved: {SCHEMA_DIR}/postgresql_schema.sql")
-
-        # Compatibility Views SQL
-        self.generate_compatibility_views(f"{schema_dir}/postgresql_compatibility_views.sql")
-        print(f"   Saved: {SCHEMA_DIR}/postgresql_compatibility_views.sql")
+        if SCHEMA_DIR in groups:
+            # PostgreSQL schema
+            self.generate_pg_schema(f"{schema_dir}/postgresql_schema.sql")
+            print(f"   Saved: {SCHEMA_DIR}/postgresql_schema.sql")
+
+            # Compatibility Views SQL
+            self.generate_compatibility_views(f"{schema_dir}/postgresql_compatibility_views.sql")
+            print(f"   Saved: {SCHEMA_DIR}/postgresql_compatibility_views.sql")
+            if self.materialized_view_plan():
+                self.generate_matview_refresh(f"{schema_dir}/refresh_materialized_views.sql")
+                print(f"   Saved: {SCHEMA_DIR}/refresh_materialized_views.sql")
+            elif not catalog_only:
+                remove_stale_artifact(f"{schema_dir}/refresh_materialized_views.sql")
+
+            # Partitioning / date index DDL (needs the data quality date profiles); a
+            # catalog-only run leaves the files of the last full run as they are
+            if not catalog_only and self.report.get("partition_advice"):
+                self.generate_partitioning_ddl(f"{schema_dir}/partitioning.sql")
+                pd.DataFrame(self.report["partition_advice"]).to_excel(
+                    f"{schema_dir}/partitioning_advice.xlsx", index=False
+                )
+                print(f"   Saved: {SCHEMA_DIR}/partitioning.sql, partitioning_advice.xlsx")
+            elif not catalog_only:
+                remove_stale_artifact(f"{schema_dir}/partitioning.sql")
+                remove_stale_artifact(f"{schema_dir}/partitioning_advice.xlsx")
 
         # ========================================
         # 06-ETL: ETL Scripts & Data Transfer
         # ========================================
+        if ETL_DIR in groups:
+            # Queries list (Access saved queries)
+            if self.report["queries"]["details"]:
+                pd.DataFrame(self.report["queries"]["details"]).to_excel(
+                    f"{etl_dir}/queries.xlsx", index=False
+                )
+                print(f"   Saved: {ETL_DIR}/queries.xlsx")
 
-        # Queries list (Access saved queries)
-        if self.report["queries"]["details"]:
-            pd.DataFrame(self.report["queries"]["details"]).to_excel(
-                f"{etl_dir}/queries.xlsx", index=False
-            )
-            print(f"   Saved: {ETL_DIR}/queries.xlsx")
-
-        # ETL Scripts
-        self.generate_etl_scripts(etl_dir)
-        print(f"   Saved: {ETL_DIR}/01_export_from_access.sh")
-        print(f"   Saved: {ETL_DIR}/02_import_to_postgres.sql")
-        print(f"   Saved: {ETL_DIR}/03_transform_data.py")
+            # ETL Scripts
+            self.generate_etl_scripts(etl_dir)
+            print(f"   Saved: {ETL_DIR}/01_export_from_access.sh")
+            print(f"   Saved: {ETL_DIR}/02_import_to_postgres.sql")
+            print(f"   Saved: {ETL_DIR}/02_import_prepare.sql, 02_import_finalize.sql, 02_import_parallel.sh")
+            print(f"   Saved: {ETL_DIR}/03_transform_data.py")
+            if os.path.exists(f"{etl_dir}/04_import_blobs.sql"):
+                print(f"   Saved: {ETL_DIR}/04_import_blobs.sql")
 
         # ========================================
         # Generate README for output directory
         # ========================================
-        self.generate_output_readme(output_dir)
-        print(f"   Saved: README.md")
+        if "readme" in groups:
+            self.generate_output_readme(output_dir)
+            print(f"   Saved: README.md")
+
+        if partial:
+            print(f"\nUpdated in '{output_dir}/': {', '.join(groups) or 'nothing'}")
+            return
 
         print(f"\n{'='*60}")
         print("ORGANIZED OUTPUT STRUCTURE")
         print(f"{'='*60}")
         print(f"\nAll reports exported to: '{output_dir}/'")
-        print(f"\n{SCHEMA_DIR}/ - Database Structure (2 files)")
-        print(f"  └─ PostgreSQL schema & compatibility views")
-        print(f"\n{POWERBI_DIR}/ - Power BI Migration (5 files)")
+        files = output_files(output_dir)
+        print(f"\n{SCHEMA_DIR}/ - Database Structure ({len(files[SCHEMA_DIR])} files)")
+        print(f"  └─ PostgreSQL schema, compatibility views, partitioning")
+        print(f"\n{POWERBI_DIR}/ - Power BI Migration ({len(files[POWERBI_DIR])} files)")
         print(f"  └─ Impact analysis, DAX changes, naming mappings, connection guide")
-        print(f"\n{DATA_QUALITY_DIR}/ - Data Quality & Validation (5 files)")
+        print(f"\n{DATA_QUALITY_DIR}/ - Data Quality & Validation ({len(files[DATA_QUALITY_DIR])} files)")
         print(f"  └─ Quality metrics, issues, validation queries, dead columns")
-        print(f"\n{RELATIONSHIPS_DIR}/ - Relationships & Keys (3 files)")
-        print(f"  └─ Foreign keys, relationships, indexes")
-        print(f"\n{MIGRATION_DIR}/ - Migration Planning (4 files)")
+        print(f"\n{RELATIONSHIPS_DIR}/ - Relationships & Keys ({len(files[RELATIONSHIPS_DIR])} files)")
+        print(f"  └─ Foreign keys, relationships, index recommendations")
+        print(f"\n{MIGRATION_DIR}/ - Migration Planning ({len(files[MIGRATION_DIR])} files)")
         print(f"  └─ Summary, checklists, review forms, full analysis JSON")
-        print(f"\n{ETL_DIR}/ - ETL Scripts & Data (4 files + csv/)")
+        print(f"\n{ETL_DIR}/ - ETL Scripts & Data ({len(files[ETL_DIR])} files + csv/)")
         print(f"  └─ Export/import scripts, transformations, queries, CSV data")
-        print(f"\n{ANALYSIS_DIR}/ - Core Analysis Tables (2 files)")
+        print(f"\n{ANALYSIS_DIR}/ - Core Analysis Tables ({len(files[ANALYSIS_DIR])} files)")
         print(f"  └─ Tables & columns summaries")
         print(f"\n{'='*60}")
-        print(f"TOTAL: ~26 files organized in 7 themed directories")
+        print(f"TOTAL: {sum(len(names) for names in files.values()) + 1} files organized in {len(THEMED_DIRS)} themed directories")
         print(f"{'='*60}")
     
+    def tightened_types(self):
+        """{(table, column): type} for the columns the data quality pass found a narrower type for
+
+        Each type fits every profiled value. Columns joined by an inferred foreign
+        key get one type, the widest of theirs (see align_key_types).
+        """
+        quality = self.report.get("data_quality") or []
+        foreign_keys = self.report.get("inferred_foreign_keys") or []
+        if self._tightened is None or self._tightened[0] is not quality or self._tightened[1] is not foreign_keys:
+            types = {}
+            if TYPE_TIGHTENING:
+                for tq in quality:
+                    for cq in tq["columns"]:
+                        recommendation = cq.get("type_recommendation")
+                        if recommendation and recommendation["fits_observed"]:
+                            types[(tq["table"], cq["column"])] = recommendation["fits_observed"]
+                self.align_key_types(types, foreign_keys)
+            self._tightened = (quality, foreign_keys, types)
+        return self._tightened[2]
+
+    def align_key_types(self, types, foreign_keys):
+        """Give every group of columns joined by foreign keys one type, in place
+
+        Tightened independently, a key and its references could end up as
+        VARCHAR(5) and VARCHAR(8), or INTEGER and TEXT. Each group takes the
+        widest type of its columns; a group whose types are of different
+        families keeps the catalog types.
+        """
+        catalog = {(t["name"], c["name"]): c for t in self.report.get("table_details", []) for c in t["columns"]}
+        linked = collections.defaultdict(set)
+        for fk in foreign_keys:
+            a, b = (fk["from_table"], fk["from_column"]), (fk["to_table"], fk["to_column"])
+            if a in catalog and b in catalog and a != b:
+                linked[a].add(b)
+                linked[b].add(a)
+
+        seen = set()
+        for start in linked:
+            if start in seen:
+                continue
+            group, pending = [], [start]
+            while pending:
+                member = pending.pop()
+                if member not in seen:
+                    seen.add(member)
+                    group.append(member)
+                    pending.extend(linked[member])
+            if not any(member in types for member in group):
+                continue
+            widest = None
+            for i, member in enumerate(group):
+                pg_type = types.get(member) or self.pg_column_type(catalog[member])
+                widest = pg_type if i == 0 else (widest and wider_pg_type(widest, pg_type))
+            for member in group:
+                if widest is None or widest == self.pg_column_type(catalog[member]):
+                    types.pop(member, None)
+                else:
+                    types[member] = widest
+        return types
+
+    def pg_column_type(self, col, table_name=None):
+        """PostgreSQL type for a catalog column
+
+        With table_name, a tightened type from the data quality pass takes
+        precedence (see tightened_types).
+        """
+        if table_name is not None:
+            tightened = self.tightened_types().get((table_name, col["name"]))
+            if tightened:
+                return tightened
+        pg_type = PG_TYPE_MAP.get(col["type"].upper(), "TEXT")
+        if pg_type == "VARCHAR" and col["size"]:
+            pg_type = f"VARCHAR({col['size']})"
+        return pg_type
+
+    def pg_column_definitions(self, table):
+        """Column definition lines for a CREATE TABLE statement"""
+        col_lines = []
+        for col in table["columns"]:
+            nullable = "" if col["nullable"] else " NOT NULL"
+            col_lines.append(f'    "{col["pg_name"]}" {self.pg_column_type(col, table["name"])}{nullable}')
+        return col_lines
+
     def generate_pg_schema(self, filepath):
         """Generate PostgreSQL schema - can also use mdb-schema directly"""
-        type_map = {
-            "COUNTER": "SERIAL",
-            "LONG INTEGER": "INTEGER",
-            "INTEGER": "INTEGER",
-            "SMALLINT": "SMALLINT",
-            "SINGLE": "REAL",
-            "DOUBLE": "DOUBLE PRECISION",
-            "CURRENCY": "NUMERIC(19,4)",
-            "DATETIME": "TIMESTAMP",
-            "BOOLEAN": "BOOLEAN",
-            "TEXT": "TEXT",
-            "MEMO": "TEXT",
-            "VARCHAR": "VARCHAR",
-            "LONGBINARY": "BYTEA",
-            "OLE": "BYTEA",
-            "BYTE": "SMALLINT",
-        }
-        
         with open(filepath, "w", encoding="utf-8") as f:
             f.write("-- PostgreSQL Schema Generated from Access Database\n")
             f.write(f"-- Generated: {datetime.now()}\n")
@@ -1591,19 +5126,64 @@ class AccessDatabaseAnalyzerWSL:
                 for table in self.report["table_details"]:
                     f.write(f"\n-- Table: {table['name']}\n")
                     f.write(f'CREATE TABLE "{table["pg_name"]}" (\n')
-                    
-                    col_lines = []
-                    for col in table["columns"]:
-                        pg_type = type_map.get(col["type"].upper(), "TEXT")
-                        if pg_type == "VARCHAR" and col["size"]:
-                            pg_type = f"VARCHAR({col['size']})"
-                        
-                        nullable = "" if col["nullable"] else " NOT NULL"
-                        col_lines.append(f'    "{col["pg_name"]}" {pg_type}{nullable}')
-                    
-                    f.write(",\n".join(col_lines))
+                    f.write(",\n".join(self.pg_column_definitions(table)))
                     f.write("\n);\n")
-    
+                self.write_type_tightening(f, created=True)
+                return
+
+            self.write_type_tightening(f)
+
+    def write_type_tightening(self, f, created=False):
+        """Append ALTER COLUMN ... TYPE statements for the data quality pass's type recommendations
+
+        Types that fit every profiled value (tightened_types) are live statements
+        against the mdb-schema tables, which carry the Access names; with created,
+        the CREATE TABLE statements already use them and only a note is written.
+        Partial fits are commented out with the values that would fail the cast.
+        """
+        details = {t["name"]: t for t in self.report["table_details"]}
+
+        def target(table_name, column_name):
+            if created:
+                table = details[table_name]
+                return (f'ALTER TABLE "{table["pg_name"]}" ALTER COLUMN '
+                        f'"{self._pg_column_name(table, column_name)}"')
+            return f'ALTER TABLE "{table_name}" ALTER COLUMN "{column_name}"'
+
+        fitting, partial = [], []
+        if not created:
+            trim = sql_char_literal(TRIM_WHITESPACE)
+            for (table_name, column_name), pg_type in self.tightened_types().items():
+                fitting.append(f'{target(table_name, column_name)} TYPE {pg_type} '
+                               f'USING NULLIF(btrim("{column_name}"::text, {trim}), \'\')::{pg_type};')
+        for tq in self.report.get("data_quality", []):
+            for cq in tq["columns"]:
+                recommendation = cq.get("type_recommendation")
+                if not recommendation or not recommendation["partial"]:
+                    continue
+                if recommendation["cast_failures"]:
+                    reason = (f"{recommendation['cast_failures']} values fail the cast, e.g. "
+                              + ", ".join(repr(v) for v in recommendation["failing_values"]))
+                else:
+                    reason = tq.get("basis") or "profiled from a sample"
+                partial.append(f"-- {target(tq['table'], cq['column'])} TYPE {recommendation['type']};  "
+                               f"-- PARTIAL FIT: {reason}")
+        if not fitting and not partial and not (created and self.tightened_types()):
+            return
+
+        f.write("\n-- ----------------------------------------------------------\n")
+        f.write("-- Data-driven type tightening\n")
+        f.write("-- Narrowest type holding every value profiled today; rows added later may not\n")
+        f.write("-- fit, so profile again before a re-load. Columns joined by an inferred foreign\n")
+        f.write("-- key share one type.\n")
+        if created:
+            f.write("-- The CREATE TABLE statements above already use these types.\n")
+        elif TYPE_TIGHTENING:
+            f.write("-- 02_import_to_postgres.sql already creates the tables with these types.\n")
+        f.write("-- ----------------------------------------------------------\n")
+        for line in fitting + partial:
+            f.write(line + "\n")
+
     def generate_migration_review_checklist(self, filepath):
         """Generate comprehensive migration review checklist for stakeholders"""
         print("   Generating migration review checklist...")
@@ -1667,17 +5247,16 @@ class AccessDatabaseAnalyzerWSL:
             df_tables.to_excel(writer, sheet_name='Tables_Review', index=False)
 
             # Sheet 2: Columns Review
+            quality_by_column = {
+                (tq["table"], cq["column"]): cq
+                for tq in self.report.get("data_quality", []) for cq in tq["columns"]
+            }
             columns_review = []
             for table in self.report["table_details"]:
                 for col in table["columns"]:
                     # Get quality info if available
-                    quality_info = None
-                    for tq in self.report.get("data_quality", []):
-                        if tq["table"] == table["name"]:
-                            for cq in tq["columns"]:
-                                if cq["column"] == col["name"]:
-                                    quality_info = cq
-                                    break
+                    quality_info = quality_by_column.get((table["name"], col["name"]))
+                    readers = self.query_references(table["name"], col["name"])
 
                     # Detect potential issues
                     has_special_chars = any(c in col["name"] for c in [" ", "(", ")", "/", "%", "-"])
@@ -1699,6 +5278,7 @@ class AccessDatabaseAnalyzerWSL:
                         "Null_Percent": quality_info.get("null_percent", "") if quality_info else "",
                         "Distinct_Count": quality_info.get("distinct_count", "") if quality_info else "",
                         "Sample_Values": "; ".join(str(v)[:30] for v in quality_info.get("sample_values", [])[:3]) if quality_info else "",
+                        "Saved_Query_References": len(readers) if readers is not None else "",
                         "Suggested_Action": suggested_action,
                         "DECISION_Keep_or_Discard": "",  # Empty for user to fill
                         "DECISION_Notes": ""  # Empty for user to fill
@@ -1767,6 +5347,7 @@ class AccessDatabaseAnalyzerWSL:
                 {"Section": "", "Instructions": "  - 'Copy Of' or 'Paste Error' tables (backups/errors)"},
                 {"Section": "", "Instructions": "  - Columns with generic names (F1, F2, F10)"},
                 {"Section": "", "Instructions": "  - Columns that are always empty (high null %)"},
+                {"Section": "", "Instructions": "  - Columns no saved Access query reads (Saved_Query_References = 0)"},
                 {"Section": "", "Instructions": ""},
                 {"Section": "4. Save", "Instructions": "Save this file and share with migration team"},
                 {"Section": "", "Instructions": ""},
@@ -1868,13 +5449,13 @@ class AccessDatabaseAnalyzerWSL:
                 cell.font = header_font
                 cell.alignment = center_alignment
 
-            # Highlight DECISION columns (columns 12 and 13)
-            decision_columns_cols = [12, 13]  # DECISION_Keep_or_Discard, DECISION_Notes
+            # Highlight DECISION columns (columns 14 and 15)
+            decision_columns_cols = [14, 15]  # DECISION_Keep_or_Discard, DECISION_Notes
             for row in range(2, ws_columns.max_row + 1):
                 for col_idx in decision_columns_cols:
                     cell = ws_columns.cell(row=row, column=col_idx)
                     cell.fill = decision_fill
-                    if col_idx == 12:
+                    if col_idx == 14:
                         cell.font = decision_font
                         cell.alignment = center_alignment
 
@@ -1891,9 +5472,10 @@ class AccessDatabaseAnalyzerWSL:
                 'I': 12,  # Null_Percent
                 'J': 12,  # Distinct_Count
                 'K': 35,  # Sample_Values
-                'L': 15,  # Suggested_Action
-                'M': 22,  # DECISION_Keep_or_Discard
-                'N': 40,  # DECISION_Notes
+                'L': 15,  # Saved_Query_References
+                'M': 15,  # Suggested_Action
+                'N': 22,  # DECISION_Keep_or_Discard
+                'O': 40,  # DECISION_Notes
             }
             for col, width in column_widths_cols.items():
                 ws_columns.column_dimensions[col].width = width
@@ -1903,7 +5485,7 @@ class AccessDatabaseAnalyzerWSL:
             dv_col_decision.error = 'Please select KEEP, DISCARD, or REVIEW'
             dv_col_decision.errorTitle = 'Invalid Entry'
             ws_columns.add_data_validation(dv_col_decision)
-            dv_col_decision.add(f'M2:M{ws_columns.max_row}')
+            dv_col_decision.add(f'N2:N{ws_columns.max_row}')
 
             # Freeze top row
             ws_columns.freeze_panes = 'A2'
@@ -1954,6 +5536,10 @@ class AccessDatabaseAnalyzerWSL:
             f.write("# Access to PostgreSQL Migration Summary\n\n")
             f.write(f"**Source Database:** `{self.db_path}`\n\n")
             f.write(f"**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+            if self.sample_rows:
+                f.write(f"> **Sampled analysis:** data findings come from up to {self.sample_rows:,} random rows per table. "
+                        "Row counts are exact; uniqueness, NULL rates, foreign keys and orphans are sample estimates "
+                        "(see the confidence columns). Re-run without `--sample` before migrating.\n\n")
 
             f.write("## Overview\n\n")
             f.write("| Metric | Count |\n")
@@ -1986,16 +5572,864 @@ class AccessDatabaseAnalyzerWSL:
                     f.write(f"- **{issue['type']}**: {issue['issue']}\n")
 
 
-if __name__ == "__main__":
-    analyzer = AccessDatabaseAnalyzerWSL(ACCESS_PATH)
-    
+# === WATCH MODE ===
+
+def _file_state(path):
+    """What a change to the database file looks like from outside: inode, size, mtime"""
+    try:
+        st = os.stat(path)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+
+def watch_database(db_path, output_dir, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE, sample_rows=None):
+    """Re-analyze db_path whenever it changes, refreshing output_dir in place
+
+    The file is polled every interval seconds; after a change, analysis waits
+    until the file has been stable for debounce seconds (Access writes in bursts).
+    One analyzer stays alive with warm caches: every table is exported once per
+    cycle (its digest is the only per-table change signal mdbtools gives), and
+    unchanged tables reuse their parsed export, profile, key and dead column
+    results. Only the artifact groups whose report sections changed are rewritten.
+    """
+    analyzer = AccessDatabaseAnalyzerWSL(db_path, sample_rows=sample_rows)
+    analyzer.enable_warm_cache()
+    print(f"Watching {db_path} (every {interval}s, debounce {debounce}s) - Ctrl+C to stop")
+    print("Each change re-exports every table; unchanged tables reuse their results and unchanged reports are kept\n")
+
+    analyzed_state, cycle = None, 0
+    written = {}   # artifact group -> report_digests() entry it was last written from
     try:
+        while True:
+            state = _file_state(db_path)
+            if state is not None and state != analyzed_state:
+                # Debounce: wait for the writes to settle
+                while True:
+                    time.sleep(debounce)
+                    settled = _file_state(db_path)
+                    if settled == state:
+                        break
+                    state = settled
+                if state is None:
+                    continue
+
+                cycle += 1
+                started = time.monotonic()
+                previous = analyzer.begin_cycle()
+                try:
+                    analyzer.analyze_all()
+                    digests = analyzer.report_digests()
+                    groups = [g for g, needs in ARTIFACT_GROUPS.items() if needs and written.get(g) != digests[g]]
+                    if groups:
+                        # The README lists the files of every group
+                        groups += [g for g, needs in ARTIFACT_GROUPS.items() if not needs]
+                        written = {}
+                        analyzer.export_reports(output_dir, groups if len(groups) < len(ARTIFACT_GROUPS) else None)
+                        written = digests
+                    else:
+                        print("Reports unchanged")
+                    current = analyzer.table_digests()
+                    changed = sorted(t for t in current if previous.get(t) != current[t])
+                    removed = sorted(t for t in previous if t not in current)
+                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Cycle {cycle}: "
+                          f"{len(groups) if groups else 'no'} report group(s) refreshed in "
+                          f"{time.monotonic() - started:.1f}s - "
+                          f"{'all tables' if not previous else f'{len(changed)} changed table(s)'}"
+                          f"{': ' + ', '.join(changed) if previous and changed else ''}"
+                          f"{'; removed: ' + ', '.join(removed) if removed else ''}\n")
+                except Exception as e:
+                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Cycle {cycle} failed: {e} - waiting for the next change\n")
+                analyzed_state = state
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nWatch stopped")
+
+
+# === BATCH MODE ===
+
+def file_fingerprint(path):
+    """sha256 of a file's contents - identical copies are analyzed once"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def analyze_database(db_path, output_dir, sample_rows=None):
+    """Analyze one database into output_dir (runs in a batch worker process)
+
+    Progress output goes to output_dir/analysis.log; returns the table
+    structures the consolidated summary needs.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with open(f"{output_dir}/analysis.log", "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        analyzer = AccessDatabaseAnalyzerWSL(db_path, sample_rows=sample_rows)
+        analyzer.analyze_all()
+        analyzer.export_reports(output_dir)
+    return [
+        {
+            "name": t["name"],
+            "pg_name": t["pg_name"],
+            "row_count": t["row_count"] if isinstance(t["row_count"], int) else 0,
+            "columns": [(c["pg_name"], c["type"]) for c in t["columns"]],
+        }
+        for t in analyzer.report["table_details"]
+    ]
+
+
+def analyze_batch(databases, output_dir, jobs=BATCH_JOBS, sample_rows=None):
+    """Analyze many databases in parallel, one output directory each, plus a consolidated summary
+
+    Byte-identical files are analyzed once; their copies reuse the result.
+    """
+    print("=" * 60)
+    print(f"BATCH ANALYSIS: {len(databases)} databases, {jobs} parallel")
+    print("=" * 60)
+
+    entries, by_fingerprint, used_names = [], {}, set()
+    for db_path in databases:
+        name = os.path.splitext(os.path.basename(db_path))[0]
+        unique_name, n = name, 2
+        while unique_name in used_names:
+            unique_name, n = f"{name}_{n}", n + 1
+        used_names.add(unique_name)
+        entry = {"database": db_path, "name": unique_name, "output": f"{output_dir}/{unique_name}",
+                 "fingerprint": None, "identical_to": None, "tables": [], "error": None}
+        entries.append(entry)
+        if not os.path.exists(db_path):
+            entry["error"] = "Database not found"
+            continue
+        fingerprint = entry["fingerprint"] = file_fingerprint(db_path)
+        if fingerprint in by_fingerprint:
+            entry["identical_to"] = by_fingerprint[fingerprint]["name"]
+        else:
+            by_fingerprint[fingerprint] = entry
+
+    originals = [e for e in entries if not e["identical_to"] and not e["error"]]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(analyze_database, e["database"], e["output"], sample_rows): e for e in originals}
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                entry["tables"] = future.result()
+                rows = sum(t["row_count"] for t in entry["tables"])
+                print(f"   {entry['name']}: {len(entry['tables'])} tables, {rows:,} rows -> {entry['output']}/")
+            except Exception as e:
+                entry["error"] = str(e)
+                print(f"   {entry['name']}: FAILED - {e}")
+
+    for entry in entries:
+        if entry["identical_to"]:
+            original = by_fingerprint[entry["fingerprint"]]
+            entry["tables"], entry["error"] = original["tables"], original["error"]
+            if not original["error"]:
+                shutil.copytree(original["output"], entry["output"], dirs_exist_ok=True)
+            print(f"   {entry['name']}: identical to {original['name']} - reused its analysis")
+
+    write_batch_summary(entries, output_dir)
+    return entries
+
+
+def write_batch_summary(entries, output_dir):
+    """Cross-database summary: totals, tables shared between databases and naming collisions"""
+    os.makedirs(output_dir, exist_ok=True)
+    analyzed = [e for e in entries if not e["error"]]
+
+    # Access table name -> databases that contain it
+    shared = {}
+    for entry in analyzed:
+        for table in entry["tables"]:
+            shared.setdefault(table["name"], []).append((entry, table))
+
+    # PostgreSQL name -> distinct Access names mapping to it
+    pg_names = {}
+    for entry in analyzed:
+        for table in entry["tables"]:
+            pg_names.setdefault(table["pg_name"], set()).add(table["name"])
+    collisions = {pg: sorted(names) for pg, names in pg_names.items() if len(names) > 1}
+
+    rows = []
+    for entry in analyzed:
+        for table in entry["tables"]:
+            rows.append({
+                "database": entry["name"],
+                "access_table": table["name"],
+                "postgresql_table": table["pg_name"],
+                "rows": table["row_count"],
+                "columns": len(table["columns"]),
+                "in_databases": len(shared[table["name"]]),
+                "identical_copy_of": entry["identical_to"],
+            })
+    pd.DataFrame(rows).to_excel(f"{output_dir}/batch_tables.xlsx", index=False)
+
+    with open(f"{output_dir}/BATCH_SUMMARY.md", "w", encoding="utf-8") as f:
+        f.write("# Access Batch Analysis Summary\n\n")
+        f.write(f"**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+
+        unique = [e for e in analyzed if not e["identical_to"]]
+        f.write("## Overview\n\n")
+        f.write("| Metric | Count |\n")
+        f.write("|--------|-------|\n")
+        f.write(f"| Databases | {len(entries)} |\n")
+        f.write(f"| Distinct files | {len({e['fingerprint'] for e in entries if e['fingerprint']})} |\n")
+        f.write(f"| Failed | {sum(1 for e in entries if e['error'])} |\n")
+        f.write(f"| Tables (distinct files) | {sum(len(e['tables']) for e in unique)} |\n")
+        f.write(f"| Total Rows (distinct files) | {sum(t['row_count'] for e in unique for t in e['tables']):,} |\n")
+        f.write(f"| Tables in more than one database | {sum(1 for v in shared.values() if len(v) > 1)} |\n")
+        f.write(f"| PostgreSQL name collisions | {len(collisions)} |\n\n")
+
+        f.write("## Databases\n\n")
+        f.write("| Database | Output | Tables | Rows | Status |\n")
+        f.write("|----------|--------|--------|------|--------|\n")
+        for e in entries:
+            if e["error"]:
+                status = f"FAILED: {e['error']}"
+            elif e["identical_to"]:
+                status = f"identical to {e['identical_to']}"
+            else:
+                status = "analyzed"
+            rows = sum(t["row_count"] for t in e["tables"])
+            f.write(f"| `{e['database']}` | `{e['name']}/` | {len(e['tables'])} | {rows:,} | {status} |\n")
+
+        f.write("\n## Shared Tables\n\n")
+        f.write("Tables present in more than one database. Different schemas need a decision before\n")
+        f.write("the databases can be consolidated into one PostgreSQL schema.\n\n")
+        f.write("| Access Table | Databases | Rows per database | Schema |\n")
+        f.write("|--------------|-----------|-------------------|--------|\n")
+        for name, occurrences in sorted(shared.items()):
+            if len(occurrences) < 2:
+                continue
+            schemas = {tuple(t["columns"]) for _, t in occurrences}
+            counts = ", ".join(f"{e['name']}: {t['row_count']:,}" for e, t in occurrences)
+            schema = "identical" if len(schemas) == 1 else f"DIFFERS ({len(schemas)} variants)"
+            f.write(f"| {name} | {len(occurrences)} | {counts} | {schema} |\n")
+
+        f.write("\n## Naming Collisions\n\n")
+        if collisions:
+            f.write("Different Access tables that map to the same PostgreSQL name:\n\n")
+            f.write("| PostgreSQL Table | Access Tables |\n")
+            f.write("|------------------|---------------|\n")
+            for pg, names in sorted(collisions.items()):
+                f.write(f"| {pg} | {', '.join(names)} |\n")
+        else:
+            f.write("None - every PostgreSQL table name comes from a single Access table name.\n")
+
+    print(f"\n   Saved: BATCH_SUMMARY.md, batch_tables.xlsx in {output_dir}/")
+
+
+# === POWER BI MODEL SCAN ===
+# Exported Power BI models: .bim / DataModelSchema JSON (also inside .pbit), and M / DAX scripts
+
+POWERBI_SCRIPT_EXTENSIONS = (".pq", ".m", ".dax")
+POWERBI_MODEL_EXTENSIONS = (".bim", ".json", ".pbit")
+
+
+class PatternAutomaton:
+    """Aho-Corasick automaton: every occurrence of many patterns in one pass over a text
+
+    Matching is case-insensitive (DAX and Access names are). Build once, then
+    scan any number of texts; the cost is linear in the text length plus the
+    matches, however many patterns there are.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.lengths = [len(p.casefold()) for p in self.patterns]
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern.casefold():
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.out[state].append(pid)
+
+        # Breadth-first failure links; each state also reports the matches of its fallback
+        pending = collections.deque([0])
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in self.goto[state].items():
+                pending.append(nxt)
+                if state:
+                    fallback = self.fail[state]
+                    while fallback and ch not in self.goto[fallback]:
+                        fallback = self.fail[fallback]
+                    self.fail[nxt] = self.goto[fallback].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, text):
+        """(start, end, pattern index) for every match in text
+
+        Characters are case-folded one at a time, since folding can change the
+        length ("ß" -> "ss", "İ" -> "i̇"); start and end are offsets into text itself.
+        """
+        goto, fail, out, lengths = self.goto, self.fail, self.out, self.lengths
+        state = 0
+        origins = []   # folded position -> index of the text character it came from
+        for index, original in enumerate(text):
+            for ch in original.casefold():
+                origins.append(index)
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                for pid in out[state]:
+                    yield origins[len(origins) - lengths[pid]], index + 1, pid
+
+
+def _text_encoding(data):
+    """(codec, byte order mark) of a Power BI file, so a rewritten copy can keep both
+
+    DataModelSchema is UTF-16 inside .pbit files; .bim files and scripts are UTF-8.
+    """
+    if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return ("utf-16-le" if data[:1] == b"\xff" else "utf-16-be"), data[:2]
+    if data[1:2] == b"\x00":
+        return "utf-16-le", b""
+    return "utf-8", data[:3] if data[:3] == b"\xef\xbb\xbf" else b""
+
+
+def _decode_text(data):
+    codec, bom = _text_encoding(data)
+    return data[len(bom):].decode(codec)
+
+
+def _read_model_json(data):
+    return json.loads(_decode_text(data))
+
+
+def _model_expressions(node, location=()):
+    """(location, expression) for every DAX/M expression in a model JSON
+
+    location names the objects on the way down, e.g. ("table 'Sales'", "measure 'Total'").
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "expression" and isinstance(value, (str, list)):
+                yield location, "\n".join(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                kind = key[:-1] if key.endswith("s") else key
+                for item in value:
+                    if isinstance(item, dict) and "name" in item:
+                        yield from _model_expressions(item, location + (f"{kind} '{item['name']}'",))
+                    else:
+                        yield from _model_expressions(item, location)
+            elif isinstance(value, dict):
+                yield from _model_expressions(value, location)
+
+
+def powerbi_sources(paths):
+    """(file, location, text) for every expression or script under paths (files or directories)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names))
+        else:
+            files.append(path)
+
+    for path in files:
+        lower = path.lower()
+        try:
+            if lower.endswith(POWERBI_SCRIPT_EXTENSIONS):
+                with open(path, encoding="utf-8-sig") as f:
+                    yield path, (), f.read()
+            elif lower.endswith(".pbit"):
+                with zipfile.ZipFile(path) as archive:
+                    model = _read_model_json(archive.read("DataModelSchema"))
+                for location, text in _model_expressions(model):
+                    yield path, location, text
+            elif lower.endswith(POWERBI_MODEL_EXTENSIONS) or os.path.basename(path) == "DataModelSchema":
+                with open(path, "rb") as f:
+                    model = _read_model_json(f.read())
+                for location, text in _model_expressions(model):
+                    yield path, location, text
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            print(f"   Warning: Could not read {path} - {e}")
+
+
+def powerbi_matches(text, automaton, patterns, language=None):
+    """Non-overlapping matches in text, leftmost-longest: (start, end, pattern index)
+
+    Where patterns overlap ('T'[Col] and [Col]) only the longest is kept, and a
+    name that continues an identifier is not a match (Sales[Amount] is not in
+    MySales[Amount]). language "m" or "dax" leaves out the other language's
+    patterns (m_* / dax_* kinds); [Col] patterns apply to both.
+    """
+    best = {}
+    for start, end, pid in automaton.scan(text):
+        kind = patterns[pid]["kind"]
+        if language and "_" in kind and not kind.startswith(language + "_"):
+            continue
+        pattern = patterns[pid]["pattern"]
+        if pattern[0].isalnum() and start and (text[start - 1].isalnum() or text[start - 1] in "_'"):
+            continue
+        if start not in best or end > best[start][1]:
+            best[start] = (start, end, pid)
+    matches, covered_until = [], -1
+    for start in sorted(best):
+        if start < covered_until:
+            continue   # inside a longer match
+        matches.append(best[start])
+        covered_until = best[start][1]
+    return matches
+
+
+def scan_powerbi_sources(paths, patterns):
+    """Every place in the Power BI sources under paths where one of patterns occurs
+
+    patterns are dicts with at least a "pattern" key; each hit carries the
+    pattern's fields plus the file, object location, line and a snippet.
+    """
+    automaton = PatternAutomaton(p["pattern"] for p in patterns)
+    hits = []
+    for path, location, text in powerbi_sources(paths):
+        for start, end, pid in powerbi_matches(text, automaton, patterns):
+            line_start = text.rfind("\n", 0, start) + 1
+            line_end = text.find("\n", end)
+            hits.append(dict(
+                patterns[pid],
+                file=path,
+                location=" / ".join(location),
+                line=text.count("\n", 0, start) + 1,
+                snippet=text[line_start:line_end if line_end >= 0 else len(text)].strip()[:200],
+            ))
+    return hits
+
+
+# === POWER BI REWRITE ===
+
+# Model JSON properties that hold a table or a column name (besides the objects' own "name")
+_MODEL_TABLE_KEYS = {"table", "fromTable", "toTable"}
+_MODEL_COLUMN_KEYS = {"column", "fromColumn", "toColumn", "sourceColumn", "sortByColumn"}
+
+_rewriter = None   # per worker process: (automaton, patterns, table renames, column renames)
+
+
+def _call_end(text, start):
+    """Index just past the parenthesised call that starts at text[start] (M strings skipped)"""
+    depth, i, in_string = 0, text.find("(", start), False
+    while 0 <= i < len(text):
+        ch = text[i]
+        if in_string:
+            if ch == '"' and text[i + 1:i + 2] == '"':
+                i += 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(text)
+
+
+def rewrite_powerbi_text(text, automaton, patterns, skip=(), language=None):
+    """text with every pattern replaced by its replace_with, and the list of changes
+
+    Replacement is leftmost-longest over the compiled automaton, so a whole
+    'T'[Col] reference is rewritten rather than its [Col] part; an m_source
+    pattern replaces the complete Access.Database(...) call it starts. language
+    ("m" or "dax") limits the rewrite to that language's patterns.
+    """
+    pieces, changes, pos = [], [], 0
+    line, counted = 1, 0
+    for start, end, pid in powerbi_matches(text, automaton, patterns, language):
+        pattern = patterns[pid]
+        if start < pos or pattern["pattern"].lower() in skip:
+            continue
+        if pattern["kind"] == "m_source":
+            end = _call_end(text, start)
+        line += text.count("\n", counted, start)
+        counted = start
+        pieces += [text[pos:start], pattern["replace_with"]]
+        changes.append({"line": line, "kind": pattern["kind"], "before": text[start:end], "after": pattern["replace_with"]})
+        pos = end
+    pieces.append(text[pos:])
+    return "".join(pieces), changes
+
+
+def _rewrite_model(node, skip, location, changes, kind=None):
+    """Rewrite a model JSON in place: expressions, and table/column names that changed"""
+    automaton, patterns, tables, columns = _rewriter
+    if isinstance(node, list):
+        for item in node:
+            _rewrite_model(item, skip, location, changes, kind)
+        return
+    if not isinstance(node, dict):
+        return
+    if kind in ("table", "column") and "name" in node:
+        here = location + (f"{kind} '{node['name']}'",)
+        renamed = (tables if kind == "table" else columns).get(node["name"])
+        if renamed:
+            changes.append({"location": " / ".join(here), "line": None, "kind": f"model_{kind}",
+                            "before": node["name"], "after": renamed})
+            node["name"] = renamed
+    else:
+        here = location + ((f"{kind} '{node['name']}'",) if kind and "name" in node else ())
+    # M: partition sources ("type": "m") and shared expressions; everything else is DAX
+    language = "m" if node.get("type") == "m" or node.get("kind") == "m" or kind == "expression" else "dax"
+    for key, value in node.items():
+        if key == "expression" and isinstance(value, (str, list)):
+            text = "\n".join(value) if isinstance(value, list) else value
+            rewritten, found = rewrite_powerbi_text(text, automaton, patterns, skip, language)
+            if found:
+                node[key] = rewritten.split("\n") if isinstance(value, list) else rewritten
+                changes.extend(dict(c, location=" / ".join(here)) for c in found)
+        elif isinstance(value, str) and (key in _MODEL_TABLE_KEYS or key in _MODEL_COLUMN_KEYS):
+            renamed = (tables if key in _MODEL_TABLE_KEYS else columns).get(value)
+            if renamed:
+                changes.append({"location": " / ".join(here), "line": None, "kind": f"model_{key}",
+                                "before": value, "after": renamed})
+                node[key] = renamed
+        elif isinstance(value, list):
+            _rewrite_model(value, skip, here, changes, key[:-1] if key.endswith("s") else key)
+        elif isinstance(value, dict):
+            _rewrite_model(value, skip, here, changes)
+
+
+def _init_rewriter(patterns, tables, columns):
+    """Process-pool initializer: compile the patterns once per worker"""
+    global _rewriter
+    _rewriter = (PatternAutomaton(p["pattern"] for p in patterns), patterns, tables, columns)
+
+
+def rewrite_powerbi_file(source, target):
+    """Write a rewritten copy of one M/DAX script or model JSON; returns the changes made"""
+    automaton, patterns, _, _ = _rewriter
+    changes = []
+    with open(source, "rb") as f:
+        data = f.read()
+    codec, bom = _text_encoding(data)
+    if source.lower().endswith(POWERBI_SCRIPT_EXTENSIONS):
+        language = "dax" if source.lower().endswith(".dax") else "m"
+        text, changes = rewrite_powerbi_text(_decode_text(data), automaton, patterns, language=language)
+        for change in changes:
+            change["location"] = ""
+    else:
+        model = _read_model_json(data)
+        # [Name] is a measure reference when the model has a measure of that name
+        measures = set()
+        for table in (model.get("model") or {}).get("tables", []):
+            measures.update(f"[{m['name']}]".lower() for m in table.get("measures", []))
+        _rewrite_model(model, measures, (), changes)
+        text = json.dumps(model, indent=2, ensure_ascii=False)
+
+    # Same encoding as the source: Power BI reads DataModelSchema as UTF-16
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(bom + text.encode(codec))
+    return [dict(c, file=source) for c in changes]
+
+
+# === REPORT DIFF ===
+
+
+def read_report(path):
+    """full_analysis.json from an output directory, or the file itself (optionally .gz)"""
+    if os.path.isdir(path) or not path.endswith((".json", ".gz")):
+        path = os.path.join(path, MIGRATION_DIR, "full_analysis.json")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No analysis found at {path} - run the analysis first")
+    with (gzip.open if path.endswith(".gz") else open)(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _keyed(rows, key):
+    """Index rows by key(row); repeated keys get an occurrence number so none are lost"""
+    index, seen = {}, {}
+    for row in rows or []:
+        k = key(row)
+        seen[k] = seen.get(k, 0) + 1
+        index[k if seen[k] == 1 else (*k, seen[k])] = row
+    return index
+
+
+def report_indexes(report):
+    """Keyed views of a report: tables, columns, column stats, issues and inferred FKs"""
+    return {
+        "tables": _keyed(report.get("table_details"), lambda t: (t["name"],)),
+        "columns": _keyed(
+            [dict(c, table=t["name"]) for t in report.get("table_details") or [] for c in t["columns"]],
+            lambda c: (c["table"], c["name"])),
+        "stats": _keyed(
+            [dict(c, table=q["table"]) for q in report.get("data_quality") or [] for c in q["columns"]],
+            lambda c: (c["table"], c["column"])),
+        "issues": _keyed((report.get("potential_issues") or {}).get("details"),
+                         lambda i: (i["type"], i["table"] or "", i["column"] or "", i["issue"])),
+        "foreign_keys": _keyed(report.get("inferred_foreign_keys"),
+                               lambda fk: (fk["from_table"], fk["from_column"], fk["to_table"], fk["to_column"])),
+    }
+
+
+def diff_reports(old, new, null_rate_points=DIFF_NULL_RATE_POINTS):
+    """Structural differences between two analysis reports
+
+    Each side is indexed once by key, so the comparison is a set operation per
+    kind of object rather than a scan of one report for every entry of the other.
+    """
+    a, b = report_indexes(old), report_indexes(new)
+
+    def added(kind):
+        return [b[kind][k] for k in b[kind].keys() - a[kind].keys()]
+
+    def removed(kind):
+        return [a[kind][k] for k in a[kind].keys() - b[kind].keys()]
+
+    # Columns of added or removed tables are reported with the table, not one by one
+    both_tables = {k[0] for k in a["tables"].keys() & b["tables"].keys()}
+
+    def common(kind):
+        return sorted(a[kind].keys() & b[kind].keys())
+
+    column_changes = []
+    for k in common("columns"):
+        before, after = a["columns"][k], b["columns"][k]
+        for field in ("type", "size", "nullable", "pg_name"):
+            if before.get(field) != after.get(field):
+                column_changes.append({"table": k[0], "column": k[1], "field": field,
+                                       "old": before.get(field), "new": after.get(field)})
+
+    row_counts = []
+    for k in common("tables"):
+        before, after = a["tables"][k]["row_count"], b["tables"][k]["row_count"]
+        if before != after and isinstance(before, int) and isinstance(after, int):
+            row_counts.append({"table": k[0], "old": before, "new": after, "delta": after - before})
+
+    null_rates = []
+    for k in common("stats"):
+        before, after = a["stats"][k].get("null_percent"), b["stats"][k].get("null_percent")
+        if before is not None and after is not None and abs(after - before) >= null_rate_points:
+            null_rates.append({"table": k[0], "column": k[1], "old": round(before, 2), "new": round(after, 2)})
+
+    fk_changes = []
+    for k in common("foreign_keys"):
+        before, after = a["foreign_keys"][k]["confidence"], b["foreign_keys"][k]["confidence"]
+        if before != after:
+            fk_changes.append({"from": f"{k[0]}.{k[1]}", "to": f"{k[2]}.{k[3]}", "old": before, "new": after})
+
+    by_name = lambda rows, *fields: sorted(rows, key=lambda r: tuple(str(r.get(f)) for f in fields))
+    return {
+        "old": {"database": old.get("database_path"), "analysis_date": old.get("analysis_date")},
+        "new": {"database": new.get("database_path"), "analysis_date": new.get("analysis_date")},
+        "tables_added": by_name(added("tables"), "name"),
+        "tables_removed": by_name(removed("tables"), "name"),
+        "columns_added": by_name([c for c in added("columns") if c["table"] in both_tables], "table", "ordinal"),
+        "columns_removed": by_name([c for c in removed("columns") if c["table"] in both_tables], "table", "ordinal"),
+        "columns_changed": column_changes,
+        "row_counts": row_counts,
+        "null_rates": null_rates,
+        "issues_added": by_name(added("issues"), "severity", "table", "column"),
+        "issues_removed": by_name(removed("issues"), "severity", "table", "column"),
+        "foreign_keys_added": by_name(added("foreign_keys"), "from_table", "from_column"),
+        "foreign_keys_removed": by_name(removed("foreign_keys"), "from_table", "from_column"),
+        "foreign_keys_changed": fk_changes,
+    }
+
+
+def format_changelog(diff):
+    """Compact Markdown changelog for a diff_reports result"""
+    lines = [f"# Analysis changes: {diff['old']['analysis_date']} -> {diff['new']['analysis_date']}", ""]
+    if diff["old"]["database"] != diff["new"]["database"]:
+        lines += [f"Databases: `{diff['old']['database']}` -> `{diff['new']['database']}`", ""]
+
+    def section(title, rows, fmt):
+        if rows:
+            lines.extend([f"## {title} ({len(rows)})", ""] + [f"- {fmt(r)}" for r in rows] + [""])
+
+    column = lambda c: f"{c['table']}.{c['name']} {c['type']}" + (f"({c['size']})" if c.get("size") else "")
+    fk = lambda f: f"{f['from_table']}.{f['from_column']} -> {f['to_table']}.{f['to_column']} ({f['confidence']})"
+    issue = lambda i: f"[{i['severity']}] {i['type']}: {i['issue']}"
+
+    section("Tables added", diff["tables_added"], lambda t: f"{t['name']} ({len(t['columns'])} columns)")
+    section("Tables removed", diff["tables_removed"], lambda t: t["name"])
+    section("Columns added", diff["columns_added"], column)
+    section("Columns removed", diff["columns_removed"], column)
+    section("Column definitions changed", diff["columns_changed"],
+            lambda c: f"{c['table']}.{c['column']} {c['field']}: {c['old']} -> {c['new']}")
+    section("Row counts", diff["row_counts"],
+            lambda r: f"{r['table']}: {r['old']:,} -> {r['new']:,} ({r['delta']:+,})")
+    section("Null rates", diff["null_rates"],
+            lambda r: f"{r['table']}.{r['column']}: {r['old']}% -> {r['new']}%")
+    section("New issues", diff["issues_added"], issue)
+    section("Resolved issues", diff["issues_removed"], issue)
+    section("Inferred foreign keys added", diff["foreign_keys_added"], fk)
+    section("Inferred foreign keys removed", diff["foreign_keys_removed"], fk)
+    section("Inferred foreign key confidence changed", diff["foreign_keys_changed"],
+            lambda f: f"{f['from']} -> {f['to']}: {f['old']} -> {f['new']}")
+
+    if not any(v for k, v in diff.items() if k not in ("old", "new")):
+        lines.append("No structural changes.")
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze an Access database for migration to PostgreSQL")
+    parser.add_argument("--db", default=ACCESS_PATH, help="Access database (.mdb/.accdb)")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Report directory")
+    parser.add_argument("--sample", type=int, nargs="?", const=SAMPLE_ROWS, metavar="ROWS",
+                        help=f"Profile a random sample per table (default {SAMPLE_ROWS:,} rows) for a quick triage")
+    parser.add_argument("--only", action="append", default=[], metavar="NAME[,NAME]",
+                        help="Run only these passes and/or write only these artifact groups "
+                             "(e.g. 02-powerbi); the passes they depend on run too")
+    parser.add_argument("--skip", action="append", default=[], metavar="NAME[,NAME]",
+                        help="Leave out these passes or artifact groups, and whatever depends on them")
+    parser.add_argument("--schema-only", action="store_true",
+                        help=f"Regenerate {SCHEMA_DIR} from the catalog without exporting table data; tightened "
+                             "types and materialized views come from an earlier report in --output, if any "
+                             f"(--only {SCHEMA_DIR} runs the data passes instead)")
+    parser.add_argument("--list-passes", action="store_true", help="Show the passes and artifact groups, then exit")
+    commands = parser.add_subparsers(dest="command")
+
+    reconcile = commands.add_parser("reconcile", help="Find rows that differ between Access and PostgreSQL")
+    reconcile.add_argument("tables", nargs="+", help="Access table names")
+    target = reconcile.add_mutually_exclusive_group(required=True)
+    target.add_argument("--dsn", help="PostgreSQL connection string")
+    target.add_argument("--csv-dir", help="Directory of <pg_name>.csv files standing in for PostgreSQL")
+    reconcile.add_argument("--fanout", type=int, default=RECONCILE_FANOUT)
+    reconcile.add_argument("--leaf-rows", type=int, default=RECONCILE_LEAF_ROWS)
+
+    watch = commands.add_parser(
+        "watch",
+        help="Re-analyze whenever the database file changes (every table is re-exported each cycle; "
+             "unchanged tables reuse their profiles, keys and dead columns, and unchanged report groups are kept)"
+    )
+    watch.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="Seconds between file checks")
+    watch.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE, help="Seconds of quiet before re-analyzing")
+
+    batch = commands.add_parser("batch", help="Analyze many databases in parallel with a consolidated summary")
+    batch.add_argument("databases", nargs="+", help="Database files or glob patterns (quote the patterns)")
+    batch.add_argument("--jobs", type=int, default=BATCH_JOBS)
+
+    scan = commands.add_parser("scan-powerbi", help="Find Access table/column references in exported Power BI models")
+    scan.add_argument("paths", nargs="+", help=".bim, DataModelSchema, .pbit, .pq, .m or .dax files, or directories")
+
+    rewrite = commands.add_parser("rewrite-powerbi", help="Rewrite exported M/DAX/model files for the PostgreSQL names")
+    rewrite.add_argument("source_dir", help="Directory of .pq, .m, .dax, .bim or DataModelSchema files")
+    rewrite.add_argument("--jobs", type=int, default=POWERBI_REWRITE_JOBS)
+    rewrite.add_argument("--server", default=POWERBI_PG_SERVER)
+    rewrite.add_argument("--database", default=POWERBI_PG_DATABASE)
+    rewrite.add_argument("--schema", default=POWERBI_PG_SCHEMA)
+
+    stream = commands.add_parser("stream", help="Load tables straight from Access into PostgreSQL, without CSV files "
+                                                 "(run 02_import_prepare.sql before, 02_import_finalize.sql after)")
+    stream.add_argument("tables", nargs="*", help="Access table names (default: every table)")
+    stream.add_argument("--dsn", required=True, help="PostgreSQL connection string")
+    stream.add_argument("--format", choices=["csv", "binary"], default=LOAD_FORMAT, help="COPY format sent to the server")
+
+    binary = commands.add_parser("export-binary", help="Write binary COPY files to 06-etl/bin (LOAD_FORMAT = \"binary\")")
+    binary.add_argument("tables", nargs="*", help="Access table names (default: every table)")
+
+    blobs = commands.add_parser("export-blobs", help="Write OLE/binary column contents for the BYTEA import")
+    blobs.add_argument("tables", nargs="*", help="Access table names (default: every table with binary columns)")
+
+    diff = commands.add_parser("diff", help="Changelog between two analysis runs")
+    diff.add_argument("old", help="Earlier output directory or full_analysis.json")
+    diff.add_argument("new", help="Later output directory or full_analysis.json")
+    diff.add_argument("--null-rate-points", type=float, default=DIFF_NULL_RATE_POINTS,
+                      help="Smallest null-rate change (percentage points) to report")
+    diff.add_argument("--save", metavar="FILE", help="Also write the changelog (.md) or the raw diff (.json)")
+
+    args = parser.parse_args()
+    if args.list_passes:
+        for name, (method, needs) in ANALYSIS_PASSES.items():
+            print(f"pass   {name:<24} {method:<32} needs: {', '.join(needs) or '-'}")
+        for group, needs in ARTIFACT_GROUPS.items():
+            print(f"output {group:<24} needs: {', '.join(needs) or '-'}")
+        return
+    only = [n for value in args.only for n in value.split(",") if n.strip()]
+    skip = [n for value in args.skip for n in value.split(",") if n.strip()]
+    if args.schema_only and (only or skip):
+        parser.error("--schema-only cannot be combined with --only/--skip")
+    if (only or skip or args.schema_only) and args.command:
+        parser.error("--only/--skip/--schema-only apply to the full analysis, not to subcommands")
+    try:
+        passes, groups = resolve_selection(only, skip)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == "watch":
+        watch_database(args.db, args.output, args.interval, args.debounce, args.sample)
+        return
+
+    if args.command == "diff":
+        changes = diff_reports(read_report(args.old), read_report(args.new), args.null_rate_points)
+        changelog = format_changelog(changes)
+        print(changelog)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                if args.save.endswith(".json"):
+                    json.dump(changes, f, indent=2, default=str, ensure_ascii=False)
+                else:
+                    f.write(changelog)
+            print(f"Saved: {args.save}")
+        return
+
+    if args.command == "batch":
+        databases = []
+        for pattern in args.databases:
+            matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+            databases.extend(m for m in matches if m not in databases)
+        analyze_batch(databases, args.output, args.jobs, args.sample)
+        return
+
+    # The Power BI commands work from the saved report; no database or mdbtools needed
+    if args.command == "scan-powerbi":
+        AccessDatabaseAnalyzerWSL.from_report(args.output).scan_powerbi_models(args.paths, args.output)
+        return
+
+    if args.command == "rewrite-powerbi":
+        analyzer = AccessDatabaseAnalyzerWSL.from_report(args.output)
+        analyzer.rewrite_powerbi_models(args.source_dir, args.output, args.jobs, args.server, args.database, args.schema)
+        return
+
+    analyzer = AccessDatabaseAnalyzerWSL(args.db, sample_rows=args.sample)
+
+    if args.command == "stream":
+        analyzer.load_report(args.output)
+        analyzer.stream_to_postgres(args.dsn, args.tables or None, args.format)
+        return
+
+    if args.command == "export-binary":
+        analyzer.load_report(args.output)
+        analyzer.export_binary_copy(f"{args.output}/{ETL_DIR}", args.tables or None)
+        return
+
+    if args.command == "export-blobs":
+        analyzer.load_report(args.output)
+        analyzer.export_blobs(args.output, args.tables)
+        return
+
+    if args.command == "reconcile":
+        analyzer.load_report(args.output)
+        analyzer.reconcile(args.output, args.tables, args.dsn, args.csv_dir, args.fanout, args.leaf_rows)
+        return
+
+    if args.schema_only:
+        analyzer.analyze_schema(args.output)
+        analyzer.export_reports(args.output, [SCHEMA_DIR], catalog_only=True)
+    elif only or skip:
+        analyzer.analyze_all(passes)
+        analyzer.export_reports(args.output, groups)
+    else:
         analyzer.analyze_all()
-        analyzer.export_reports(OUTPUT_DIR)
-    finally:
-        pass
+        analyzer.export_reports(args.output)
     
     print("\n" + "=" * 60)
     print("ANALYSIS COMPLETE")
     print("=" * 60)
-    print(f"\nReview the reports in '{OUTPUT_DIR}/' folder")
\ No newline at end of file
+    print(f"\nReview the reports in '{args.output}/' folder")
+
+
+if __name__ == "__main__":
+    main()
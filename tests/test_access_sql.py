@@ -0,0 +1,69 @@
+"""Access SQL tokenizer and table/column reference extraction"""
+import analysis
+
+CATALOG = {
+    "orders": ("Orders", {"id": "ID", "custid": "CustID", "status": "Status", "amount": "Amount"}),
+    "customers": ("Customers", {"id": "ID", "name": "Name", "region": "Region"}),
+    "order lines": ("Order Lines", {"order id": "Order ID", "qty": "Qty"}),
+}
+
+
+def test_tokenizer_unwraps_brackets_and_keeps_literals_whole():
+    tokens = analysis.tokenize_access_sql(
+        "SELECT [Order ID], qty FROM [Order Lines] WHERE d >= #2024-01-01# AND s = 'it''s' AND n <> 1.5e3"
+    )
+    assert tokens[:3] == [("keyword", "SELECT"), ("name", "Order ID"), ("op", ",")]
+    assert ("name", "Order Lines") in tokens
+    assert ("literal", "#2024-01-01#") in tokens
+    assert ("literal", "'it''s'") in tokens
+    assert ("op", "<>") in tokens and ("literal", "1.5e3") in tokens
+    assert ("op", ">=") in tokens
+
+
+def test_tokenizer_treats_keywords_case_insensitively():
+    assert analysis.tokenize_access_sql("select x from t") == [
+        ("keyword", "SELECT"), ("name", "x"), ("keyword", "FROM"), ("name", "t")
+    ]
+
+
+def test_join_and_filter_predicates_resolve_through_aliases():
+    tables, columns, predicates = analysis.access_sql_references(
+        "SELECT o.ID, Name FROM Orders AS o INNER JOIN Customers c ON o.CustID = c.ID WHERE Amount > 5",
+        CATALOG,
+    )
+    assert tables == {"Orders", "Customers"}
+    assert ("Customers", "Name") in columns
+    assert predicates == {("Orders", "CustID", "join"), ("Customers", "ID", "join"), ("Orders", "Amount", "filter")}
+
+
+def test_subquery_names_resolve_in_their_own_scope():
+    _, _, predicates = analysis.access_sql_references(
+        "SELECT * FROM Orders WHERE CustID IN (SELECT ID FROM Customers WHERE Region = 'EU')", CATALOG
+    )
+    assert predicates == {("Orders", "CustID", "filter"), ("Customers", "Region", "filter")}
+
+
+def test_correlated_subquery_falls_back_to_the_outer_scope():
+    _, _, predicates = analysis.access_sql_references(
+        "SELECT Name FROM Customers c WHERE EXISTS (SELECT 1 FROM Orders o WHERE o.CustID = c.ID AND Region = 'X')",
+        CATALOG,
+    )
+    assert ("Customers", "Region", "filter") in predicates
+    assert ("Orders", "CustID", "filter") in predicates
+    assert not any(table == "Orders" and column == "ID" for table, column, _ in predicates)
+
+
+def test_union_branches_do_not_share_tables():
+    _, columns, predicates = analysis.access_sql_references(
+        "SELECT Name FROM Customers UNION SELECT Status FROM Orders WHERE ID > 3", CATALOG
+    )
+    assert predicates == {("Orders", "ID", "filter")}
+    assert ("Customers", "Status") not in columns
+
+
+def test_star_covers_only_its_own_scope():
+    _, columns, _ = analysis.access_sql_references(
+        "SELECT * FROM Orders WHERE CustID IN (SELECT ID FROM Customers)", CATALOG
+    )
+    assert ("Customers", "Name") not in columns
+    assert ("Orders", "Amount") in columns
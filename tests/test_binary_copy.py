@@ -0,0 +1,83 @@
+"""Binary COPY tuples decode back to the values they were encoded from"""
+import struct
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+import analysis
+
+
+def decode_numeric(data):
+    ndigits, weight, sign, dscale = struct.unpack(">hhHh", data[:8])
+    digits = struct.unpack(f">{ndigits}h", data[8:])
+    value = sum(Decimal(d) * Decimal(10000) ** (weight - i) for i, d in enumerate(digits))
+    return (-value if sign == 0x4000 else value).quantize(Decimal(1).scaleb(-dscale))
+
+
+DECODERS = {
+    "SMALLINT": lambda data: struct.unpack(">h", data)[0],
+    "INTEGER": lambda data: struct.unpack(">i", data)[0],
+    "BIGINT": lambda data: struct.unpack(">q", data)[0],
+    "NUMERIC(19,4)": decode_numeric,
+    "TEXT": lambda data: data.decode("utf-8"),
+    "BOOLEAN": lambda data: data == b"\x01",
+    "DATE": lambda data: date(2000, 1, 1) + timedelta(days=struct.unpack(">i", data)[0]),
+    "TIMESTAMP": lambda data: datetime(2000, 1, 1) + timedelta(microseconds=struct.unpack(">q", data)[0]),
+}
+
+
+def decode(payload, pg_types):
+    """Rows of a binary COPY body as Python values (None for NULL)"""
+    rows, offset = [], 0
+    while offset < len(payload):
+        count, = struct.unpack_from(">h", payload, offset)
+        offset += 2
+        row = []
+        for pg_type in pg_types[:count]:
+            length, = struct.unpack_from(">i", payload, offset)
+            offset += 4
+            if length == -1:
+                row.append(None)
+            else:
+                row.append(DECODERS[pg_type](payload[offset:offset + length]))
+                offset += length
+        rows.append(row)
+    return rows
+
+
+def roundtrip(values, pg_type):
+    df = pd.DataFrame({"c": pd.Series(values, dtype=object)})
+    return [row[0] for row in decode(analysis.encode_binary_copy(df, ["c"], [pg_type]), [pg_type])]
+
+
+def test_integers_are_exact_and_never_truncated():
+    assert roundtrip(["9007199254740993", "-9223372036854775808", None, ""], "BIGINT") == [
+        9007199254740993, -9223372036854775808, None, None]
+    assert roundtrip(["1.7", " 12.0 ", "12", "x"], "INTEGER") == [None, 12, 12, None]
+    assert roundtrip(["-32768", "7"], "SMALLINT") == [-32768, 7]
+
+
+def test_integers_out_of_range_are_rejected():
+    with pytest.raises(ValueError):
+        roundtrip(["2147483648"], "INTEGER")
+    with pytest.raises(ValueError):
+        roundtrip(["99999999999999999999"], "BIGINT")
+
+
+def test_numeric_text_boolean_date_and_timestamp_roundtrip():
+    assert roundtrip(["1234.5678", "-0.5", "0", None], "NUMERIC(19,4)") == [
+        Decimal("1234.5678"), Decimal("-0.5000"), Decimal("0.0000"), None]
+    assert roundtrip(["Zürich", "", None], "TEXT") == ["Zürich", "", None]
+    assert roundtrip(["t", "f", None], "BOOLEAN") == [True, False, None]
+    assert roundtrip(["2024-02-29", "1899-12-30", None, ""], "DATE") == [
+        date(2024, 2, 29), date(1899, 12, 30), None, None]
+    assert roundtrip(["2024-01-02 03:04:05.123457", "9999-12-31 23:59:59", None], "TIMESTAMP") == [
+        datetime(2024, 1, 2, 3, 4, 5, 123457), datetime(9999, 12, 31, 23, 59, 59), None]
+
+
+def test_rows_hold_every_column_in_order():
+    df = pd.DataFrame({"id": ["1", "2"], "name": ["a", None]}, dtype=object)
+    payload = analysis.encode_binary_copy(df, ["id", "name", "missing"], ["INTEGER", "TEXT", "DATE"])
+    assert decode(payload, ["INTEGER", "TEXT", "DATE"]) == [[1, "a", None], [2, None, None]]
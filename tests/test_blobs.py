@@ -0,0 +1,30 @@
+"""Blob streaming is bounded by bytes, and can stop after the first rows"""
+import subprocess
+import sys
+
+import analysis
+
+ROWS = [("1", "00" * 600), ("2", ""), ("3", "ab" * 100), ("4", "cd" * 100), ("5", "ef" * 700)]
+
+
+def analyzer_exporting(rows):
+    """Analyzer whose mdb-export prints ID,Picture for rows"""
+    text = "ID,Picture\n" + "".join(f"{key},{value}\n" for key, value in rows)
+    analyzer = analysis.AccessDatabaseAnalyzerWSL("unused.mdb", check_environment=False)
+    analyzer.spawn_mdb_command = lambda *args: subprocess.Popen(
+        [sys.executable, "-c", f"import sys; sys.stdout.write({text!r})"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return analyzer
+
+
+def test_chunks_are_cut_by_size(monkeypatch):
+    monkeypatch.setattr(analysis, "BLOB_CHUNK_MB", 1000 / (1024 * 1024))
+    chunks = list(analyzer_exporting(ROWS).iter_blob_chunks("Photos", ["Picture", "ID"]))
+    assert [len(chunk) for chunk in chunks] == [1, 3, 1]   # 1201 / 1 + 201 + 201 / 1401 characters
+    assert chunks[1]["Picture"].tolist()[0] is None
+    assert chunks[1]["ID"].tolist() == ["2", "3", "4"]
+
+
+def test_max_rows_stops_the_export():
+    chunks = list(analyzer_exporting(ROWS).iter_blob_chunks("Photos", ["Picture"], max_rows=2))
+    assert sum(len(chunk) for chunk in chunks) == 2
@@ -0,0 +1,36 @@
+"""Compatibility view DDL must replace a view of either kind"""
+import os
+
+import pytest
+
+import analysis
+
+TABLE = {"name": "Order Lines", "pg_name": "order_lines",
+         "columns": [{"name": "ID", "pg_name": "id"}, {"name": "Qty", "pg_name": "qty"}]}
+PLAN = {"Order Lines": {"reason": "test", "unique_column": "ID", "index_columns": []}}
+
+
+def view_sql(materialized):
+    analyzer = analysis.AccessDatabaseAnalyzerWSL("unused.mdb", check_environment=False)
+    return analyzer.compatibility_view_sql(TABLE, PLAN if materialized else {})
+
+
+def test_both_kinds_drop_by_relkind():
+    for materialized in (False, True):
+        sql = view_sql(materialized)
+        assert "DROP MATERIALIZED VIEW \"order_lines_compat_view\" CASCADE" in sql
+        assert "DROP VIEW \"order_lines_compat_view\" CASCADE" in sql
+        assert "IF EXISTS" not in sql
+
+
+@pytest.mark.skipif(not os.environ.get("ANALYSIS_TEST_DSN"), reason="set ANALYSIS_TEST_DSN to run the DDL in PostgreSQL")
+def test_switching_between_plain_and_materialized_views():
+    psycopg = pytest.importorskip("psycopg")
+    with psycopg.connect(os.environ["ANALYSIS_TEST_DSN"]) as conn:
+        # Not a temporary table: materialized views cannot read those; the rollback drops it
+        conn.execute("CREATE TABLE order_lines (id integer, qty integer)")
+        for materialized in (False, True, True, False):
+            conn.execute(view_sql(materialized))
+            kind = conn.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('order_lines_compat_view')").fetchone()[0]
+            assert kind == ("m" if materialized else "v")
+        conn.rollback()
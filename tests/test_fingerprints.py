@@ -0,0 +1,58 @@
+"""The Access-side fingerprints must match what the validation SQL computes in PostgreSQL"""
+import os
+import re
+
+import pandas as pd
+import pytest
+
+import analysis
+
+TEXT_VALUES = ["v", "vendor", "Vv", "lev", " value\x0b", "\tx\n", "\xa0kept\xa0", "", "plain"]
+
+
+def e_string(literal):
+    """Decode a PostgreSQL E'...' literal (the escapes fingerprint_sql_expression emits)"""
+    match = re.fullmatch(r"E'(.*)'", literal)
+    assert match, literal
+    escapes = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+    return re.sub(r"\\([0-7]{1,3}|.)",
+                  lambda m: chr(int(m.group(1), 8)) if m.group(1)[0] in "01234567" else escapes.get(m.group(1), m.group(1)),
+                  match.group(1))
+
+
+def sql_text_expression(value):
+    """Evaluate the text branch of fingerprint_sql_expression for one value"""
+    expression = analysis.fingerprint_sql_expression("c", "TEXT")
+    match = re.fullmatch(r'btrim\("c", (E\'.*\')\)', expression)
+    assert match, expression
+    return value.strip(e_string(match.group(1)))
+
+
+def test_sql_trim_set_matches_the_normalizer():
+    expression = analysis.fingerprint_sql_expression("c", "TEXT")
+    characters = e_string(re.search(r"E'.*'", expression).group(0))
+    assert sorted(characters) == sorted(analysis.TRIM_WHITESPACE)
+    assert "v" not in characters
+
+
+def test_text_fingerprint_matches_sql_for_values_starting_or_ending_with_v():
+    values = pd.Series(TEXT_VALUES, dtype=object)
+    normalized = analysis.normalize_values(values, "TEXT")
+    assert normalized.tolist() == [sql_text_expression(v) for v in TEXT_VALUES]
+    assert normalized.tolist()[:4] == ["v", "vendor", "Vv", "lev"]
+    expected_hash = sum(analysis.value_hash(sql_text_expression(v)) for v in TEXT_VALUES)
+    assert analysis.column_fingerprint(values, "TEXT")["hash_sum"] == str(expected_hash)
+
+
+@pytest.mark.skipif(not os.environ.get("ANALYSIS_TEST_DSN"), reason="set ANALYSIS_TEST_DSN to compare against PostgreSQL")
+def test_text_fingerprint_matches_postgresql():
+    psycopg = pytest.importorskip("psycopg")
+    aggregates = analysis.fingerprint_sql_aggregates("c", "TEXT")
+    with psycopg.connect(os.environ["ANALYSIS_TEST_DSN"]) as conn:
+        conn.execute("CREATE TEMP TABLE t (c text)")
+        with conn.cursor().copy("COPY t (c) FROM STDIN") as copy:
+            for value in TEXT_VALUES:
+                copy.write_row((value,))
+        row = conn.execute(f"SELECT {aggregates['hash_sum']}, {aggregates['min']}, {aggregates['max']} FROM t").fetchone()
+    fingerprint = analysis.column_fingerprint(pd.Series(TEXT_VALUES, dtype=object), "TEXT")
+    assert [str(row[0]), row[1], row[2]] == [fingerprint["hash_sum"], fingerprint["min"], fingerprint["max"]]
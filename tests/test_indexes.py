@@ -0,0 +1,11 @@
+"""Index column list parsing"""
+import analysis
+
+
+def test_index_column_names_keep_quoted_names_whole():
+    assert analysis.index_column_names("[Cust ID] DESC, Code") == ["Cust ID", "Code"]
+    assert analysis.index_column_names('"Order Date" ASC') == ["Order Date"]
+
+
+def test_index_column_names_keep_commas_inside_brackets():
+    assert analysis.index_column_names("[Region, Area], [ID]") == ["Region, Area", "ID"]
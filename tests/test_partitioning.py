@@ -0,0 +1,21 @@
+"""Partition bounds and partition naming"""
+import pandas as pd
+
+import analysis
+
+
+def test_placeholder_dates_stay_outside_the_partition_ranges():
+    values = pd.Series(["1899-12-30"] * 2 + [f"2023-{m:02d}-15" for m in range(1, 13)] * 20 + ["9999-12-31"])
+    profile = analysis.date_profile(values)
+    assert profile["min"].startswith("1899-12-30") and profile["max"].startswith("9999-12-31")
+    assert profile["low"].startswith("2023-01-15") and profile["high"].startswith("2023-12-15")
+    bounds = analysis.partition_bounds(profile["low"], profile["high"], "month")
+    assert bounds[0] == ("2023_01", "2023-01-01", "2023-02-01")
+    assert len(bounds) == 13   # twelve months plus one ahead
+
+
+def test_suffixed_names_fit_the_identifier_limit():
+    name = analysis.pg_suffixed("t" * 70, "_default")
+    assert len(name) == 63 and name.endswith("_default")
+    assert analysis.pg_suffixed("orders", "_p2024_01") == "orders_p2024_01"
+    assert analysis.pg_suffixed("t" * 70, "_p2024_01") != analysis.pg_suffixed("t" * 70, "_p2024_02")
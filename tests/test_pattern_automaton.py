@@ -0,0 +1,33 @@
+"""Aho-Corasick matching of many names in one pass"""
+import analysis
+
+
+def matches(patterns, text):
+    automaton = analysis.PatternAutomaton(patterns)
+    return sorted((text[start:end], patterns[pid]) for start, end, pid in automaton.scan(text))
+
+
+def test_every_overlapping_occurrence_is_reported():
+    assert matches(["he", "she", "his", "hers"], "ushers") == [("he", "he"), ("hers", "hers"), ("she", "she")]
+
+
+def test_matching_is_case_insensitive_and_offsets_point_into_the_original_text():
+    text = "SUM('Sales'[Amount]) + sales"
+    assert matches(["sales", "amount"], text) == [("Amount", "amount"), ("Sales", "sales"), ("sales", "sales")]
+
+
+def test_patterns_that_are_suffixes_of_others_are_found_through_failure_links():
+    assert matches(["abcd", "bc", "c"], "xabcy") == [("bc", "bc"), ("c", "c")]
+
+
+def test_no_patterns_no_matches():
+    assert matches([], "anything") == []
+
+
+def test_offsets_survive_characters_that_fold_to_several():
+    text = "Straße İstanbul [Größe] gross"
+    assert matches(["[größe]", "gross", "istanbul"], text) == [
+        ("[Größe]", "[größe]"), ("gross", "gross")
+    ]
+    automaton = analysis.PatternAutomaton(["strasse"])
+    assert [(text[s:e]) for s, e, _ in automaton.scan(text)] == ["Straße"]
@@ -0,0 +1,50 @@
+"""Rewriting Power BI model exports for the PostgreSQL names"""
+import json
+
+import analysis
+
+TABLES = [{
+    "name": "Order Lines", "pg_name": "order_lines",
+    "columns": [{"name": "Unit Price", "pg_name": "unit_price"}],
+}]
+
+MODEL = {"model": {"tables": [{
+    "name": "Order Lines",
+    "measures": [{"name": "Label", "expression": 'IF(1, "Unit Price", SUM(\'Order Lines\'[Unit Price]))'}],
+    "partitions": [{"name": "p", "source": {
+        "type": "m",
+        "expression": 'let t = Source{[Name="Order Lines"]}[Data], c = Table.SelectColumns(t, {"Unit Price"}) in c',
+    }}],
+}]}}
+
+
+def rewrite(tmp_path, data, name):
+    analyzer = analysis.AccessDatabaseAnalyzerWSL(None, check_environment=False)
+    analyzer.report = {"table_details": TABLES}
+    analysis._init_rewriter(analyzer.powerbi_patterns(), {"Order Lines": "order_lines"}, {"Unit Price": "unit_price"})
+    source, target = tmp_path / name, tmp_path / "out" / name
+    source.write_bytes(data)
+    changes = analysis.rewrite_powerbi_file(str(source), str(target))
+    return target.read_bytes(), changes
+
+
+def test_data_model_schema_keeps_its_utf16_encoding(tmp_path):
+    data = b"\xff\xfe" + json.dumps(MODEL).encode("utf-16-le")
+    written, _ = rewrite(tmp_path, data, "DataModelSchema")
+    assert written[:2] == b"\xff\xfe"
+    assert json.loads(written[2:].decode("utf-16-le"))["model"]["tables"][0]["name"] == "order_lines"
+
+
+def test_m_patterns_only_rewrite_m_expressions(tmp_path):
+    written, changes = rewrite(tmp_path, json.dumps(MODEL).encode("utf-8"), "model.bim")
+    table = json.loads(written)["model"]["tables"][0]
+    measure = table["measures"][0]["expression"]
+    partition = table["partitions"][0]["source"]["expression"]
+    assert '"Unit Price"' in measure and "order_lines[unit_price]" in measure
+    assert '{"unit_price"}' in partition and 'Item="order_lines"' in partition
+    assert not any(c["kind"].startswith("m_") and "measure" in c["location"] for c in changes)
+
+
+def test_dax_scripts_leave_string_literals_alone(tmp_path):
+    written, _ = rewrite(tmp_path, b'\xef\xbb\xbfEVALUATE ROW("Unit Price", 1)', "query.dax")
+    assert written == b'\xef\xbb\xbfEVALUATE ROW("Unit Price", 1)'
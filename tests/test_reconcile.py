@@ -0,0 +1,28 @@
+"""Range reconciliation between two sides of a table"""
+from datetime import date, datetime
+
+import pandas as pd
+
+import analysis
+
+
+def frame_side(rows):
+    df = pd.DataFrame(rows, columns=["Day", "Amount"], dtype=object)
+    return analysis.FrameRangeSide(df, ["Day", "Amount"], ["DATE", "INTEGER"], 0)
+
+
+def test_date_keys_from_postgresql_compare_with_exported_keys():
+    exported = analysis.reconcile_key("2024-03-01 00:00:00", "datetime")
+    fetched = analysis.reconcile_key(date(2024, 3, 1), "datetime")
+    assert fetched == exported == datetime(2024, 3, 1)
+    assert analysis.reconcile_key(date(2024, 2, 29), "datetime") < exported
+
+
+def test_date_keyed_tables_report_only_the_changed_rows():
+    days = [f"2024-01-{d:02d} 00:00:00" for d in range(1, 29)]
+    source = frame_side([(day, str(i)) for i, day in enumerate(days)])
+    target = frame_side([(day, "0" if i == 5 else str(i)) for i, day in enumerate(days) if i != 20])
+    result = analysis.reconcile_ranges(source, target, fanout=4, leaf_rows=3)
+    assert result["changed"] == [datetime(2024, 1, 6)]
+    assert result["missing"] == [datetime(2024, 1, 21)]
+    assert result["extra"] == []
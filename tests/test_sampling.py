@@ -0,0 +1,23 @@
+"""Sample mode serves export_table_to_df from the shared sample"""
+import pandas as pd
+
+import analysis
+
+
+def analyzer_with_sample(sample):
+    analyzer = analysis.AccessDatabaseAnalyzerWSL("unused.mdb", sample_rows=len(sample), check_environment=False)
+    analyzer._samples[("unused", analysis.without_blobs(analysis.SAMPLE_EXPORT_ARGS))] = (sample, len(sample))
+    return analyzer
+
+
+def test_sample_honours_the_callers_read_options():
+    sample = pd.DataFrame({"ID": ["1", "2"], "Name": ["NA", None]}, dtype=object)
+    analyzer = analyzer_with_sample(sample)
+
+    raw = analyzer.export_table_to_df("unused", analysis.SAMPLE_EXPORT_ARGS, **analysis.SAMPLE_READ_OPTIONS)
+    assert raw["ID"].tolist() == ["1", "2"]
+    assert raw["Name"].tolist()[0] == "NA"
+
+    inferred = analyzer.export_table_to_df("unused", analysis.SAMPLE_EXPORT_ARGS)
+    assert inferred["ID"].tolist() == [1, 2]
+    assert inferred["Name"].isna().all()
@@ -0,0 +1,55 @@
+"""--schema-only reads the catalog only: no table export, no pandas"""
+import json
+import os
+import subprocess
+import sys
+
+import analysis
+
+SCRIPT = r'''
+import json, sys
+sys.path.insert(0, sys.argv[1])
+import analysis
+
+SCHEMA = b"CREATE TABLE [Order Lines]\n (\n\t[LineID]\t\t\tLong Integer NOT NULL, \n\t[Item]\t\t\tText (50)\n);\n\n"
+commands = []
+
+
+def mdb_output(self, command, *args):
+    commands.append(command)
+    if command == "mdb-tables":
+        return b"Order Lines\n"
+    if command == "mdb-schema":
+        return b"" if "--relationships" in args else SCHEMA
+    raise AssertionError(f"{command} run in schema-only mode")
+
+
+init = analysis.AccessDatabaseAnalyzerWSL.__init__
+analysis.AccessDatabaseAnalyzerWSL.__init__ = lambda self, db_path, sample_rows=None, check_environment=True: \
+    init(self, db_path, sample_rows, check_environment=False)
+analysis.AccessDatabaseAnalyzerWSL.mdb_output = mdb_output
+sys.argv = ["analysis.py", "--db", "orders.mdb", "--output", sys.argv[2], "--schema-only"]
+analysis.main()
+print(json.dumps({"commands": sorted(set(commands)),
+                  "imported": sorted(m for m in ("pandas", "numpy", "openpyxl") if m in sys.modules)}))
+'''
+
+
+def test_schema_only_schedules_catalog_passes_only():
+    passes = analysis.pass_closure(analysis.SCHEMA_ONLY_PASSES)
+    assert passes == {"tables", "relationships", "table_details"}
+
+
+def test_schema_only_run_exports_no_data_and_imports_no_pandas(tmp_path):
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", SCRIPT, repo, str(tmp_path / "out")],
+                            capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+    summary = json.loads(result.stdout.strip().splitlines()[-1])
+    assert summary["commands"] == ["mdb-schema", "mdb-tables"]
+    assert summary["imported"] == []
+    schema_dir = tmp_path / "out" / analysis.SCHEMA_DIR
+    assert sorted(os.listdir(schema_dir)) == ["postgresql_compatibility_views.sql", "postgresql_schema.sql"]
+    assert "CREATE TABLE [Order Lines]" in (schema_dir / "postgresql_schema.sql").read_text(encoding="utf-8")
+    views = (schema_dir / "postgresql_compatibility_views.sql").read_text(encoding="utf-8")
+    assert '"lineid" AS "LineID"' in views
@@ -0,0 +1,28 @@
+"""Out-of-core set operations over spilled bucket files"""
+import pandas as pd
+
+import analysis
+
+
+def spill(tmp_path, values, chunks=3):
+    spilled = analysis.SpilledColumns(["key"], 4, str(tmp_path))
+    frame = pd.DataFrame({"key": values}, dtype=object)
+    for part in range(chunks):
+        spilled.add(frame.iloc[part::chunks])
+    return spilled
+
+
+def test_spilled_subset_compares_export_text(tmp_path):
+    with spill(tmp_path, ["1", "2", "3", None]) as parent, spill(tmp_path, ["1", "1.0", "3", "3", "4"]) as child:
+        result = analysis.spilled_subset(child, "key", parent, "key")
+        assert parent.non_null["key"] == 3
+        assert (result["child_distinct"], result["missing_distinct"], result["missing_rows"]) == (4, 2, 2)
+        assert sorted(result["missing_values"]) == ["1.0", "4"]
+        assert child.distinct_count("key") == 4
+
+
+def test_bucket_files_stay_open_until_read(tmp_path):
+    with spill(tmp_path, [str(i) for i in range(100)]) as spilled:
+        assert spilled._writers
+        assert sum(len(spilled.bucket("key", b)) for b in range(spilled.buckets)) == 100
+        assert not spilled._writers
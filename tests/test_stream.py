@@ -0,0 +1,46 @@
+"""stream_to_postgres loads an mdb-export stream with COPY FROM STDIN"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import analysis
+
+EXPORT = "ID,City,Opened\n1,Zürich,2024-01-02 00:00:00\n2,,\n3,  Genève ,2023-12-31 00:00:00\n"
+TABLE = {
+    "name": "Branch Offices", "pg_name": "test_stream_branch_offices", "row_count": 3, "primary_key": "ID",
+    "columns": [
+        {"name": "ID", "pg_name": "id", "type": "LONG", "size": None, "nullable": False},
+        {"name": "City", "pg_name": "city", "type": "TEXT", "size": 50, "nullable": True},
+        {"name": "Opened", "pg_name": "opened", "type": "DATETIME", "size": None, "nullable": True},
+    ],
+}
+
+
+def analyzer_exporting(text):
+    """Analyzer whose mdb-export prints text (UTF-8) for every table"""
+    analyzer = analysis.AccessDatabaseAnalyzerWSL("unused.mdb", check_environment=False)
+    analyzer.report = {"tables": {"count": 1, "names": [TABLE["name"]]}, "table_details": [TABLE]}
+    analyzer.spawn_mdb_command = lambda *args: subprocess.Popen(
+        [sys.executable, "-c", f"import sys; sys.stdout.buffer.write({text.encode('utf-8')!r})"],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return analyzer
+
+
+@pytest.mark.skipif(not os.environ.get("ANALYSIS_TEST_DSN"), reason="set ANALYSIS_TEST_DSN to load into PostgreSQL")
+@pytest.mark.parametrize("load_format", ["csv", "binary"])
+def test_stream_loads_utf8_text_whatever_the_client_encoding(monkeypatch, load_format):
+    psycopg = pytest.importorskip("psycopg")
+    dsn = os.environ["ANALYSIS_TEST_DSN"]
+    monkeypatch.setenv("PGCLIENTENCODING", "LATIN1")
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute(f'DROP TABLE IF EXISTS "{TABLE["pg_name"]}"')
+        conn.execute(f'CREATE TABLE "{TABLE["pg_name"]}" (id integer, city varchar(50), opened timestamp)')
+        try:
+            loaded = analyzer_exporting(EXPORT).stream_to_postgres(dsn, load_format=load_format)
+            assert loaded[0]["rows"] == 3
+            rows = conn.execute(f'SELECT id, city, opened::date::text FROM "{TABLE["pg_name"]}" ORDER BY id').fetchall()
+            assert rows == [(1, "Zürich", "2024-01-02"), (2, None, None), (3, "Genève", "2023-12-31")]
+        finally:
+            conn.execute(f'DROP TABLE IF EXISTS "{TABLE["pg_name"]}"')
@@ -0,0 +1,89 @@
+"""Type tightening from a column's raw export strings"""
+import pandas as pd
+
+import analysis
+
+
+def infer(values, pg_type):
+    return analysis.infer_pg_type(pd.Series(values, dtype=object), pg_type)
+
+
+def test_whole_doubles_tighten_to_the_narrowest_integer_type():
+    assert infer(["1", "2.0", "70000"], "DOUBLE PRECISION")["type"] == "INTEGER"
+    assert infer(["1", "5000000000"], "DOUBLE PRECISION")["type"] == "BIGINT"
+    assert infer(["1.5", "2.25"], "DOUBLE PRECISION") is None
+
+
+def test_codes_with_leading_zeros_stay_text():
+    result = infer(["007", "010"], "VARCHAR(10)")
+    assert result["type"] == "VARCHAR(3)"
+
+
+def test_midnight_timestamps_tighten_to_date():
+    assert infer(["2024-01-01 00:00:00", "2024-02-01 00:00:00"], "TIMESTAMP")["type"] == "DATE"
+    assert infer(["2024-01-01 00:00:00", "2024-02-01 12:30:00"], "TIMESTAMP") is None
+
+
+def test_text_length_is_measured_after_trimming():
+    assert infer(["ab \t", " abc"], "TEXT")["type"] == "VARCHAR(3)"
+
+
+def test_a_few_outliers_are_reported_with_the_failing_values():
+    values = [str(i) for i in range(99)] + ["n/a"]
+    result = infer(values, "TEXT")
+    assert result["type"] == "INTEGER"
+    assert result["cast_failures"] == 1
+    assert result["failing_values"] == ["n/a"]
+
+
+def test_all_null_columns_are_left_alone():
+    assert infer([None, None], "TEXT") is None
+
+
+def test_wider_type_only_within_a_family():
+    assert analysis.wider_pg_type("VARCHAR(5)", "VARCHAR(8)") == "VARCHAR(8)"
+    assert analysis.wider_pg_type("VARCHAR(5)", "TEXT") == "TEXT"
+    assert analysis.wider_pg_type("BIGINT", "INTEGER") == "BIGINT"
+    assert analysis.wider_pg_type("DATE", "TIMESTAMP") == "TIMESTAMP"
+    assert analysis.wider_pg_type("INTEGER", "VARCHAR(8)") is None
+
+
+def analyzer_with_keys(child_type, parent_type):
+    def column(name, access_type="TEXT", size=50):
+        return {"name": name, "pg_name": name.lower(), "type": access_type, "size": size, "nullable": True}
+
+    def recommendation(pg_type):
+        return {"type": pg_type, "partial": False, "cast_failures": 0, "failing_values": [], "fits_observed": pg_type}
+
+    analyzer = analysis.AccessDatabaseAnalyzerWSL(None, check_environment=False)
+    analyzer.report = {
+        "table_details": [
+            {"name": "Child", "pg_name": "child", "columns": [column("Code"), column("Note", "MEMO", 0)]},
+            {"name": "Parent", "pg_name": "parent", "columns": [column("Code")]},
+        ],
+        "data_quality": [
+            {"table": "Child", "columns": [{"column": "Code", "type_recommendation": recommendation(child_type)},
+                                           {"column": "Note", "type_recommendation": recommendation("VARCHAR(4)")}]},
+            {"table": "Parent", "columns": [{"column": "Code", "type_recommendation": recommendation(parent_type)}]},
+        ],
+        "inferred_foreign_keys": [
+            {"from_table": "Child", "from_column": "Code", "to_table": "Parent", "to_column": "Code"},
+        ],
+    }
+    return analyzer
+
+
+def test_foreign_key_columns_share_the_widest_tightened_type():
+    types = analyzer_with_keys("VARCHAR(5)", "VARCHAR(8)").tightened_types()
+    assert types[("Child", "Code")] == types[("Parent", "Code")] == "VARCHAR(8)"
+    assert types[("Child", "Note")] == "VARCHAR(4)"
+
+
+def test_foreign_key_columns_of_different_families_keep_the_catalog_type():
+    types = analyzer_with_keys("INTEGER", "VARCHAR(8)").tightened_types()
+    assert ("Child", "Code") not in types and ("Parent", "Code") not in types
+
+
+def test_tightened_memos_are_trimmed_by_the_transform():
+    analyzer = analyzer_with_keys("VARCHAR(5)", "VARCHAR(8)")
+    assert analyzer.build_transformations(analyzer.report["table_details"][0])["Note"] == "text"
@@ -0,0 +1,50 @@
+"""Watch mode reuses per-table results and bounds the parsed exports it keeps"""
+import analysis
+
+
+class FakeExports(analysis.AccessDatabaseAnalyzerWSL):
+    def __init__(self, exports):
+        super().__init__("unused.mdb", check_environment=False)
+        self.exports = exports
+        self.calls = []
+        self.enable_warm_cache()
+
+    def mdb_output(self, command, *args):
+        self.calls.append(args[-1])
+        return self.exports[args[-1]]
+
+
+def table(name):
+    return {"name": name, "columns": [{"name": "ID"}]}
+
+
+def test_table_results_are_reused_until_the_export_changes():
+    analyzer = FakeExports({"Funds": b"ID\n1\n2\n"})
+    computed = []
+
+    def run_cycle():
+        analyzer.begin_cycle()
+        analyzer.export_table_to_df("Funds")
+        return analyzer.cached_table_result("primary_keys", table("Funds"), None,
+                                            lambda: computed.append(1) or {"primary_key": "ID"})
+
+    assert run_cycle() == run_cycle() == {"primary_key": "ID"}
+    assert len(computed) == 1
+
+    analyzer.exports["Funds"] = b"ID\n1\n1\n"
+    run_cycle()
+    assert len(computed) == 2
+
+
+def test_frame_cache_stays_within_its_budget(monkeypatch):
+    rows = b"ID\n" + b"".join(b"%d\n" % i for i in range(10_000))
+    analyzer = FakeExports({"Small": b"ID\n1\n", "Large": rows})
+    monkeypatch.setattr(analysis, "WATCH_FRAME_CACHE_MB", 0.01)
+
+    assert len(analyzer.export_table_to_df("Large")) == 10_000
+    assert len(analyzer.export_table_to_df("Small")) == 1
+    assert len(analyzer.export_table_to_df("Large")) == 10_000
+    # The large table keeps only its digest: it is exported again when read
+    assert analyzer.calls == ["Large", "Small", "Large"]
+    assert [key[1][0] for key in analyzer._frame_cache] == ["Small"]
+    assert "Large" in analyzer.table_digests()